@@ -1,16 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from datetime import datetime, timedelta
-from app.db.session import get_db
-from app.models.user import User
-from app.models.mentorship import MentorshipRequest
-from app.core.auth import get_current_user
-from pydantic import BaseModel
-from typing import Optional
+from sqlalchemy import select, update, and_
+from datetime import date, datetime
+from app.db.session import AsyncSessionLocal, get_db
+from app.models.user import Profile, User, UserRole
+from app.core.auth import get_current_user, invalidate_principal, Principal
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.api.alumni import alumni_search_flight
+from app.services.analytics import (
+    MAX_BUCKETS,
+    METRIC_DIMENSIONS,
+    Granularity,
+    Metric,
+    count_buckets,
+    default_start,
+    read_series
+)
+from app.services.assignment import mentor_load_balancer
+from app.services.bulk_import import BulkImportReport, detect_format, import_users
+from app.services.matching import mentor_matcher
+from app.services.stats import read_admin_stats
+from app.services.user_export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    decode_users_cursor,
+    encode_users_cursor,
+    stream_export,
+    user_record,
+    users_query
+)
+from app.websockets.manager import manager as connection_manager
+from app.websockets.topics import ANNOUNCEMENTS
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+import uuid
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Shared statistics of concurrent dashboard loads
+admin_stats_flight = SingleFlight("admin_stats", settings.SINGLEFLIGHT_WINDOW_SECONDS, 1)
+
 
 class AdminStats(BaseModel):
     total_users: int
@@ -21,6 +52,16 @@ class AdminStats(BaseModel):
     users_by_department: dict
 
 
+class AnalyticsSeries(BaseModel):
+    metric: Metric
+    dimension: str
+    granularity: Granularity
+    start: date
+    end: date
+    buckets: List[date]
+    series: Dict[str, List[int]]
+
+
 class UserVerification(BaseModel):
     status: str  # "verified", "rejected", "pending"
 
@@ -29,120 +70,209 @@ class UserDeactivation(BaseModel):
     is_active: bool
 
 
+class BulkUserSelection(BaseModel):
+    """Users to moderate: explicit ids, or every user matching the filters."""
+    user_ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, max_length=1000)
+    verification_status: Optional[Literal["pending", "verified", "rejected"]] = None
+    department: Optional[str] = Field(None, max_length=255)
+    role: Optional[UserRole] = None
+
+
+class BulkUserVerification(BulkUserSelection):
+    status: Literal["pending", "verified", "rejected"]
+
+
+class BulkUserDeactivation(BulkUserSelection):
+    is_active: bool
+
+
+class Announcement(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    message: str = Field(..., min_length=1, max_length=5000)
+    topic: str = ANNOUNCEMENTS  # e.g. "mentors", "department:physics", "cohort:2020"
+
+
 @router.get("/stats", response_model=AdminStats)
 async def get_admin_stats(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get comprehensive admin statistics for the dashboard.
     Requires admin role.
+    
+    New signups are counted in whole days (today and the 30 before).
+    Concurrent requests share one read and its result for
+    SINGLEFLIGHT_WINDOW_SECONDS.
     """
     # Verify admin access
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    # Total users count
-    total_users_result = await db.execute(select(func.count(User.id)))
-    total_users = total_users_result.scalar() or 0
-    
-    # Users by role
-    role_counts = await db.execute(
-        select(User.role, func.count(User.id))
-        .group_by(User.role)
-    )
-    users_by_role = {row[0]: row[1] for row in role_counts.all()}
-    
-    # New signups in last 30 days
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    new_signups_result = await db.execute(
-        select(func.count(User.id))
-        .where(User.created_at >= thirty_days_ago)
-    )
-    new_signups_30_days = new_signups_result.scalar() or 0
-    
-    # Active mentorships (accepted status)
-    active_mentorships_result = await db.execute(
-        select(func.count(MentorshipRequest.id))
-        .where(MentorshipRequest.status == "accepted")
-    )
-    active_mentorships = active_mentorships_result.scalar() or 0
+    # Counters maintained with every write (app.services.stats): one
+    # small indexed read instead of aggregating the source tables, shared
+    # by concurrent dashboard loads
+    stats = await admin_stats_flight.do("stats", lambda: read_admin_stats(db))
     
     # Total jobs posted (this would need a Jobs table in production)
     # For demo, returning 0
     total_jobs_posted = 0
     
-    # Users by department (from profiles)
-    dept_counts = await db.execute(
-        select(User.department, func.count(User.id))
-        .where(User.department.isnot(None))
-        .group_by(User.department)
-    )
-    users_by_department = {row[0]: row[1] for row in dept_counts.all()}
-    
-    return AdminStats(
-        total_users=total_users,
-        users_by_role=users_by_role,
-        new_signups_30_days=new_signups_30_days,
-        active_mentorships=active_mentorships,
-        total_jobs_posted=total_jobs_posted,
-        users_by_department=users_by_department
-    )
+    return AdminStats(total_jobs_posted=total_jobs_posted, **stats)
+
+
+@router.get("/analytics", response_model=AnalyticsSeries)
+async def get_analytics(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    metric: Metric = Metric.SIGNUPS,
+    dimension: Optional[str] = Query(None, description="role or department for signups, status for mentorship_requests"),
+    granularity: Granularity = Granularity.DAY,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+):
+    """
+    Get a time series of signups or mentorship requests.
+    Requires admin role.
+    
+    Signups are split by role or department, mentorship requests by the
+    status they entered. Buckets are days, weeks (starting Monday) or
+    months; ``start`` is widened to its bucket's start. Without ``start``
+    the last 90 days, 52 weeks or 24 months are returned; ``end`` defaults
+    to today (UTC). Each series value gets one count per bucket, zero when
+    nothing happened.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    dimensions = METRIC_DIMENSIONS[metric]
+    dimension = dimension or dimensions[0]
+    if dimension not in dimensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{metric.value} can be split by: {', '.join(dimensions)}"
+        )
+    
+    end = end or datetime.utcnow().date()
+    start = start or default_start(end, granularity)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if count_buckets(start, end, granularity) > MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many {granularity.value} buckets (at most {MAX_BUCKETS}); use a coarser granularity"
+        )
+    
+    # Pre-aggregated rollups (app.services.analytics): one row per bucket
+    # and series value instead of scanning users or mentorship requests
+    return await read_series(db, metric, dimension, granularity, start, end)
 
 
 @router.get("/users")
 async def get_all_users(
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     search: Optional[str] = None,
-    verification_status: Optional[str] = None
+    verification_status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header")
 ):
     """
-    Get all users with optional filtering.
+    Get users with optional filtering, newest first.
     Requires admin role.
+    
+    Returns one page of ``limit`` users. When another page exists, its
+    cursor is returned in the ``X-Next-Cursor`` header; pass it back as
+    ``cursor``. Use /users/export for every user.
     """
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    query = select(User)
+    after = decode_users_cursor(cursor) if cursor else None
+    query = users_query(search, verification_status, after)
     
-    # Apply search filter
-    if search:
-        query = query.where(
-            or_(
-                User.email.ilike(f"%{search}%"),
-                User.full_name.ilike(f"%{search}%")
-            )
-        )
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
     
-    # Apply verification status filter
-    if verification_status:
-        query = query.where(User.verification_status == verification_status)
-    
-    result = await db.execute(query)
-    users = result.scalars().all()
-    
-    return [
-        {
-            "id": str(user.id),
-            "full_name": user.full_name,
-            "email": user.email,
-            "role": user.role,
-            "department": user.department,
-            "verification_status": user.verification_status,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None
-        }
-        for user in users
-    ]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_users_cursor(rows[-1])
+    
+    return [user_record(row) for row in rows]
+
+
+@router.get("/users/export")
+async def export_users(
+    format: ExportFormat = ExportFormat.CSV,
+    search: Optional[str] = None,
+    verification_status: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Export users as CSV or NDJSON, newest first.
+    Requires admin role.
+    
+    The file is streamed from a server-side cursor in chunks of
+    ADMIN_EXPORT_CHUNK_SIZE rows, so memory use does not grow with the
+    number of users. Filters match GET /users.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    filename = f"users-{datetime.utcnow():%Y%m%d-%H%M%S}.{format.value}"
+    return StreamingResponse(
+        stream_export(
+            AsyncSessionLocal,
+            users_query(search, verification_status),
+            format,
+            settings.ADMIN_EXPORT_CHUNK_SIZE
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/users/import", response_model=BulkImportReport)
+async def import_users_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Bulk import alumni/students from a CSV (header row) or JSONL file.
+    Requires admin role.
+    
+    Each row needs email, full_name and either password or a bcrypt
+    hashed_password; profile fields are optional. Rows are inserted in
+    batches, each batch in its own transaction, and rows that fail are
+    reported instead of aborting the import. Passwords are hashed in the
+    process pool shared by every import.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    try:
+        fmt = detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await import_users(
+        db,
+        file.file,
+        fmt,
+        batch_size=settings.BULK_IMPORT_BATCH_SIZE
+    )
 
 
 @router.patch("/verify-user/{user_id}")
 async def verify_user(
-    user_id: str,
+    user_id: uuid.UUID,
     verification: UserVerification,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Verify or reject a user.
@@ -163,6 +293,7 @@ async def verify_user(
     
     await db.commit()
     await db.refresh(user)
+    invalidate_principal([user.id], connection_manager.publish_control)
     
     return {
         "message": f"User {verification.status}",
@@ -173,10 +304,10 @@ async def verify_user(
 
 @router.patch("/deactivate-user/{user_id}")
 async def deactivate_user(
-    user_id: str,
+    user_id: uuid.UUID,
     deactivation: UserDeactivation,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Activate or deactivate a user.
@@ -197,6 +328,7 @@ async def deactivate_user(
     
     await db.commit()
     await db.refresh(user)
+    invalidate_principal([user.id], connection_manager.publish_control)
     
     return {
         "message": f"User {'activated' if deactivation.is_active else 'deactivated'}",
@@ -205,11 +337,140 @@ async def deactivate_user(
     }
 
 
+@router.patch("/users/verification")
+async def bulk_verify_users(
+    verification: BulkUserVerification,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Verify or reject many users at once.
+    Requires admin role.
+    
+    Selects users by ``user_ids`` or by filters (verification_status,
+    department, role); one UPDATE changes every selected user whose status
+    differs.
+    
+    Returns:
+        Number of updated users and their ids
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    user_ids = await _bulk_update_users(
+        db,
+        verification,
+        User.verification_status != verification.status,
+        verification_status=verification.status
+    )
+    
+    return {
+        "message": f"{len(user_ids)} users {verification.status}",
+        "verification_status": verification.status,
+        "updated": len(user_ids),
+        "user_ids": [str(user_id) for user_id in user_ids]
+    }
+
+
+@router.patch("/users/activation")
+async def bulk_deactivate_users(
+    deactivation: BulkUserDeactivation,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Activate or deactivate many users at once.
+    Requires admin role.
+    
+    Selects users like /users/verification. The current admin is never
+    deactivated by their own request.
+    
+    Returns:
+        Number of updated users and their ids
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    user_ids = await _bulk_update_users(
+        db,
+        deactivation,
+        User.is_active != deactivation.is_active,
+        User.id != current_user.id,
+        is_active=deactivation.is_active
+    )
+    
+    return {
+        "message": f"{len(user_ids)} users {'activated' if deactivation.is_active else 'deactivated'}",
+        "is_active": deactivation.is_active,
+        "updated": len(user_ids),
+        "user_ids": [str(user_id) for user_id in user_ids]
+    }
+
+
+async def _bulk_update_users(
+    db: AsyncSession,
+    selection: BulkUserSelection,
+    *conditions,
+    **values
+) -> List[uuid.UUID]:
+    """
+    Apply one set-based UPDATE to the selected users and drop cached state.
+    
+    Args:
+        db: Database session
+        selection: Ids or filters selecting the users
+        conditions: Extra WHERE clauses (e.g. only users that change)
+        values: Columns to set
+        
+    Returns:
+        Ids of the updated users
+        
+    Raises:
+        HTTPException 400: If neither ids nor a filter is given
+    """
+    filters = []
+    if selection.user_ids:
+        filters.append(User.id.in_(set(selection.user_ids)))
+    if selection.verification_status:
+        filters.append(User.verification_status == selection.verification_status)
+    if selection.role:
+        filters.append(User.role == selection.role)
+    if selection.department:
+        filters.append(User.id.in_(
+            select(Profile.user_id).where(Profile.department == selection.department)
+        ))
+    
+    if not filters:
+        raise HTTPException(
+            status_code=400,
+            detail="Give user_ids or at least one filter"
+        )
+    
+    result = await db.execute(
+        update(User)
+        .where(*filters, *conditions)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    user_ids = list(result.scalars().all())
+    await db.commit()
+    
+    # Caches that depend on user status: authenticated principals, the
+    # in-memory mentor indexes and shared search results
+    invalidate_principal(user_ids, connection_manager.publish_control)
+    mentor_matcher.mark_dirty(user_ids)
+    mentor_load_balancer.mark_dirty(user_ids)
+    alumni_search_flight.clear()
+    
+    return user_ids
+
+
 @router.delete("/delete-user/{user_id}")
 async def delete_user(
-    user_id: str,
+    user_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Permanently delete a user.
@@ -228,8 +489,47 @@ async def delete_user(
     # Delete user
     await db.delete(user)
     await db.commit()
+    invalidate_principal([user.id], connection_manager.publish_control)
     
     return {
         "message": "User deleted successfully",
-        "user_id": user_id
+        "user_id": str(user_id)
+    }
+
+
+@router.post("/announcements")
+async def send_announcement(
+    announcement: Announcement,
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Push an announcement to every WebSocket subscribed to a topic.
+    Requires admin role.
+    
+    Only subscribed sockets are visited; other workers deliver to their own
+    subscribers through the backplane.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    message = {
+        "type": "announcement",
+        "topic": announcement.topic,
+        "data": {
+            "title": announcement.title,
+            "message": announcement.message,
+            "sent_by": current_user.full_name,
+            "sent_at": datetime.utcnow().isoformat()
+        }
+    }
+    
+    try:
+        await connection_manager.publish(announcement.topic, message)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "message": "Announcement sent",
+        "topic": announcement.topic,
+        "local_subscribers": connection_manager.get_topic_subscriber_count(announcement.topic)
     }
@@ -1,65 +1,114 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import joinedload
-from typing import Optional
+from sqlalchemy import false, select, tuple_
+from sqlalchemy.orm import contains_eager
+from typing import List, Optional, Tuple
+import uuid
 
 from app.db.session import get_db
 from app.models.user import User, UserRole, Profile
-from app.schemas.user import AlumniPublicOut, AlumniSearchResponse, MentorStatusUpdate
-from app.core.auth import get_current_user
+from app.models.tag import TagKind
+from app.schemas.user import AlumniFacets, AlumniPublicOut, AlumniSearchResponse, MentorStatusUpdate
+from app.core.auth import get_current_user, Principal
+from app.core.config import settings
+from app.core.pagination import CountMode, count_rows, decode_cursor, encode_cursor
+from app.core.singleflight import SingleFlight
+from app.services.facets import compute_alumni_facets
+from app.services.search import search_matches
+from app.services.tags import TagMatch, tagged_profiles
 
 router = APIRouter(prefix="/alumni", tags=["Alumni Discovery"])
 
+# Shared results of identical concurrent searches
+alumni_search_flight = SingleFlight(
+    "alumni_search",
+    settings.SINGLEFLIGHT_WINDOW_SECONDS,
+    settings.SINGLEFLIGHT_MAX_ENTRIES
+)
+
 
 @router.get("", response_model=AlumniSearchResponse)
 async def search_alumni(
-    search: Optional[str] = Query(None, description="Search across name, company, and bio"),
+    search: Optional[str] = Query(None, description="Full-text search across name, company, position, and bio"),
     department: Optional[str] = Query(None, description="Filter by department"),
     is_mentor: Optional[bool] = Query(None, description="Filter by mentor availability"),
-    expertise: Optional[str] = Query(None, description="Filter by specific expertise"),
+    expertise: Optional[List[str]] = Query(None, description="Filter by expertise tag (repeatable)"),
+    interest: Optional[List[str]] = Query(None, description="Filter by interest tag (repeatable)"),
+    tag_match: TagMatch = Query(TagMatch.ANY, description="Match any or all of the given tags"),
     limit: int = Query(20, ge=1, le=100, description="Number of results per page"),
-    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    offset: int = Query(0, ge=0, description="Number of results to skip (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count mode: exact, estimate, or none"),
+    facets: bool = Query(False, description="Include facet counts for the filtered results"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Search and discover alumni with advanced filtering.
     
     Features:
-    - Multi-field search (name, company, bio)
-    - Filter by department, mentor status, expertise
-    - Pagination support
-    - Optimized with joinedload to avoid N+1 queries
+    - Full-text search (name, company, position, bio) ranked by relevance
+    - Filter by department, mentor status, expertise/interest tags
+    - Keyset (cursor) pagination with optional offset fallback
+    - Exact, estimated, or skipped total count
+    - Optional facet counts (department, mentor status, graduation year,
+      top expertise) in the same response
+    - Profile loaded in the same query to avoid N+1 queries
     
     Query Parameters:
-        search: Search string for name, company, or bio (case-insensitive)
+        search: Search terms for name, company, position, or bio (prefix match,
+            every term must match, best matches first); a search with no
+            word characters matches nothing
         department: Exact match on department
         is_mentor: Filter only mentors (true) or non-mentors (false)
-        expertise: Search for specific skill in mentorship_expertise array
+        expertise: Expertise tags (case-insensitive, repeatable)
+        interest: Interest tags (case-insensitive, repeatable)
+        tag_match: "any" (default) or "all" of the given tags per list
         limit: Results per page (default 20, max 100)
         offset: Number of results to skip for pagination
+        cursor: next_cursor from the previous page; page cost is independent
+            of depth
+        count: "exact" (default), "estimate" (cheap approximate total), or
+            "none" (no count query)
+        facets: Include facet counts; they respect every active filter
         
     Returns:
-        AlumniSearchResponse with total count and paginated results
+        AlumniSearchResponse with total count, paginated results and the
+        cursor for the next page
+    
+    Identical concurrent searches share one computation, and its response
+    for SINGLEFLIGHT_WINDOW_SECONDS.
     """
-    # Base query: Alumni role, active users, with profile loaded
+    key = (
+        search, department, is_mentor,
+        tuple(expertise or ()), tuple(interest or ()), tag_match,
+        limit, offset, cursor, count, facets
+    )
+    return await alumni_search_flight.do(key, lambda: _search_alumni(db, *key))
+
+
+async def _search_alumni(
+    db: AsyncSession,
+    search: Optional[str],
+    department: Optional[str],
+    is_mentor: Optional[bool],
+    expertise: Tuple[str, ...],
+    interest: Tuple[str, ...],
+    tag_match: TagMatch,
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+    count: CountMode,
+    facets: bool
+) -> AlumniSearchResponse:
+    """Run an alumni search (see search_alumni)."""
+    # Base query: Alumni role, active users
     query = (
         select(User)
-        .options(joinedload(User.profile))
+        .outerjoin(User.profile)
         .where(User.role == UserRole.ALUMNI)
         .where(User.is_active == True)
     )
     
-    # Search across multiple fields (case-insensitive)
-    if search:
-        search_pattern = f"%{search}%"
-        search_filter = or_(
-            User.full_name.ilike(search_pattern),
-            Profile.current_company.ilike(search_pattern),
-            Profile.bio.ilike(search_pattern)
-        )
-        query = query.where(search_filter)
-    
     # Filter by department (exact match)
     if department:
         query = query.where(Profile.department == department)
@@ -68,46 +117,107 @@ async def search_alumni(
     if is_mentor is not None:
         query = query.where(Profile.is_mentor == is_mentor)
     
-    # Filter by expertise (JSON array contains)
+    # Filter by tags (index lookups on profile_tags)
     if expertise:
-        # PostgreSQL JSON contains operator
-        query = query.where(Profile.mentorship_expertise.contains([expertise]))
+        tagged = await tagged_profiles(db, TagKind.EXPERTISE, expertise, tag_match)
+        query = query.where(Profile.id.in_(tagged))
+    
+    if interest:
+        tagged = await tagged_profiles(db, TagKind.INTEREST, interest, tag_match)
+        query = query.where(Profile.id.in_(tagged))
+    
+    # Full-text search via the search index, most relevant first.
+    # Otherwise alphabetical, backed by the directory index.
+    matches = search_matches(db.bind.dialect.name, search) if search else None
+    if matches is not None:
+        query = query.join(matches, matches.c.user_id == User.id)
+        sort = "rank"
+        sort_columns = (matches.c.rank, User.id)
+    else:
+        sort = "name"
+        sort_columns = (User.full_name, User.id)
+        # A search without terms (e.g. only punctuation) matches nothing
+        if search:
+            query = query.where(false())
     
-    # Get total count before pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    # Total count over the filters only (no eager loads, ordering or paging)
+    total = await count_rows(db, query.with_only_columns(User.id), count)
     
-    # Apply pagination
-    query = query.limit(limit).offset(offset)
+    # Facet counts over the same filters, in one aggregate query
+    facet_counts = await compute_alumni_facets(db, query) if facets else None
+    
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    if cursor:
+        last_key = decode_cursor(cursor, sort)
+        if len(last_key) != len(sort_columns):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        last_key[-1] = _parse_uuid(last_key[-1])
+        query = query.where(tuple_(*sort_columns) > tuple_(*last_key))
+        offset = 0
+    else:
+        query = query.offset(offset)
+    
+    # Fetch one extra row to know whether another page exists
+    query = (
+        query
+        .add_columns(*sort_columns[:-1])
+        .options(contains_eager(User.profile))
+        .order_by(*sort_columns)
+        .limit(limit + 1)
+    )
     
     # Execute query
     result = await db.execute(query)
-    alumni = result.scalars().all()
+    rows = result.unique().all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, [*last[1:], str(last[0].id)])
     
     # Convert to response schema
     return AlumniSearchResponse(
         total=total,
+        total_is_estimate=count == CountMode.ESTIMATE,
         limit=limit,
         offset=offset,
-        results=[AlumniPublicOut.model_validate(alumnus) for alumnus in alumni]
+        next_cursor=next_cursor,
+        results=[AlumniPublicOut.model_validate(row[0]) for row in rows],
+        facets=AlumniFacets(**facet_counts) if facet_counts is not None else None
     )
 
 
+def _parse_uuid(value) -> uuid.UUID:
+    """Parse the UUID tie-breaker of a cursor key."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
 @router.patch("/mentor-status", response_model=dict)
 async def update_mentor_status(
     status_update: MentorStatusUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Toggle mentor availability status for the current user.
     
-    Only alumni can update their mentor status.
+    Only alumni can update their mentor status. ``mentor_capacity``
+    optionally sets how many open (pending or accepted) requests they take
+    at once; 0 pauses new requests without leaving the mentor list.
     Students and admins cannot become mentors.
     
     Args:
-        status_update: New mentor status (true/false)
+        status_update: New mentor status (true/false) and optional capacity
         current_user: Authenticated user from JWT
         db: Database session
         
@@ -139,10 +249,13 @@ async def update_mentor_status(
     
     # Update mentor status
     profile.is_mentor = status_update.is_mentor
+    if status_update.mentor_capacity is not None:
+        profile.mentor_capacity = status_update.mentor_capacity
     await db.commit()
     await db.refresh(profile)
     
     return {
         "is_mentor": profile.is_mentor,
+        "mentor_capacity": profile.mentor_capacity,
         "message": f"Mentor status {'enabled' if profile.is_mentor else 'disabled'} successfully"
     }
@@ -16,11 +16,12 @@ from app.schemas.user import (
     Token
 )
 from app.core.auth import (
-    get_password_hash,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     get_current_user,
+    Principal,
     decode_refresh_token
 )
 from app.core.config import settings
@@ -58,6 +59,7 @@ async def register(
         
     Raises:
         HTTPException 409: Email already registered
+        HTTPException 503: Password hashing pool saturated
     """
     # Check if email already exists
     result = await db.execute(
@@ -73,7 +75,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     
     new_user = User(
         email=user_data.email,
@@ -162,6 +164,7 @@ async def login(
     Raises:
         HTTPException 401: Invalid credentials
         HTTPException 403: Inactive account
+        HTTPException 503: Password hashing pool saturated
     """
     # Find user by email
     result = await db.execute(
@@ -172,7 +175,7 @@ async def login(
     user = result.scalar_one_or_none()
     
     # Verify user exists and password is correct - Generic error for anti-enumeration
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -218,7 +221,7 @@ async def login(
 
 @router.get("/me", response_model=UserWithProfile)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
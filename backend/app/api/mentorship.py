@@ -3,24 +3,51 @@ Mentorship API Router.
 
 Handles mentorship request creation, retrieval, and status updates.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import select, or_, literal, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 from typing import List, Optional
+from datetime import datetime
 import uuid
 
 from app.db.session import get_db
-from app.models.user import User, UserRole
-from app.models.mentorship import MentorshipRequest, MentorshipStatus
+from app.models.user import User, UserRole, Profile
+from app.db.dialect import upsert_insert
+from app.models.mentorship import MentorshipRequest, MentorshipStatus, PENDING_REQUEST_PREDICATE
 from app.schemas.mentorship import (
+    MentorshipBulkOutcome,
+    MentorshipBulkUpdate,
+    MentorshipBulkUpdateResponse,
+    MentorshipAutoRequest,
     MentorshipRequestCreate,
     MentorshipRequestUpdate,
     MentorshipRequestResponse,
-    MentorshipRequestWithDetails
+    MentorshipRequestWithDetails,
+    MentorRecommendation
 )
-from app.core.auth import get_current_user
-from app.websockets.manager import connection_manager
+from app.schemas.user import AlumniPublicOut
+from app.core.auth import get_current_user, Principal
+from app.services.analytics import record_events, status_event
+from app.services.assignment import (
+    OPEN_STATUSES,
+    free_capacity,
+    lock_mentor,
+    mentor_load_balancer,
+    open_request_count,
+    stage_request_changes
+)
+from app.services.inbox import (
+    decode_inbox_cursor,
+    encode_inbox_cursor,
+    inbox_details,
+    inbox_owner,
+    inbox_query
+)
+from app.services.matching import mentor_matcher
+from app.services.notifications import notify, notify_many
+from app.services.stats import bump_counters
 
 router = APIRouter(prefix="/mentorship", tags=["Mentorship"])
 
@@ -28,14 +55,16 @@ router = APIRouter(prefix="/mentorship", tags=["Mentorship"])
 @router.post("/request", response_model=MentorshipRequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_mentorship_request(
     request_data: MentorshipRequestCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new mentorship request (students only).
     
-    Students can request mentorship from alumni who have is_mentor=True.
-    Sends a real-time WebSocket notification to the alumni.
+    Students can request mentorship from alumni who have is_mentor=True and
+    free capacity (fewer open requests than their mentor_capacity).
+    Queues a real-time WebSocket notification to the alumni, committed
+    together with the request and delivered after the response.
     """
     # Only students can request mentorship
     if current_user.role != UserRole.STUDENT:
@@ -44,9 +73,181 @@ async def create_mentorship_request(
             detail="Only students can request mentorship"
         )
     
-    # Verify alumni exists and is a mentor
+    mentorship_request = await _insert_request(
+        db, current_user, request_data.alumni_id, request_data.message
+    )
+    if mentorship_request is None:
+        await _raise_request_rejected(db, current_user.id, request_data.alumni_id)
+    
+    await db.commit()
+    
+    return mentorship_request
+
+
+@router.post("/request/auto", response_model=MentorshipRequestResponse, status_code=status.HTTP_201_CREATED)
+async def create_assigned_mentorship_request(
+    request_data: MentorshipAutoRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Request mentorship from any suitable mentor (students only).
+    
+    The mentor is the least-loaded active mentor with free capacity in the
+    given department or with any of the given expertise tags (by default the
+    student's own department and interests), skipping mentors the student
+    already has an open request with.
+    
+    Raises:
+        HTTPException 403: If the user is not a student
+        HTTPException 409: If no eligible mentor has free capacity
+    """
+    if current_user.role != UserRole.STUDENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only students can request mentorship"
+        )
+    
+    department, expertise = request_data.department, request_data.expertise
+    if department is None and expertise is None:
+        result = await db.execute(
+            select(Profile.department, Profile.interests).where(Profile.user_id == current_user.id)
+        )
+        department, expertise = result.one_or_none() or (None, None)
+    
+    # Mentors already requested
+    existing_result = await db.execute(
+        select(MentorshipRequest.alumni_id).where(
+            MentorshipRequest.student_id == current_user.id,
+            MentorshipRequest.status.in_(OPEN_STATUSES)
+        )
+    )
+    exclude = set(existing_result.scalars().all())
+    
+    await mentor_load_balancer.sync(db)
+    mentorship_request = None
+    while mentorship_request is None:
+        alumni_id = mentor_load_balancer.pick(department, expertise or [], exclude)
+        if alumni_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="No matching mentor has capacity right now"
+            )
+        
+        # The balancer may trail the database (e.g. a mentor who just
+        # stepped down); try the next one
+        mentorship_request = await _insert_request(
+            db, current_user, alumni_id, request_data.message
+        )
+        exclude.add(alumni_id)
+    
+    await db.commit()
+    
+    return mentorship_request
+
+
+async def _insert_request(
+    db: AsyncSession,
+    student: Principal,
+    alumni_id: uuid.UUID,
+    message: str
+) -> Optional[MentorshipRequest]:
+    """
+    Insert a pending request and queue the alumni's notification.
+    
+    The mentor is locked first (lock_mentor), then one statement inserts
+    the row only if the alumni is an active mentor with fewer open requests
+    than their capacity. Nothing happens if the pair already has a pending
+    request (enforced by uq_mentorship_requests_pending_pair). Neither
+    check can be raced by concurrent submits. The caller commits.
+    
+    Returns:
+        The new request (transient), or None if nothing was inserted
+    """
+    if await lock_mentor(db, alumni_id) is None:
+        return None
+    
+    now = datetime.utcnow()
+    mentorship_request = MentorshipRequest(
+        id=uuid.uuid4(),
+        student_id=student.id,
+        alumni_id=alumni_id,
+        message=message,
+        status=MentorshipStatus.PENDING,
+        created_at=now,
+        updated_at=now
+    )
+    table = MentorshipRequest.__table__
+    columns = ["id", "student_id", "alumni_id", "message", "status", "created_at", "updated_at"]
+    mentor_row = (
+        select(*[
+            User.id if name == "alumni_id"
+            else literal(getattr(mentorship_request, name), table.c[name].type)
+            for name in columns
+        ])
+        .join(Profile, Profile.user_id == User.id)
+        .where(
+            User.id == alumni_id,
+            User.role == UserRole.ALUMNI,
+            User.is_active == True,
+            Profile.is_mentor == True,
+            Profile.mentor_capacity > open_request_count(User.id)
+        )
+    )
+    insert_stmt = (
+        upsert_insert(db.bind.dialect.name, table)
+        .from_select(columns, mentor_row)
+        .on_conflict_do_nothing(
+            index_elements=["student_id", "alumni_id"],
+            index_where=PENDING_REQUEST_PREDICATE
+        )
+        .returning(table.c.id)
+    )
+    result = await db.execute(insert_stmt)
+    
+    if result.scalar_one_or_none() is None:
+        return None
+    
+    # Core insert: count it toward the mentor's load after commit
+    stage_request_changes(db.sync_session, [(mentorship_request.id, alumni_id, MentorshipStatus.PENDING)])
+    await db.run_sync(lambda session: record_events(
+        session.connection(), {status_event(MentorshipStatus.PENDING, now): 1}
+    ))
+    
+    # Notify the alumni (outbox row commits with the request)
+    notify(
+        db,
+        alumni_id,
+        "mentorship_request",
+        {
+            "request_id": str(mentorship_request.id),
+            "student_name": student.full_name,
+            "student_id": str(student.id),
+            "message": message,
+            "created_at": mentorship_request.created_at.isoformat()
+        }
+    )
+    
+    return mentorship_request
+
+
+async def _raise_request_rejected(
+    db: AsyncSession,
+    student_id: uuid.UUID,
+    alumni_id: uuid.UUID
+) -> None:
+    """
+    Explain why a mentorship request insert did not create a row.
+    
+    Only runs on the failure path, so the happy path stays one insert.
+    
+    Raises:
+        HTTPException: 404 if the alumni is missing or inactive, 400 if they
+            are not a mentor, the pair already has a pending request or the
+            mentor is at capacity
+    """
     alumni_query = select(User).where(
-        User.id == request_data.alumni_id,
+        User.id == alumni_id,
         User.role == UserRole.ALUMNI,
         User.is_active == True
     ).options(joinedload(User.profile))
@@ -66,133 +267,222 @@ async def create_mentorship_request(
             detail="This alumni is not available as a mentor"
         )
     
-    # Check for existing pending request
-    existing_query = select(MentorshipRequest).where(
-        and_(
-            MentorshipRequest.student_id == current_user.id,
-            MentorshipRequest.alumni_id == request_data.alumni_id,
+    pending = await db.execute(
+        select(MentorshipRequest.id).where(
+            MentorshipRequest.student_id == student_id,
+            MentorshipRequest.alumni_id == alumni_id,
             MentorshipRequest.status == MentorshipStatus.PENDING
         )
     )
-    existing_result = await db.execute(existing_query)
-    if existing_result.scalar_one_or_none():
+    if pending.first() is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have a pending request with this alumni"
         )
     
-    # Create mentorship request
-    mentorship_request = MentorshipRequest(
-        student_id=current_user.id,
-        alumni_id=request_data.alumni_id,
-        message=request_data.message,
-        status=MentorshipStatus.PENDING
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="This mentor is not taking new requests right now"
     )
-    
-    db.add(mentorship_request)
-    await db.commit()
-    await db.refresh(mentorship_request)
-    
-    # Send WebSocket notification to alumni
-    await connection_manager.send_to_user(
-        user_id=request_data.alumni_id,
-        message={
-            "type": "mentorship_request",
-            "data": {
-                "request_id": str(mentorship_request.id),
-                "student_name": current_user.full_name,
-                "student_id": str(current_user.id),
-                "message": request_data.message,
-                "created_at": mentorship_request.created_at.isoformat()
-            }
-        }
-    )
-    
-    return mentorship_request
 
 
 @router.get("/requests", response_model=List[MentorshipRequestWithDetails])
 async def get_mentorship_requests(
+    response: Response,
     status_filter: Optional[MentorshipStatus] = Query(None, alias="status"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    offset: int = Query(0, ge=0, description="Number of requests to skip (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get mentorship requests.
+    Get mentorship requests, newest first.
     
     - Alumni: See incoming requests
     - Students: See sent requests
+    
+    Pages are index range scans (see app.services.inbox). When another page
+    exists, its cursor is returned in the ``X-Next-Cursor`` header; pass it
+    back as ``cursor`` for constant-cost paging at any depth. ``offset`` is
+    kept for existing clients.
     """
-    # Build query based on user role
-    if current_user.role == UserRole.ALUMNI:
-        # Alumni sees incoming requests
-        query = select(MentorshipRequest).where(
-            MentorshipRequest.alumni_id == current_user.id
-        )
-    elif current_user.role == UserRole.STUDENT:
-        # Students see their sent requests
-        query = select(MentorshipRequest).where(
-            MentorshipRequest.student_id == current_user.id
-        )
-    else:
+    owner = inbox_owner(current_user.role)
+    if owner is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only students and alumni can access mentorship requests"
         )
     
-    # Apply status filter
-    if status_filter:
-        query = query.where(MentorshipRequest.status == status_filter)
+    after = decode_inbox_cursor(cursor) if cursor else None
+    query = inbox_query(owner, current_user.id, status_filter, after)
     
-    # Load related users
-    query = query.options(
-        joinedload(MentorshipRequest.student).joinedload(User.profile),
-        joinedload(MentorshipRequest.alumni).joinedload(User.profile)
-    )
+    # Only the response's columns, joined in the same query (no entities)
+    query = inbox_details(query)
     
-    # Apply pagination
-    query = query.order_by(MentorshipRequest.created_at.desc())
-    query = query.limit(limit).offset(offset)
+    # Apply pagination, fetching one extra row to know whether another
+    # page exists
+    if after is None:
+        query = query.offset(offset)
+    query = query.limit(limit + 1)
     
     result = await db.execute(query)
-    requests = result.scalars().all()
-    
-    # Enrich with user details
-    enriched_requests = []
-    for req in requests:
-        req_dict = {
-            "id": req.id,
-            "student_id": req.student_id,
-            "alumni_id": req.alumni_id,
-            "message": req.message,
-            "status": req.status,
-            "created_at": req.created_at,
-            "updated_at": req.updated_at,
-            "student_name": req.student.full_name if req.student else None,
-            "alumni_name": req.alumni.full_name if req.alumni else None,
-            "student_email": req.student.email if req.student else None,
-            "student_department": req.student.profile.department if req.student and req.student.profile else None,
-            "alumni_company": req.alumni.profile.current_company if req.alumni and req.alumni.profile else None,
-            "alumni_position": req.alumni.profile.current_position if req.alumni and req.alumni.profile else None,
-        }
-        enriched_requests.append(MentorshipRequestWithDetails(**req_dict))
+    rows = result.all()
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_inbox_cursor(rows[-1])
     
-    return enriched_requests
+    # Rows map by name onto MentorshipRequestWithDetails, validated once by
+    # the response model
+    return [row._asdict() for row in rows]
+
+
+@router.patch("/requests", response_model=MentorshipBulkUpdateResponse)
+async def bulk_update_mentorship_requests(
+    update_data: MentorshipBulkUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Accept, reject or complete several incoming requests at once (alumni only).
+    
+    One UPDATE covers every id that belongs to the current alumni and isn't
+    already in the target status; those are reported as unchanged (and their
+    students aren't notified), other ids as not found. The students'
+    notifications are written with one outbox INSERT in the same transaction
+    and delivered together by the dispatcher. Accepting closed requests
+    reopens them and needs free mentor capacity for all of them, or nothing
+    is updated.
+    
+    Returns:
+        MentorshipBulkUpdateResponse with one outcome per distinct id
+    """
+    if current_user.role != UserRole.ALUMNI:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only alumni can update mentorship requests"
+        )
+    
+    # Reopening can conflict with another pending request for the pair, so
+    # it is only done one request at a time
+    if update_data.status == MentorshipStatus.PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk updates cannot set requests back to pending"
+        )
+    
+    request_ids = list(dict.fromkeys(update_data.request_ids))
+    now = datetime.utcnow()
+    
+    # Accepting closed requests reopens them: lock the mentor first
+    capacity_left = None
+    if update_data.status in OPEN_STATUSES:
+        capacity_left = await free_capacity(db, current_user.id)
+    
+    # RETURNING only sees new values: lock the requests and note their
+    # previous statuses, for the accepted-mentorships counter
+    status_before = dict((await db.execute(
+        select(MentorshipRequest.id, MentorshipRequest.status)
+        .where(
+            MentorshipRequest.id.in_(request_ids),
+            MentorshipRequest.alumni_id == current_user.id
+        )
+        .with_for_update()
+    )).all())
+    
+    if capacity_left is not None:
+        reopened = sum(1 for previous in status_before.values() if previous not in OPEN_STATUSES)
+        if reopened > capacity_left:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Reopening {reopened} requests exceeds your free mentorship capacity "
+                       f"({max(capacity_left, 0)})"
+            )
+    
+    result = await db.execute(
+        update(MentorshipRequest)
+        .where(
+            MentorshipRequest.id.in_(request_ids),
+            MentorshipRequest.alumni_id == current_user.id,
+            MentorshipRequest.status != update_data.status
+        )
+        .values(status=update_data.status, updated_at=now)
+        .returning(MentorshipRequest.id, MentorshipRequest.student_id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = dict(result.all())
+    
+    # Core update: release the mentor's capacity after commit
+    stage_request_changes(db.sync_session, (
+        (request_id, current_user.id, update_data.status) for request_id in updated
+    ))
+    
+    # Every updated request changed status, so it either became or stopped
+    # being accepted (or neither)
+    if update_data.status == MentorshipStatus.ACCEPTED:
+        accepted_delta = len(updated)
+    else:
+        accepted_delta = -sum(
+            1 for request_id in updated if status_before.get(request_id) == MentorshipStatus.ACCEPTED
+        )
+    
+    def count_updates(session) -> None:
+        bump_counters(session.connection(), {("mentorships", "accepted"): accepted_delta})
+        record_events(session.connection(), {status_event(update_data.status, now): len(updated)})
+    
+    await db.run_sync(count_updates)
+    
+    # Notify the students (outbox rows commit with the update)
+    await notify_many(db, (
+        (
+            student_id,
+            "mentorship_response",
+            {
+                "request_id": str(request_id),
+                "status": update_data.status.value,
+                "alumni_name": current_user.full_name,
+                "updated_at": now.isoformat()
+            }
+        )
+        for request_id, student_id in updated.items()
+    ))
+    
+    await db.commit()
+    
+    unchanged = set(status_before) - set(updated)
+    
+    return MentorshipBulkUpdateResponse(
+        status=update_data.status,
+        updated=len(updated),
+        unchanged=len(unchanged),
+        results=[
+            MentorshipBulkOutcome(
+                request_id=request_id,
+                updated=request_id in updated,
+                unchanged=request_id in unchanged,
+                error=None if request_id in status_before else "Mentorship request not found"
+            )
+            for request_id in request_ids
+        ]
+    )
 
 
 @router.patch("/requests/{request_id}", response_model=MentorshipRequestResponse)
 async def update_mentorship_request(
     request_id: uuid.UUID,
     update_data: MentorshipRequestUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update mentorship request status (alumni only).
     
     Alumni can accept or reject incoming mentorship requests.
+    Queues a real-time WebSocket notification to the student.
+    
+    Reopening a closed request (back to pending or accepted) needs free
+    mentor capacity.
     """
     # Only alumni can update requests
     if current_user.role != UserRole.ALUMNI:
@@ -201,6 +491,11 @@ async def update_mentorship_request(
             detail="Only alumni can update mentorship requests"
         )
     
+    # Reopening takes capacity: lock the mentor before reading the request
+    capacity_left = None
+    if update_data.status in OPEN_STATUSES:
+        capacity_left = await free_capacity(db, current_user.id)
+    
     # Get the request
     query = select(MentorshipRequest).where(
         MentorshipRequest.id == request_id,
@@ -215,23 +510,111 @@ async def update_mentorship_request(
             detail="Mentorship request not found"
         )
     
+    if (
+        capacity_left is not None
+        and mentorship_request.status not in OPEN_STATUSES
+        and capacity_left <= 0
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You are at your mentorship capacity"
+        )
+    
     # Update status
     mentorship_request.status = update_data.status
-    await db.commit()
-    await db.refresh(mentorship_request)
+    mentorship_request.updated_at = datetime.utcnow()
     
-    # Send WebSocket notification to student
-    await connection_manager.send_to_user(
-        user_id=mentorship_request.student_id,
-        message={
-            "type": "mentorship_response",
-            "data": {
-                "request_id": str(mentorship_request.id),
-                "status": update_data.status.value,
-                "alumni_name": current_user.full_name,
-                "updated_at": mentorship_request.updated_at.isoformat()
-            }
+    # Notify the student (outbox row commits with the update)
+    notify(
+        db,
+        mentorship_request.student_id,
+        "mentorship_response",
+        {
+            "request_id": str(mentorship_request.id),
+            "status": update_data.status.value,
+            "alumni_name": current_user.full_name,
+            "updated_at": mentorship_request.updated_at.isoformat()
         }
     )
     
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Reopening a request while the pair has another pending one
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The student already has a pending request with you"
+        )
+    await db.refresh(mentorship_request)
+    
     return mentorship_request
+
+
+@router.get("/recommendations", response_model=List[MentorRecommendation])
+async def get_mentor_recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Recommend mentors for the current student (students only).
+    
+    Mentors are scored against the student's interests, department and
+    graduation year by the in-memory mentor matcher. Mentors the student
+    already has a pending or accepted request with are left out.
+    """
+    if current_user.role != UserRole.STUDENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only students can get mentor recommendations"
+        )
+    
+    result = await db.execute(
+        select(Profile).where(Profile.user_id == current_user.id)
+    )
+    profile = result.scalar_one_or_none()
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    # Mentors already requested
+    existing_result = await db.execute(
+        select(MentorshipRequest.alumni_id).where(
+            MentorshipRequest.student_id == current_user.id,
+            MentorshipRequest.status.in_([MentorshipStatus.PENDING, MentorshipStatus.ACCEPTED])
+        )
+    )
+    exclude = set(existing_result.scalars().all())
+    
+    await mentor_matcher.sync(db)
+    ranked = mentor_matcher.rank(
+        interests=profile.interests or [],
+        department=profile.department,
+        graduation_year=profile.graduation_year,
+        limit=limit,
+        exclude=exclude
+    )
+    
+    if not ranked:
+        return []
+    
+    # Load the recommended mentors with their profiles
+    mentors_result = await db.execute(
+        select(User)
+        .options(joinedload(User.profile))
+        .where(User.id.in_([mentor_id for mentor_id, _ in ranked]))
+    )
+    mentors = {mentor.id: mentor for mentor in mentors_result.scalars().all()}
+    
+    return [
+        MentorRecommendation(
+            score=round(score, 4),
+            mentor=AlumniPublicOut.model_validate(mentors[mentor_id])
+        )
+        for mentor_id, score in ranked
+        if mentor_id in mentors
+    ]
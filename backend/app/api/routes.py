@@ -1,8 +1,13 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
+from app.core.auth import authenticate_token
 from app.websockets.manager import manager
-from app.db.session import get_db
+from app.websockets.codec import decode_control, negotiate
+from app.core.metrics import metrics, process_rss_bytes
+from app.db.session import get_db, AsyncSessionLocal
+from app.services.notifications import replay_notifications
 from uuid import UUID
 import uuid
 
@@ -31,17 +36,58 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     }
 
 
+@router.get("/metrics")
+async def get_metrics():
+    """
+    In-process metrics for this worker.
+    
+    Returns:
+        dict: Snapshot of counters, gauges and latency histograms
+    """
+    metrics.gauge("process.rss_bytes").set(process_rss_bytes())
+    return metrics.snapshot()
+
+
 @router.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    user_id: str,
+    token: Optional[str] = None,
+    last_seq: Optional[int] = None
+):
     """
     WebSocket endpoint for real-time notifications.
     
+    Browsers can't set headers on a WebSocket, so the access token is passed
+    as ``?token=<access token>``. The connection is closed with code 1008
+    unless the token belongs to ``user_id`` and the account is active.
+    
+    Clients may request a compact v2 subprotocol via Sec-WebSocket-Protocol:
+    "gradconnect.v2.msgpack" (binary MessagePack) or "gradconnect.v2.json".
+    v2 frames hold an array of messages coalesced over a short window;
+    without a subprotocol every message is its own JSON text frame.
+    
+    The server pings idle v2 sockets with {"type": "ping"}; clients reply
+    with {"type": "pong"}. Once a client has answered, it is disconnected if
+    it stops answering for the heartbeat timeout. Legacy (no subprotocol)
+    sockets get no ping messages; dead ones are detected by the server's
+    protocol-level ping frames.
+    
+    Clients subscribe to topics with {"type": "subscribe", "topics": [...]}
+    (and "unsubscribe"); see app.websockets.topics for topic names.
+    
+    Notifications carry a ``seq`` number. A client that reconnects with
+    ``?last_seq=<highest seq seen>`` first receives the notifications it
+    missed, then live ones; duplicates (seq already seen) can be ignored.
+    
     Args:
         websocket: WebSocket connection
         user_id: UUID string of the connecting user
+        token: JWT access token of that user
+        last_seq: Highest notification seq the client has already received
     
     Example client usage:
-        const ws = new WebSocket('ws://localhost:8000/api/ws/123e4567-e89b-12d3-a456-426614174000');
+        const ws = new WebSocket('ws://localhost:8000/api/ws/123e4567-e89b-12d3-a456-426614174000?token=<access token>&last_seq=42');
         ws.onmessage = (event) => console.log(JSON.parse(event.data));
     """
     try:
@@ -51,32 +97,74 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         await websocket.close(code=1003, reason="Invalid user ID format")
         return
     
+    # Authenticate before accepting: notifications and replays are private
+    try:
+        async with AsyncSessionLocal() as db:
+            principal = await authenticate_token(token, db)
+    except HTTPException:
+        principal = None
+    if principal is None or principal.id != user_uuid:
+        await websocket.close(code=1008, reason="Not authorized")
+        return
+    
     # Connect the user
-    await manager.connect(websocket, user_uuid)
+    frame_format = negotiate(websocket.scope.get("subprotocols", []))
+    connection = await manager.connect(websocket, user_uuid, frame_format)
     
     try:
         # Send welcome message
-        await manager.send_personal_message(
+        connection.send(
             {
                 "type": "connection",
                 "message": f"Welcome! You are connected as user {user_id}",
                 "connections": manager.get_user_connection_count(user_uuid)
-            },
-            user_uuid
+            }
         )
         
+        # Replay notifications missed while offline (registered first, so
+        # nothing dispatched in between is lost)
+        if last_seq is not None:
+            async with AsyncSessionLocal() as db:
+                for message in await replay_notifications(db, user_uuid, last_seq):
+                    connection.send(message)
+        
         # Listen for messages
         while True:
-            data = await websocket.receive_text()
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            
+            # Any inbound frame proves the connection is alive
+            connection.touch()
+            data = frame.get("text") if frame.get("text") is not None else frame.get("bytes")
+            control = decode_control(data)
+            if control is not None:
+                if control["type"] == "pong":
+                    connection.pong()
+                elif control["type"] in ("subscribe", "unsubscribe"):
+                    topics = control.get("topics")
+                    topics = topics if isinstance(topics, list) else []
+                    rejected = []
+                    if control["type"] == "subscribe":
+                        rejected = manager.subscribe(connection, topics)
+                    else:
+                        manager.unsubscribe(connection, topics)
+                    connection.send(
+                        {
+                            "type": "subscriptions",
+                            "topics": sorted(connection.topics or ()),
+                            "rejected": rejected
+                        }
+                    )
+                continue
             
             # Echo back the message (demo functionality)
-            await manager.send_personal_message(
+            connection.send(
                 {
                     "type": "echo",
                     "message": f"You sent: {data}",
                     "user_id": str(user_uuid)
-                },
-                user_uuid
+                }
             )
     
     except WebSocketDisconnect:
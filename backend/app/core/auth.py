@@ -1,40 +1,101 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import uuid
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.hashing import get_password_hash, password_hash_pool, verify_password
+from app.core.metrics import metrics
 from app.db.session import get_db
-from app.models.user import User
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.models.user import User, UserRole
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_password_hash(password: str) -> str:
+@dataclass(frozen=True, slots=True)
+class Principal:
     """
-    Hash a password using bcrypt.
+    Authenticated user as seen by endpoints.
+    
+    A detached snapshot of the User fields needed for authorization, so it
+    can be cached across requests. Load the User row when more is needed.
+    """
+    id: uuid.UUID
+    role: UserRole
+    is_active: bool
+    full_name: str
+
+
+# Authenticated principals by user id; see invalidate_principal
+principal_cache = TTLCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES
+)
+_principal_cache_hits = metrics.counter("auth.principal_cache.hits")
+_principal_cache_misses = metrics.counter("auth.principal_cache.misses")
+
+
+# Backplane control message carrying invalidated user ids; the application
+# registers evict_principals as its handler
+PRINCIPAL_INVALIDATION = "auth.invalidate"
+
+
+def invalidate_principal(
+    user_ids: Iterable[uuid.UUID],
+    publish: Callable[[str, Any], None]
+) -> None:
+    """
+    Drop cached principals after a change to a user's role, status or name.
+    
+    Evicts them in this worker and publishes PRINCIPAL_INVALIDATION so
+    every other worker evicts them too. Call after the change has committed.
+    
+    Args:
+        user_ids: UUIDs of the changed users
+        publish: Control message publisher, e.g. the connection manager's
+            publish_control
+    """
+    user_ids = list(user_ids)
+    for user_id in user_ids:
+        principal_cache.pop(user_id)
+    if user_ids:
+        publish(PRINCIPAL_INVALIDATION, [str(user_id) for user_id in user_ids])
+
+
+def evict_principals(user_ids: List[str]) -> None:
+    """Backplane handler: another worker invalidated these principals."""
+    for user_id in user_ids:
+        principal_cache.pop(uuid.UUID(user_id))
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the password hashing pool.
+    
+    Use from async endpoints so bcrypt doesn't block the event loop.
     
     Args:
         password: Plain text password
         
     Returns:
         Hashed password string
+        
+    Raises:
+        HTTPException 503: If the hashing pool is saturated
     """
-    return pwd_context.hash(password)
+    return await password_hash_pool.run(get_password_hash, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its hash.
+    Verify a password against its hash in the password hashing pool.
     
     Args:
         plain_password: Plain text password to verify
@@ -42,8 +103,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         
     Returns:
         True if password matches, False otherwise
+        
+    Raises:
+        HTTPException 503: If the hashing pool is saturated
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -114,19 +178,20 @@ def decode_refresh_token(token: str) -> Dict[str, Any]:
 
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+async def authenticate_token(token: Optional[str], db: AsyncSession) -> Principal:
     """
-    FastAPI dependency to get the current authenticated user from JWT token.
+    Resolve an access token to the active user it was issued to.
+    
+    The principal is cached per user id for AUTH_CACHE_TTL_SECONDS, so hot
+    endpoints don't query the users table on every request. Admin actions
+    that change a user's status invalidate the entry.
     
     Args:
-        token: JWT token from Authorization header
+        token: JWT access token
         db: Database session
         
     Returns:
-        Current authenticated User object
+        Authenticated Principal
         
     Raises:
         HTTPException: If token is invalid or user not found/inactive
@@ -137,6 +202,9 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    if not token:
+        raise credentials_exception
+    
     try:
         # Decode JWT token
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -154,28 +222,59 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    # Query user from database
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    principal = principal_cache.get(user_id)
     
-    if user is None:
-        raise credentials_exception
+    if principal is None:
+        _principal_cache_misses.inc()
+        
+        # Query user from database
+        result = await db.execute(
+            select(User.id, User.role, User.is_active, User.full_name)
+            .where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        
+        if row is None:
+            raise credentials_exception
+        
+        principal = Principal(*row)
+        principal_cache.set(user_id, principal)
+    else:
+        _principal_cache_hits.inc()
     
     # Check if user is active
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user account"
         )
     
-    return user
+    return principal
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    FastAPI dependency to get the current authenticated user from JWT token.
+    
+    Args:
+        token: JWT token from Authorization header
+        db: Database session
+        
+    Returns:
+        Current authenticated Principal
+        
+    Raises:
+        HTTPException: If token is invalid or user not found/inactive
+    """
+    return await authenticate_token(token, db)
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Dependency to ensure user is active.
     
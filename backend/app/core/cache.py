@@ -0,0 +1,58 @@
+"""
+In-process TTL + LRU cache.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire after a fixed time-to-live.
+    
+    Least recently used entries are evicted once max_entries is reached.
+    Not thread-safe; intended for use from the event loop.
+    
+    Args:
+        ttl_seconds: Lifetime of an entry
+        max_entries: Maximum number of entries kept
+    """
+    
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
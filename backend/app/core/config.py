@@ -14,6 +14,74 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Authenticated principal cache (get_current_user)
+    AUTH_CACHE_TTL_SECONDS: float = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing pool
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    
+    # Bulk user import
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    BULK_IMPORT_HASH_WORKERS: int = 0  # 0 = one process per CPU
+    
+    # WebSocket delivery: queued messages per connection before it is
+    # disconnected as a slow consumer
+    WS_SEND_QUEUE_SIZE: int = 256
+    
+    # v2 (batched) WebSocket clients: messages queued within this window are
+    # sent as one frame of at most WS_MAX_BATCH messages
+    WS_COALESCE_WINDOW_MS: float = 10
+    WS_MAX_BATCH: int = 100
+    WS_PER_MESSAGE_DEFLATE: bool = True
+    
+    # WebSocket heartbeat: idle connections are pinged after the interval and
+    # closed if nothing arrives within the timeout after that (0 disables)
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 30
+    WS_HEARTBEAT_TIMEOUT_SECONDS: float = 30
+    
+    # WebSocket topic subscriptions per connection
+    WS_MAX_TOPICS_PER_CONNECTION: int = 32
+    
+    # Cross-worker WebSocket delivery: "local" (single worker), "sqlite"
+    # (workers on one host; URL is the broker file) or "redis" (URL is a
+    # redis:// URL)
+    WS_BACKPLANE: str = "local"
+    WS_BACKPLANE_URL: str = ""
+    WS_BACKPLANE_POLL_INTERVAL: float = 0.05
+    
+    # Notification outbox
+    NOTIFICATION_BATCH_SIZE: int = 500
+    NOTIFICATION_POLL_SECONDS: float = 1.0
+    NOTIFICATION_REPLAY_LIMIT: int = 500
+    NOTIFICATION_RETENTION_DAYS: int = 7
+    
+    # Mentor assignment: in-memory mentor loads are reloaded from the
+    # database after this many seconds (picks up other workers' changes)
+    MENTOR_LOAD_RESYNC_SECONDS: float = 300
+    
+    # Mentor matching: the in-memory mentor matrix is reloaded from the
+    # database after this many seconds (picks up other workers' changes)
+    MENTOR_MATCHER_RESYNC_SECONDS: float = 300
+    
+    # Rows fetched and encoded per chunk of an admin user export
+    ADMIN_EXPORT_CHUNK_SIZE: int = 1000
+    
+    # Single-flight reads (admin stats, alumni search): identical concurrent
+    # requests share one computation, and its result for this many seconds
+    SINGLEFLIGHT_WINDOW_SECONDS: float = 2.0
+    SINGLEFLIGHT_MAX_ENTRIES: int = 1024
+    
+    # Admin statistics counters are reconciled against the source tables
+    # every this many seconds (0 disables; they are always reconciled at
+    # startup)
+    STATS_RECONCILE_SECONDS: float = 3600
+    
+    # Event-loop lag sampling for /api/metrics, in seconds (0 disables)
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.1
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:5174"
     
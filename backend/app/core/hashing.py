@@ -0,0 +1,174 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow (~250 ms per hash), so running it inline in an
+async endpoint stalls the event loop for every other request and WebSocket
+on the worker. Hashing runs in a thread or process pool instead, behind a
+bounded queue: when the queue is full new requests are rejected with 503
+rather than piling up.
+
+The hashing functions live here rather than in app.core.auth, so process
+workers (this pool in process mode, bulk import) import passlib, settings
+and metrics but not the database engine or the WebSocket manager.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def get_password_hash(password: str) -> str:
+    """
+    Hash a password using bcrypt.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password string
+    """
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash.
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords (runs in a bulk import worker process)."""
+    return [pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHashPool:
+    """
+    Executor for CPU-heavy password hashing with backpressure.
+    
+    Args:
+        workers: Number of worker threads/processes
+        queue_size: Jobs allowed to wait when every worker is busy
+        executor: "thread" (bcrypt releases the GIL) or "process"
+    """
+    
+    def __init__(self, workers: int, queue_size: int, executor: str = "thread"):
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        
+        self._queue_depth = metrics.gauge("password_hash.queue_depth")
+        self._in_flight = metrics.gauge("password_hash.in_flight")
+        self._rejected = metrics.counter("password_hash.rejected")
+        self._latency = metrics.histogram("password_hash.latency_seconds")
+        self._wait = metrics.histogram("password_hash.queue_wait_seconds")
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # Forking the threaded server process is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash"
+                )
+        return self._executor
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a hashing function in the pool.
+        
+        Args:
+            func: Picklable module-level function (for process pools)
+            *args: Arguments for func
+            
+        Returns:
+            The function's result
+            
+        Raises:
+            HTTPException 503: If the pool queue is saturated
+        """
+        if self._pending >= self.max_pending:
+            self._rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+        
+        self._pending += 1
+        self._update_depth()
+        submitted = time.monotonic()
+        
+        # The slot is freed when the job finishes, not when the caller stops
+        # waiting: a cancelled request's hash may still be queued or running
+        loop = asyncio.get_running_loop()
+        future = self._get_executor().submit(_timed, func, args, submitted)
+        future.add_done_callback(
+            lambda done: _call_soon(loop, self._job_done, done, submitted)
+        )
+        
+        waited, result = await asyncio.wrap_future(future)
+        self._wait.observe(waited)
+        return result
+    
+    def _job_done(self, future: Future, submitted: float) -> None:
+        self._pending -= 1
+        self._update_depth()
+        if not future.cancelled():
+            self._latency.observe(time.monotonic() - submitted)
+    
+    def _update_depth(self) -> None:
+        self._in_flight.set(min(self._pending, self.workers))
+        self._queue_depth.set(max(self._pending - self.workers, 0))
+    
+    def shutdown(self) -> None:
+        """Stop the workers (on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args: Any) -> None:
+    """Run callback on the event loop from an executor thread."""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        # Loop already closed (application shutdown)
+        pass
+
+
+def _timed(func: Callable[..., Any], args: tuple, submitted: float) -> Tuple[float, Any]:
+    """Worker-side wrapper returning (seconds waited in the queue, result)."""
+    return time.monotonic() - submitted, func(*args)
+
+
+# Global password hashing pool
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    executor=settings.PASSWORD_HASH_EXECUTOR
+)
@@ -0,0 +1,173 @@
+"""
+Lightweight in-process metrics.
+
+Counters, gauges and latency histograms kept in memory and exposed as a
+JSON snapshot by GET /api/metrics.
+"""
+import asyncio
+import os
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# Samples kept per histogram for percentile estimates
+HISTOGRAM_WINDOW = 1024
+
+
+class Counter:
+    """Monotonically increasing count."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self):
+        self.value = 0
+    
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+    
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Gauge:
+    """Value that goes up and down, e.g. a queue depth."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self):
+        self.value = 0
+    
+    def set(self, value: float) -> None:
+        self.value = value
+    
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+    
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+    
+    def snapshot(self) -> float:
+        return self.value
+
+
+class Histogram:
+    """Latency distribution: totals plus percentiles over recent samples."""
+    
+    __slots__ = ("count", "total", "max", "_samples")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: Deque[float] = deque(maxlen=HISTOGRAM_WINDOW)
+    
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._samples.append(value)
+    
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q / 100 * len(ordered)))
+        return ordered[index]
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "p50": round(self.percentile(50), 6),
+            "p99": round(self.percentile(99), 6),
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+    
+    def _get(self, name: str, kind: type):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = kind()
+        return metric
+    
+    def counter(self, name: str) -> Counter:
+        return self._get(name, Counter)
+    
+    def gauge(self, name: str) -> Gauge:
+        return self._get(name, Gauge)
+    
+    def histogram(self, name: str) -> Histogram:
+        return self._get(name, Histogram)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current value of every metric, keyed by name."""
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+
+def process_rss_bytes() -> int:
+    """Resident memory of this process in bytes (peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class EventLoopLagMonitor:
+    """
+    Samples event-loop lag: how late a sleep of ``interval`` wakes up.
+    
+    Lag is time during which the loop could not run ready callbacks, e.g.
+    a blocking call or a CPU-heavy fan-out. Recorded in the
+    ``event_loop.lag_seconds`` histogram.
+    """
+    
+    def __init__(self):
+        self._lag = metrics.histogram("event_loop.lag_seconds")
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self, interval: float) -> None:
+        """
+        Start sampling on the running loop.
+        
+        Args:
+            interval: Seconds between samples (0 disables the monitor)
+        """
+        if interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+    
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self, interval: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            self._lag.observe(max(0.0, loop.time() - started - interval))
+
+
+# Global event-loop lag monitor (started in the application lifespan)
+loop_lag_monitor = EventLoopLagMonitor()
@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque URL-safe tokens that encode the sort key of the last row
+on a page, so the next page is a range scan on an index instead of an
+OFFSET that re-reads every skipped row.
+"""
+import base64
+import json
+from enum import Enum
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class CountMode(str, Enum):
+    """How the total result count is computed for a paginated listing."""
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+# Rows counted at most when estimating on databases without planner statistics
+ESTIMATE_COUNT_CAP = 10000
+
+
+def encode_cursor(sort: str, values: List[Any]) -> str:
+    """
+    Encode a sort key into an opaque cursor.
+
+    Args:
+        sort: Name of the sort order the key belongs to
+        values: Sort key values of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"s": sort, "k": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from the client
+        sort: Sort order the cursor is expected to belong to
+
+    Returns:
+        Sort key values of the last row on the previous page
+
+    Raises:
+        HTTPException 400: If the cursor is malformed or from another sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    if cursor_sort != sort or not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pagination cursor does not match this query"
+        )
+
+    return values
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode) -> Optional[int]:
+    """
+    Count the rows a query would return.
+
+    Args:
+        db: Database session
+        query: Filtered query without ordering or pagination
+        mode: EXACT runs COUNT(*); ESTIMATE uses the PostgreSQL planner
+            estimate (or a count capped at ESTIMATE_COUNT_CAP elsewhere);
+            NONE skips counting
+
+    Returns:
+        Row count, or None when counting is skipped
+    """
+    if mode == CountMode.NONE:
+        return None
+
+    if mode == CountMode.ESTIMATE:
+        if db.bind.dialect.name == "postgresql":
+            estimate = await _planner_estimate(db, query)
+            if estimate is not None:
+                return estimate
+
+        capped = query.limit(ESTIMATE_COUNT_CAP).subquery()
+        result = await db.execute(select(func.count()).select_from(capped))
+        return result.scalar() or 0
+
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    return result.scalar() or 0
+
+
+async def _planner_estimate(db: AsyncSession, query: Select) -> Optional[int]:
+    """Read the planner's row estimate for a query from EXPLAIN."""
+    try:
+        compiled = query.compile(
+            dialect=db.bind.dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        # Savepoint so a failed EXPLAIN doesn't abort the outer transaction
+        async with db.begin_nested():
+            result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
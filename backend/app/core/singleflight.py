@@ -0,0 +1,115 @@
+"""
+Single-flight coalescing for expensive reads.
+
+Concurrent calls with the same key share one in-flight computation, and its
+result keeps being served for a short window afterwards, so a burst of
+identical requests (a dashboard opened by many admins at once, a popular
+search) costs one computation instead of one per request.
+
+Results must not depend on the caller beyond the key and must not be
+mutated by callers: every caller in the window gets the same object.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.core.cache import TTLCache
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The computing call was cancelled; waiters retry."""
+
+
+class SingleFlight:
+    """
+    Keyed single-flight group with a short-lived result cache.
+
+    Metrics (``singleflight.<name>.*``): ``hits`` (served from the window),
+    ``coalesced`` (joined an in-flight computation), ``misses`` (computed),
+    ``wait_seconds`` (time coalesced callers waited) and
+    ``compute_seconds``.
+
+    Args:
+        name: Metric name suffix
+        window_seconds: How long a result is shared after it completes
+            (0 shares only in-flight computations)
+        max_entries: Maximum number of results kept
+    """
+
+    def __init__(self, name: str, window_seconds: float, max_entries: int):
+        self.name = name
+        self.window_seconds = window_seconds
+        self._results = TTLCache(window_seconds, max_entries)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        self._hits = metrics.counter(f"singleflight.{name}.hits")
+        self._coalesced = metrics.counter(f"singleflight.{name}.coalesced")
+        self._misses = metrics.counter(f"singleflight.{name}.misses")
+        self._wait = metrics.histogram(f"singleflight.{name}.wait_seconds")
+        self._compute = metrics.histogram(f"singleflight.{name}.compute_seconds")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return fn()'s result, sharing it with concurrent calls for ``key``.
+
+        Exceptions raised by fn (e.g. HTTPException) are raised to every
+        caller that shared the computation; they are not kept for the window.
+
+        Args:
+            key: Hashable identity of the computation
+            fn: Coroutine function computing the result
+
+        Returns:
+            The shared result
+        """
+        while True:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._hits.inc()
+                return cached[0]
+
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._lead(key, fn)
+
+            self._coalesced.inc()
+            started = time.perf_counter()
+            try:
+                # Shielded: a waiter going away must not cancel the others
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+            finally:
+                self._wait.observe(time.perf_counter() - started)
+
+    def forget(self, key: Hashable) -> None:
+        """Stop sharing a completed result (e.g. after a write it predates)."""
+        self._results.pop(key)
+
+    def clear(self) -> None:
+        """Stop sharing every completed result."""
+        self._results.clear()
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._misses.inc()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started = time.perf_counter()
+        try:
+            value = await fn()
+        except BaseException as e:
+            future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # Mark it retrieved in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            if self.window_seconds > 0:
+                self._results.set(key, (value,))
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+            self._compute.observe(time.perf_counter() - started)
@@ -0,0 +1,20 @@
+"""
+Dialect-specific SQL helpers shared by the models and services.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def upsert_insert(dialect_name: str, table):
+    """
+    Return an INSERT construct that supports ON CONFLICT clauses.
+
+    Args:
+        dialect_name: Database dialect name ("sqlite" or "postgresql")
+        table: Mapped class or Table to insert into
+
+    Returns:
+        Dialect-specific Insert with on_conflict_do_nothing/do_update
+    """
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -3,10 +3,20 @@ Database initialization script for GradConnect.
 
 Creates all database tables if they don't exist.
 """
+from datetime import datetime
+from sqlalchemy import Connection, inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncEngine
 from app.db.base import Base
 from app.models.user import User, Profile
-from app.models.mentorship import MentorshipRequest
+from app.models.mentorship import MentorshipRequest, MentorshipStatus
+from app.models.tag import Tag, ProfileTag
+from app.models.notification import NotificationOutbox
+from app.models.stats import StatCounter
+from app.models.analytics import AnalyticsRollup
+from app.services.analytics import backfill_rollups
+from app.services.search import install_search_index
+from app.services.stats import reconcile_counters
+from app.services.tags import backfill_profile_tags, publish_interned_tags
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,8 +33,104 @@ async def init_db(engine: AsyncEngine) -> None:
         async with engine.begin() as conn:
             # Create all tables defined in Base metadata
             await conn.run_sync(Base.metadata.create_all)
+            
+            # Columns and indexes added to tables that already existed
+            await conn.run_sync(_add_missing_columns)
+            await conn.run_sync(_resolve_duplicate_pending_requests)
+            await conn.run_sync(_create_missing_indexes)
+            
+            # Full-text search index and its sync triggers
+            await conn.run_sync(install_search_index)
+            
+            # Normalized tags for profiles created before tag indexing
+            interned_tags = await conn.run_sync(backfill_profile_tags)
+            
+            # Admin statistics counters (seeds them on existing databases)
+            await conn.run_sync(reconcile_counters)
+            
+            # Analytics rollups (built once on databases that predate them)
+            await conn.run_sync(backfill_rollups)
+        
+        # Tag ids are only cached once the backfill has committed
+        publish_interned_tags(interned_tags)
         
         logger.info("✅ Database tables created successfully")
     except Exception as e:
         logger.error(f"❌ Error creating database tables: {e}")
         raise
+
+
+def _resolve_duplicate_pending_requests(conn: Connection) -> None:
+    """
+    Reject all but the oldest pending request of each (student, alumni) pair.
+    
+    Databases created before uq_mentorship_requests_pending_pair may hold
+    duplicates from concurrent submissions, which would make the unique
+    index fail to build.
+    
+    Args:
+        conn: Synchronous SQLAlchemy connection
+    """
+    indexes = inspect(conn).get_indexes(MentorshipRequest.__tablename__)
+    if any(index["name"] == "uq_mentorship_requests_pending_pair" for index in indexes):
+        return
+    
+    rows = conn.execute(
+        select(MentorshipRequest.id, MentorshipRequest.student_id, MentorshipRequest.alumni_id)
+        .where(MentorshipRequest.status == MentorshipStatus.PENDING)
+        .order_by(MentorshipRequest.created_at, MentorshipRequest.id)
+    )
+    seen = set()
+    duplicates = []
+    for request_id, student_id, alumni_id in rows:
+        if (student_id, alumni_id) in seen:
+            duplicates.append(request_id)
+        else:
+            seen.add((student_id, alumni_id))
+    
+    if duplicates:
+        conn.execute(
+            update(MentorshipRequest)
+            .where(MentorshipRequest.id.in_(duplicates))
+            .values(status=MentorshipStatus.REJECTED, updated_at=datetime.utcnow())
+        )
+        logger.warning(f"⚠️ Rejected {len(duplicates)} duplicate pending mentorship requests")
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """
+    Add model columns missing from existing tables.
+    
+    create_all never alters existing tables. Added columns must be nullable
+    or have a server default so existing rows get a value.
+    
+    Args:
+        conn: Synchronous SQLAlchemy connection
+    """
+    inspector = inspect(conn)
+    ddl = conn.dialect.ddl_compiler(conn.dialect, None)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            conn.exec_driver_sql(
+                f"ALTER TABLE {ddl.preparer.format_table(table)} "
+                f"ADD COLUMN {ddl.get_column_specification(column)}"
+            )
+            logger.info(f"✅ Added column {table.name}.{column.name}")
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+    """
+    Create model indexes missing from existing tables.
+    
+    create_all only creates indexes together with new tables, so indexes
+    added to a model later would otherwise never reach existing databases.
+    
+    Args:
+        conn: Synchronous SQLAlchemy connection
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
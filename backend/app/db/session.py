@@ -1,3 +1,4 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
 from typing import AsyncGenerator
@@ -5,13 +6,18 @@ from typing import AsyncGenerator
 # Create async engine - Using SQLite for local development
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./gradconnect.db"
 
+# Pool sizing applies to server databases; the SQLite dialect rejects it
+_pool_args = (
+    {} if make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite"
+    else {"pool_size": 10, "max_overflow": 20}
+)
+
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
     connect_args={"check_same_thread": False},
-    pool_size=10,
-    max_overflow=20
+    **_pool_args
 )
 
 # Create async session factory
@@ -7,14 +7,22 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.auth import PRINCIPAL_INVALIDATION, evict_principals
 from app.core.config import settings
-from app.db.session import engine
+from app.core.hashing import password_hash_pool
+from app.core.metrics import loop_lag_monitor
+from app.db.session import engine, AsyncSessionLocal
 from app.db.init_db import init_db
 from app.api.routes import router
 from app.api.auth import router as auth_router
 from app.api.alumni import router as alumni_router
 from app.api.mentorship import router as mentorship_router
 from app.api.admin import router as admin_router
+from app.websockets.backplane import create_backplane
+from app.websockets.manager import manager as connection_manager
+from app.services.bulk_import import import_hash_pool
+from app.services.notifications import notification_dispatcher
+from app.services.stats import stats_reconciler
 
 
 # Security headers middleware
@@ -37,19 +45,42 @@ async def lifespan(app: FastAPI):
     Startup:
     - Initialize database connection
     - Create tables if they don't exist
+    - Start the WebSocket backplane (with the cached-principal eviction
+      handler), notification dispatcher and statistics reconciler
+    - Start sampling event-loop lag
+    - Create the bulk import hashing pool
     
     Shutdown:
+    - Stop the lag monitor, statistics reconciler, notification dispatcher
+      and WebSocket backplane
+    - Stop the password hashing and bulk import hashing pools
     - Close database connections gracefully
     """
     # Startup
     print(f"🚀 Starting {settings.APP_NAME}...")
     await init_db(engine)
+    connection_manager.on_control(PRINCIPAL_INVALIDATION, evict_principals)
+    await connection_manager.start(create_backplane(
+        settings.WS_BACKPLANE,
+        settings.WS_BACKPLANE_URL,
+        settings.WS_BACKPLANE_POLL_INTERVAL
+    ))
+    notification_dispatcher.start(AsyncSessionLocal)
+    stats_reconciler.start(AsyncSessionLocal)
+    loop_lag_monitor.start(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS)
+    import_hash_pool.start(settings.BULK_IMPORT_HASH_WORKERS or None)
     print(f"✅ {settings.APP_NAME} is ready!")
     
     yield
     
     # Shutdown
     print(f"🛑 Shutting down {settings.APP_NAME}...")
+    await loop_lag_monitor.stop()
+    await stats_reconciler.stop()
+    await notification_dispatcher.stop()
+    await connection_manager.stop()
+    password_hash_pool.shutdown()
+    await import_hash_pool.stop()
     await engine.dispose()
     print(f"✅ {settings.APP_NAME} shutdown complete")
 
@@ -79,6 +110,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition"],
 )
 
 
@@ -144,6 +176,10 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        ws_per_message_deflate=settings.WS_PER_MESSAGE_DEFLATE,
+        # Protocol-level pings detect dead sockets of every client
+        ws_ping_interval=settings.WS_HEARTBEAT_INTERVAL_SECONDS,
+        ws_ping_timeout=settings.WS_HEARTBEAT_TIMEOUT_SECONDS
     )
 
@@ -0,0 +1,30 @@
+from sqlalchemy import String, Date, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date
+from app.db.base import Base
+
+
+class AnalyticsRollup(Base):
+    """
+    Pre-aggregated event counts per time bucket.
+
+    One row per (metric, dimension, granularity, bucket, value), e.g.
+    ("signups", "role", "week", 2024-05-06, "alumni") -> 12. Buckets start on
+    the day, the Monday of the week or the first of the month. Rows are
+    appended to as events happen (see app.services.analytics); the primary
+    key order serves a chart of one series as a single range scan.
+    """
+    __tablename__ = "analytics_rollups"
+
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(16), primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket: Mapped[date] = mapped_column(Date, primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AnalyticsRollup {self.metric}/{self.dimension}/{self.granularity} "
+            f"{self.bucket} {self.value}={self.count}>"
+        )
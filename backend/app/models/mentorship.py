@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Enum as SQLEnum, Text, ForeignKey
+from sqlalchemy import String, DateTime, Enum as SQLEnum, Text, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -16,27 +16,51 @@ class MentorshipStatus(str, Enum):
     COMPLETED = "completed"
 
 
+# Rows covered by uq_mentorship_requests_pending_pair (the enum is stored by
+# name). Also the conflict target predicate of INSERT ... ON CONFLICT.
+PENDING_REQUEST_PREDICATE = text("status = 'PENDING'")
+
+
 class MentorshipRequest(Base, UUIDMixin):
     """
     Mentorship request model.
     
     Tracks mentorship requests from students to alumni mentors.
+    
+    - uq_mentorship_requests_pending_pair: at most one pending request per
+      (student, alumni) pair
+    - ix_mentorship_requests_{alumni,student}_inbox (owner, created_at, id)
+      and ix_mentorship_requests_{alumni,student}_status_inbox (owner,
+      status, created_at, id): newest-first inbox pages, unfiltered and by
+      status, without a sort (see app.services.inbox)
     """
     __tablename__ = "mentorship_requests"
+    __table_args__ = (
+        Index(
+            "uq_mentorship_requests_pending_pair",
+            "student_id",
+            "alumni_id",
+            unique=True,
+            sqlite_where=PENDING_REQUEST_PREDICATE,
+            postgresql_where=PENDING_REQUEST_PREDICATE,
+        ),
+        Index("ix_mentorship_requests_alumni_inbox", "alumni_id", "created_at", "id"),
+        Index("ix_mentorship_requests_alumni_status_inbox", "alumni_id", "status", "created_at", "id"),
+        Index("ix_mentorship_requests_student_inbox", "student_id", "created_at", "id"),
+        Index("ix_mentorship_requests_student_status_inbox", "student_id", "status", "created_at", "id"),
+    )
     
     # Foreign Keys
     student_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     alumni_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # Request Details
@@ -0,0 +1,54 @@
+from sqlalchemy import String, Integer, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from typing import Optional
+import uuid
+from app.db.base import Base
+
+
+class NotificationOutbox(Base):
+    """
+    Durable outbox of real-time notifications.
+
+    Rows are written in the same transaction as the change they announce and
+    delivered over WebSocket by the notification dispatcher after commit.
+    The integer id doubles as the per-deployment sequence number clients
+    send back as ``last_seq`` to replay what they missed while offline.
+
+    - ix_notification_outbox_user_seq (user_id, id): replay for a user
+    - ix_notification_outbox_undispatched (dispatched_at, id): dispatcher scan
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_user_seq", "user_id", "id"),
+        Index("ix_notification_outbox_undispatched", "dispatched_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False
+    )
+    dispatched_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+
+    def to_message(self) -> dict:
+        """WebSocket message for this notification."""
+        return {"type": self.type, "seq": self.id, "data": self.payload}
+
+    def __repr__(self) -> str:
+        return f"<NotificationOutbox {self.id} {self.type} -> {self.user_id}>"
@@ -0,0 +1,22 @@
+from sqlalchemy import String, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class StatCounter(Base):
+    """
+    Incrementally maintained dashboard counter.
+
+    One row per (scope, name), e.g. ("role", "alumni"), ("department",
+    "Physics") or ("signups", "2024-05-01") for daily signups. Rows are
+    bumped in the same transaction as the writes they count and periodically
+    reconciled against the source tables (see app.services.stats).
+    """
+    __tablename__ = "stat_counters"
+
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<StatCounter {self.scope}:{self.name}={self.value}>"
@@ -0,0 +1,62 @@
+from sqlalchemy import String, Integer, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from enum import Enum
+import uuid
+from app.db.base import Base
+
+
+class TagKind(str, Enum):
+    """Which profile list a tag came from."""
+    EXPERTISE = "expertise"
+    INTEREST = "interest"
+
+
+class Tag(Base):
+    """
+    Interned, normalized (lowercase) tag.
+    
+    Shared by mentor expertise and student interests so both resolve to the
+    same integer id.
+    """
+    __tablename__ = "tags"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<Tag {self.id}:{self.name}>"
+
+
+class ProfileTag(Base):
+    """
+    Profile-tag association.
+    
+    Mirrors Profile.mentorship_expertise / Profile.interests so tag filters
+    run as index lookups instead of JSON scans.
+    
+    - Primary key (profile_id, kind, tag_id): tags of a profile
+    - ix_profile_tags_lookup (kind, tag_id, profile_id): profiles with a tag
+    """
+    __tablename__ = "profile_tags"
+    __table_args__ = (
+        Index("ix_profile_tags_lookup", "kind", "tag_id", "profile_id"),
+    )
+    
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("profiles.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    kind: Mapped[TagKind] = mapped_column(
+        SQLEnum(TagKind, name="tag_kind", native_enum=False),
+        primary_key=True
+    )
+    tag_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    def __repr__(self) -> str:
+        return f"<ProfileTag {self.profile_id} {self.kind.value}:{self.tag_id}>"
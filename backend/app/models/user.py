@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Enum as SQLEnum, Boolean, Integer, JSON, ForeignKey
+from sqlalchemy import String, DateTime, Enum as SQLEnum, Boolean, Integer, JSON, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -8,6 +8,10 @@ import uuid
 from app.db.base import Base, UUIDMixin
 
 
+# Open (pending or accepted) mentorship requests a mentor takes by default
+DEFAULT_MENTOR_CAPACITY = 5
+
+
 class UserRole(str, Enum):
     """User role enumeration - restricted to admin, alumni, and student only."""
     ADMIN = "admin"
@@ -25,6 +29,12 @@ class User(Base, UUIDMixin):
     - Student: Current students
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Alumni directory listing: filter by role/active, keyset on name
+        Index("ix_users_directory", "role", "is_active", "full_name", "id"),
+        # Admin listing and export: newest first, keyset on (created_at, id)
+        Index("ix_users_created", "created_at", "id"),
+    )
     
     # Authentication
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -85,6 +95,7 @@ class Profile(Base, UUIDMixin):
     
     Alumni-specific fields:
     - current_company, current_position, is_mentor, mentorship_expertise
+    - mentor_capacity: open mentorship requests the mentor takes at once
     
     Student-specific fields:
     - interests
@@ -110,6 +121,12 @@ class Profile(Base, UUIDMixin):
     current_company: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     current_position: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     is_mentor: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    mentor_capacity: Mapped[int] = mapped_column(
+        Integer,
+        default=DEFAULT_MENTOR_CAPACITY,
+        server_default=str(DEFAULT_MENTOR_CAPACITY),
+        nullable=False
+    )
     mentorship_expertise: Mapped[Optional[List[str]]] = mapped_column(
         JSON,
         nullable=True,
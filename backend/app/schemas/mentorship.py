@@ -3,9 +3,10 @@ Pydantic schemas for mentorship requests.
 """
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 from app.models.mentorship import MentorshipStatus
+from app.schemas.user import AlumniPublicOut
 
 
 class MentorshipRequestCreate(BaseModel):
@@ -14,11 +15,40 @@ class MentorshipRequestCreate(BaseModel):
     message: str = Field(..., min_length=10, max_length=1000, description="Message to the mentor")
 
 
+class MentorshipAutoRequest(BaseModel):
+    """Schema for a mentorship request to any suitable mentor."""
+    message: str = Field(..., min_length=10, max_length=1000, description="Message to the mentor")
+    department: Optional[str] = Field(None, max_length=255, description="Mentor department (defaults to the student's)")
+    expertise: Optional[List[str]] = Field(None, max_length=20, description="Mentor expertise, any of (defaults to the student's interests)")
+
+
 class MentorshipRequestUpdate(BaseModel):
     """Schema for updating a mentorship request status."""
     status: MentorshipStatus = Field(..., description="New status for the request")
 
 
+class MentorshipBulkUpdate(BaseModel):
+    """Schema for setting the status of several mentorship requests."""
+    request_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=100, description="Requests to update")
+    status: MentorshipStatus = Field(..., description="New status for every request (not pending)")
+
+
+class MentorshipBulkOutcome(BaseModel):
+    """Outcome for one request of a bulk update."""
+    request_id: uuid.UUID
+    updated: bool
+    unchanged: bool = False
+    error: Optional[str] = None
+
+
+class MentorshipBulkUpdateResponse(BaseModel):
+    """Result of a bulk status update, one outcome per distinct request id."""
+    status: MentorshipStatus
+    updated: int
+    unchanged: int
+    results: List[MentorshipBulkOutcome]
+
+
 class MentorshipRequestResponse(BaseModel):
     """Schema for mentorship request response."""
     model_config = ConfigDict(from_attributes=True)
@@ -42,3 +72,9 @@ class MentorshipRequestWithDetails(MentorshipRequestResponse):
     student_department: Optional[str] = None
     alumni_company: Optional[str] = None
     alumni_position: Optional[str] = None
+
+
+class MentorRecommendation(BaseModel):
+    """Recommended mentor with its match score."""
+    score: float
+    mentor: AlumniPublicOut
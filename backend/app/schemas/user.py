@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 import uuid
 from app.models.user import UserRole
@@ -66,6 +66,7 @@ class ProfileUpdate(ProfileBase):
     current_company: Optional[str] = Field(None, max_length=255)
     current_position: Optional[str] = Field(None, max_length=255)
     is_mentor: Optional[bool] = None
+    mentor_capacity: Optional[int] = Field(None, ge=0, le=100)
     mentorship_expertise: Optional[List[str]] = None
     
     # Student-specific
@@ -81,6 +82,7 @@ class ProfileOut(ProfileBase):
     current_company: Optional[str] = None
     current_position: Optional[str] = None
     is_mentor: bool
+    mentor_capacity: int
     mentorship_expertise: Optional[List[str]] = None
     
     # Student-specific
@@ -155,15 +157,27 @@ class AlumniPublicOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AlumniFacets(BaseModel):
+    """Facet counts over the filtered alumni result set."""
+    department: Dict[str, int] = Field(default_factory=dict)
+    is_mentor: Dict[str, int] = Field(default_factory=dict)
+    graduation_year: Dict[str, int] = Field(default_factory=dict)
+    expertise: Dict[str, int] = Field(default_factory=dict)
+
+
 class AlumniSearchResponse(BaseModel):
     """Paginated response for alumni search."""
-    total: int
+    total: Optional[int] = None  # None when the count was skipped
+    total_is_estimate: bool = False
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
     results: List[AlumniPublicOut]
+    facets: Optional[AlumniFacets] = None  # Only when requested
 
 
 class MentorStatusUpdate(BaseModel):
     """Schema for updating mentor availability status."""
     is_mentor: bool
+    mentor_capacity: Optional[int] = Field(None, ge=0, le=100, description="Open requests to take at once")
 
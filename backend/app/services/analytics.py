@@ -0,0 +1,326 @@
+"""
+Time-series analytics from pre-bucketed rollups.
+
+Events are counted into ``analytics_rollups`` as they happen, once per
+granularity (day, week starting Monday, month), so a chart reads one row per
+bucket and series value instead of scanning users or mentorship requests:
+
+- signups by role and by department: users created, on their signup day
+- mentorship_requests by status: requests entering a status (created as
+  pending, accepted, rejected, completed) on the day it happened
+
+Rollups are append-only event counts: later role, department or status
+changes and deletions don't rewrite past buckets. A session flush hook
+records ORM writes on the same connection, so counts commit or roll back
+with the change; Core statements that bypass the ORM call record_events
+themselves. Databases created before rollups existed are backfilled once at
+startup (backfill_rollups).
+"""
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, List, Tuple, Union
+
+from sqlalchemy import Connection, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.dialect import upsert_insert
+from app.models.analytics import AnalyticsRollup
+from app.models.mentorship import MentorshipRequest, MentorshipStatus
+from app.models.user import Profile, User, UserRole
+
+logger = logging.getLogger(__name__)
+
+
+class Metric(str, Enum):
+    """Counted event."""
+    SIGNUPS = "signups"
+    MENTORSHIP_REQUESTS = "mentorship_requests"
+
+
+class Granularity(str, Enum):
+    """Bucket width."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+# Series dimensions of each metric (the first is the default)
+METRIC_DIMENSIONS = {
+    Metric.SIGNUPS: ("role", "department"),
+    Metric.MENTORSHIP_REQUESTS: ("status",),
+}
+
+# Buckets shown when no start is given, and the most one read may return
+DEFAULT_BUCKETS = {Granularity.DAY: 90, Granularity.WEEK: 52, Granularity.MONTH: 24}
+MAX_BUCKETS = 1000
+
+# (metric, dimension, value, day)
+EventKey = Tuple[str, str, str, date]
+
+
+def bucket_start(day: date, granularity: Granularity) -> date:
+    """First day of the bucket containing ``day``."""
+    if granularity == Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(bucket: date, granularity: Granularity) -> date:
+    """First day of the bucket after ``bucket`` (a bucket start)."""
+    if granularity == Granularity.WEEK:
+        return bucket + timedelta(days=7)
+    if granularity == Granularity.MONTH:
+        return date(bucket.year + bucket.month // 12, bucket.month % 12 + 1, 1)
+    return bucket + timedelta(days=1)
+
+
+def bucket_range(start: date, end: date, granularity: Granularity) -> List[date]:
+    """Starts of the buckets covering start..end (inclusive)."""
+    buckets = []
+    bucket = bucket_start(start, granularity)
+    while bucket <= end:
+        buckets.append(bucket)
+        bucket = next_bucket(bucket, granularity)
+    return buckets
+
+
+def _month_index(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def count_buckets(start: date, end: date, granularity: Granularity) -> int:
+    """Number of buckets covering start..end (inclusive), 0 if start > end."""
+    if start > end:
+        return 0
+    if granularity == Granularity.WEEK:
+        return (bucket_start(end, granularity) - bucket_start(start, granularity)).days // 7 + 1
+    if granularity == Granularity.MONTH:
+        return _month_index(end) - _month_index(start) + 1
+    return (end - start).days + 1
+
+
+def default_start(end: date, granularity: Granularity) -> date:
+    """Start of the DEFAULT_BUCKETS[granularity] buckets ending with ``end``'s."""
+    back = DEFAULT_BUCKETS[granularity] - 1
+    if granularity == Granularity.WEEK:
+        return bucket_start(end, granularity) - timedelta(weeks=back)
+    if granularity == Granularity.MONTH:
+        year, month = divmod(_month_index(end) - back, 12)
+        return date(year, month + 1, 1)
+    return end - timedelta(days=back)
+
+
+def _day(moment: Union[datetime, date, None]) -> date:
+    moment = moment or datetime.utcnow()
+    return moment.date() if isinstance(moment, datetime) else moment
+
+
+def record_events(conn: Connection, events: Dict[EventKey, int]) -> None:
+    """
+    Add event counts to every granularity's bucket, creating missing rows.
+
+    Rows are upserted in key order so concurrent transactions lock them in
+    the same order. Intended for ``AsyncSession.run_sync``.
+
+    Args:
+        conn: Synchronous connection inside the current transaction
+        events: (metric, dimension, value, day) -> number of events
+    """
+    counts = Counter()
+    for (metric, dimension, value, day), count in events.items():
+        for granularity in Granularity:
+            counts[(metric, dimension, granularity.value, bucket_start(day, granularity), value)] += count
+
+    rows = [
+        {
+            "metric": metric,
+            "dimension": dimension,
+            "granularity": granularity,
+            "bucket": bucket,
+            "value": value,
+            "count": count,
+        }
+        for (metric, dimension, granularity, bucket, value), count in sorted(counts.items())
+        if count
+    ]
+    if not rows:
+        return
+
+    stmt = upsert_insert(conn.dialect.name, AnalyticsRollup)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                AnalyticsRollup.metric,
+                AnalyticsRollup.dimension,
+                AnalyticsRollup.granularity,
+                AnalyticsRollup.bucket,
+                AnalyticsRollup.value,
+            ],
+            set_={"count": AnalyticsRollup.count + stmt.excluded.count}
+        ),
+        rows
+    )
+
+
+def signup_events(users, profiles=()) -> Counter:
+    """
+    Signup events of newly inserted users and profiles.
+
+    Args:
+        users: Mappings or objects with role and created_at
+        profiles: Mappings or objects with department and created_at
+
+    Returns:
+        Events for record_events
+    """
+    def value(row: Any, name: str):
+        return row.get(name) if isinstance(row, dict) else getattr(row, name)
+
+    events = Counter()
+    for user in users:
+        role = UserRole(value(user, "role")).value
+        events[(Metric.SIGNUPS.value, "role", role, _day(value(user, "created_at")))] += 1
+    for profile in profiles:
+        department = value(profile, "department")
+        if department:
+            events[(
+                Metric.SIGNUPS.value, "department", department[:255], _day(value(profile, "created_at"))
+            )] += 1
+    return events
+
+
+def status_event(status: MentorshipStatus, moment: Union[datetime, date, None] = None) -> EventKey:
+    """Event of a mentorship request entering ``status``."""
+    return (Metric.MENTORSHIP_REQUESTS.value, "status", MentorshipStatus(status).value, _day(moment))
+
+
+async def read_series(
+    db: AsyncSession,
+    metric: Metric,
+    dimension: str,
+    granularity: Granularity,
+    start: date,
+    end: date
+) -> Dict[str, Any]:
+    """
+    Read one metric's series from the rollups (one primary-key range scan).
+
+    Args:
+        db: Database session
+        metric: Counted event
+        dimension: One of METRIC_DIMENSIONS[metric]
+        granularity: Bucket width
+        start: First day shown (widened to its bucket's start)
+        end: Last day shown
+
+    Returns:
+        buckets (bucket start dates) and series (value -> counts aligned
+        with buckets, zero-filled), plus the query parameters
+    """
+    buckets = bucket_range(start, end, granularity)
+    result = await db.execute(
+        select(AnalyticsRollup.bucket, AnalyticsRollup.value, AnalyticsRollup.count)
+        .where(
+            AnalyticsRollup.metric == metric.value,
+            AnalyticsRollup.dimension == dimension,
+            AnalyticsRollup.granularity == granularity.value,
+            AnalyticsRollup.bucket >= buckets[0],
+            AnalyticsRollup.bucket <= buckets[-1]
+        )
+    )
+
+    positions = {bucket: i for i, bucket in enumerate(buckets)}
+    series: Dict[str, List[int]] = {}
+    for bucket, value, count in result.all():
+        if count:
+            series.setdefault(value, [0] * len(buckets))[positions[bucket]] = count
+
+    return {
+        "metric": metric.value,
+        "dimension": dimension,
+        "granularity": granularity.value,
+        "start": buckets[0],
+        "end": end,
+        "buckets": buckets,
+        "series": dict(sorted(series.items())),
+    }
+
+
+def backfill_rollups(conn: Connection) -> None:
+    """
+    Build rollups from the source tables if there are none yet.
+
+    Signups come from users and profiles as they are now. Requests count as
+    entering pending when created and, unless still pending, their current
+    status when last updated; intermediate statuses aren't recoverable.
+    Intended for ``AsyncConnection.run_sync``.
+
+    Args:
+        conn: Synchronous SQLAlchemy connection
+    """
+    if conn.execute(select(AnalyticsRollup.metric).limit(1)).first() is not None:
+        return
+
+    events = Counter()
+
+    def day(value: Any) -> date:
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+    signup_day = func.date(User.created_at)
+    for role, created, count in conn.execute(
+        select(User.role, signup_day, func.count(User.id)).group_by(User.role, signup_day)
+    ):
+        events[(Metric.SIGNUPS.value, "role", UserRole(role).value, day(created))] += count
+
+    profile_day = func.date(Profile.created_at)
+    for department, created, count in conn.execute(
+        select(Profile.department, profile_day, func.count(Profile.id))
+        .where(Profile.department.isnot(None), Profile.department != "")
+        .group_by(Profile.department, profile_day)
+    ):
+        events[(Metric.SIGNUPS.value, "department", department[:255], day(created))] += count
+
+    created_day = func.date(MentorshipRequest.created_at)
+    for created, count in conn.execute(
+        select(created_day, func.count(MentorshipRequest.id)).group_by(created_day)
+    ):
+        events[status_event(MentorshipStatus.PENDING, day(created))] += count
+
+    updated_day = func.date(MentorshipRequest.updated_at)
+    for request_status, updated, count in conn.execute(
+        select(MentorshipRequest.status, updated_day, func.count(MentorshipRequest.id))
+        .where(MentorshipRequest.status != MentorshipStatus.PENDING)
+        .group_by(MentorshipRequest.status, updated_day)
+    ):
+        events[status_event(request_status, day(updated))] += count
+
+    if events:
+        record_events(conn, events)
+        logger.info(f"✅ Backfilled analytics rollups from {sum(events.values())} events")
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_events(session: Session, flush_context) -> None:
+    """Record signups and request status changes in this flush."""
+    new = [obj for obj in session.new if isinstance(obj, (User, Profile, MentorshipRequest))]
+    events = signup_events(
+        [obj for obj in new if isinstance(obj, User)],
+        [obj for obj in new if isinstance(obj, Profile)]
+    )
+    for obj in new:
+        if isinstance(obj, MentorshipRequest):
+            events[status_event(obj.status, obj.created_at)] += 1
+
+    for obj in session.dirty:
+        if isinstance(obj, MentorshipRequest):
+            history = inspect(obj).attrs["status"].history
+            if history.added and history.deleted and history.added[0] != history.deleted[0]:
+                events[status_event(history.added[0])] += 1
+
+    if events:
+        record_events(session.connection(), events)
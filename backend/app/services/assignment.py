@@ -0,0 +1,431 @@
+"""
+Load-balanced mentor assignment.
+
+Every active mentor has a capacity (Profile.mentor_capacity) and a load: the
+number of their open (pending or accepted) mentorship requests. Loads are
+loaded once and then maintained in memory from the requests themselves:
+ORM flushes and explicitly staged Core statements report (request, mentor,
+status) after commit, and a request counts toward its mentor's load while
+its status is open. Only the status after the change is needed, so
+set-based UPDATEs don't have to return previous values.
+
+Mentors are kept in one min-heap per department and per expertise tag,
+ordered by utilization (load / capacity). Heaps are never searched or
+re-sorted: a load change pushes a fresh entry and outdated entries are
+dropped when they reach the top, so picking the least-loaded eligible
+mentor costs O(log n) per group.
+
+Loads are per process. Changes committed by other workers are picked up by
+the periodic resync (MENTOR_LOAD_RESYNC_SECONDS), so in-memory loads only
+choose mentors; capacity itself is enforced in the database (lock_mentor,
+open_request_count).
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import uuid
+
+from sqlalchemy import ScalarSelect, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.mentorship import MentorshipRequest, MentorshipStatus
+from app.models.tag import ProfileTag, Tag, TagKind
+from app.models.user import Profile, User, UserRole
+from app.services.tags import normalize_tag, normalize_tags
+
+logger = logging.getLogger(__name__)
+
+# Statuses that take one unit of the mentor's capacity
+OPEN_STATUSES = (MentorshipStatus.PENDING, MentorshipStatus.ACCEPTED)
+
+# (request_id, alumni_id, status after the change)
+RequestChange = Tuple[uuid.UUID, uuid.UUID, MentorshipStatus]
+
+# Heap entry: (utilization, load, sequence, mentor_id, version)
+_HeapEntry = Tuple[float, int, int, uuid.UUID, int]
+
+
+def _department_group(department: str) -> str:
+    return f"dept:{normalize_tag(department)}"
+
+
+def _tag_group(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+class _Mentor:
+    """Capacity, load and groups of one mentor."""
+
+    __slots__ = ("capacity", "load", "groups", "version")
+
+    def __init__(self, capacity: int, groups: List[str]):
+        self.capacity = capacity
+        self.load = 0
+        self.groups = groups
+        self.version = 0
+
+    @property
+    def utilization(self) -> float:
+        return self.load / self.capacity if self.capacity > 0 else float("inf")
+
+
+class MentorLoadBalancer:
+    """
+    In-memory mentor loads with a priority queue per department and tag.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+        self._dirty: Set[uuid.UUID] = set()
+
+        self._mentors: Dict[uuid.UUID, _Mentor] = {}
+        self._heaps: Dict[str, List[_HeapEntry]] = defaultdict(list)
+        self._sequence = itertools.count()
+
+        # Open requests by id, so repeated or unordered changes stay idempotent
+        self._open_requests: Dict[uuid.UUID, uuid.UUID] = {}
+        self._loads: Dict[uuid.UUID, int] = defaultdict(int)
+
+    @property
+    def mentor_count(self) -> int:
+        """Number of active mentors known to the balancer."""
+        return len(self._mentors)
+
+    def load(self, mentor_id: uuid.UUID) -> int:
+        """Open requests currently assigned to a mentor."""
+        return self._loads.get(mentor_id, 0)
+
+    def has_capacity(self, mentor_id: uuid.UUID) -> bool:
+        """
+        Whether a mentor can take another request.
+
+        Unknown mentors (not active mentors, or not loaded yet) have none.
+        Advisory only: writes check capacity in the database.
+        """
+        mentor = self._mentors.get(mentor_id)
+        return mentor is not None and mentor.load < mentor.capacity
+
+    def mark_dirty(self, user_ids: Iterable[uuid.UUID]) -> None:
+        """Schedule mentors' capacity and groups for reload on the next sync."""
+        self._dirty.update(user_ids)
+
+    def apply_request_changes(self, changes: Iterable[RequestChange]) -> None:
+        """
+        Update loads for committed request changes.
+
+        Args:
+            changes: (request_id, alumni_id, status after the change)
+        """
+        for request_id, alumni_id, request_status in changes:
+            if request_status in OPEN_STATUSES:
+                if request_id in self._open_requests:
+                    continue
+                self._open_requests[request_id] = alumni_id
+                self._adjust(alumni_id, 1)
+            else:
+                alumni_id = self._open_requests.pop(request_id, None)
+                if alumni_id is not None:
+                    self._adjust(alumni_id, -1)
+
+    def pick(
+        self,
+        department: Optional[str],
+        expertise: Iterable[str],
+        exclude: Iterable[uuid.UUID] = ()
+    ) -> Optional[uuid.UUID]:
+        """
+        Least-loaded mentor with free capacity in a department or tag.
+
+        Args:
+            department: Department to match
+            expertise: Expertise tags to match (any)
+            exclude: Mentor ids to leave out
+
+        Returns:
+            The mentor with the lowest utilization, or None if every eligible
+            mentor is at capacity
+        """
+        groups = [_tag_group(tag) for tag in normalize_tags(expertise)]
+        if department:
+            groups.append(_department_group(department))
+
+        exclude = set(exclude)
+        best: Optional[_HeapEntry] = None
+        for group in groups:
+            entry = self._peek(group, exclude)
+            if entry is not None and (best is None or entry < best):
+                best = entry
+
+        # Full mentors have utilization >= 1 and sort after every free one
+        if best is None or best[0] >= 1:
+            return None
+        return best[3]
+
+    async def sync(self, db: AsyncSession) -> None:
+        """
+        Load on first use or after the resync interval, and reload dirty
+        mentors.
+
+        Args:
+            db: Database session
+        """
+        if self._fresh() and not self._dirty:
+            return
+
+        async with self._lock:
+            if not self._fresh():
+                self._dirty.clear()
+                await self._load(db)
+                logger.info(
+                    f"✅ Mentor load balancer loaded {self.mentor_count} mentors, "
+                    f"{len(self._open_requests)} open requests"
+                )
+            elif self._dirty:
+                dirty = list(self._dirty)
+                self._dirty.difference_update(dirty)
+                await self._load_mentors(db, dirty)
+
+    def _fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < settings.MENTOR_LOAD_RESYNC_SECONDS
+        )
+
+    async def _load(self, db: AsyncSession) -> None:
+        """Load all mentors and open requests from the database."""
+        open_requests = (await db.execute(
+            select(MentorshipRequest.id, MentorshipRequest.alumni_id)
+            .where(MentorshipRequest.status.in_(OPEN_STATUSES))
+        )).all()
+
+        self._mentors.clear()
+        self._heaps.clear()
+        self._open_requests = dict(open_requests)
+        self._loads = defaultdict(int)
+        for alumni_id in self._open_requests.values():
+            self._loads[alumni_id] += 1
+
+        await self._load_mentors(db, None)
+        self._loaded_at = time.monotonic()
+
+    async def _load_mentors(self, db: AsyncSession, user_ids: Optional[List[uuid.UUID]]) -> None:
+        """Load capacity and groups of active mentors (all, or the given users)."""
+        mentors_query = (
+            select(User.id, Profile.department, Profile.mentor_capacity, Profile.id)
+            .join(Profile, Profile.user_id == User.id)
+            .where(
+                User.role == UserRole.ALUMNI,
+                User.is_active == True,
+                Profile.is_mentor == True
+            )
+        )
+        if user_ids is not None:
+            mentors_query = mentors_query.where(User.id.in_(user_ids))
+
+        mentors = (await db.execute(mentors_query)).all()
+
+        tags_query = (
+            select(ProfileTag.profile_id, Tag.name)
+            .join(Tag, Tag.id == ProfileTag.tag_id)
+            .where(ProfileTag.kind == TagKind.EXPERTISE)
+        )
+        if user_ids is not None:
+            tags_query = tags_query.where(
+                ProfileTag.profile_id.in_([profile_id for *_, profile_id in mentors])
+            )
+
+        tags_by_profile = defaultdict(list)
+        for profile_id, name in (await db.execute(tags_query)).all():
+            tags_by_profile[profile_id].append(name)
+
+        for user_id, department, capacity, profile_id in mentors:
+            groups = [_tag_group(tag) for tag in normalize_tags(tags_by_profile[profile_id])]
+            if department:
+                groups.append(_department_group(department))
+            self._upsert_mentor(user_id, capacity, groups)
+
+        if user_ids is not None:
+            still_mentors = {user_id for user_id, *_ in mentors}
+            for user_id in user_ids:
+                if user_id not in still_mentors:
+                    self._mentors.pop(user_id, None)
+
+    def _upsert_mentor(self, user_id: uuid.UUID, capacity: int, groups: List[str]) -> None:
+        mentor = self._mentors.get(user_id)
+        if mentor is None:
+            mentor = self._mentors[user_id] = _Mentor(capacity, groups)
+        else:
+            mentor.capacity = capacity
+            mentor.groups = groups
+        mentor.load = self._loads.get(user_id, 0)
+        self._push(user_id, mentor)
+
+    def _adjust(self, mentor_id: uuid.UUID, delta: int) -> None:
+        self._loads[mentor_id] += delta
+        if self._loads[mentor_id] <= 0:
+            del self._loads[mentor_id]
+
+        mentor = self._mentors.get(mentor_id)
+        if mentor is not None:
+            mentor.load = self._loads.get(mentor_id, 0)
+            self._push(mentor_id, mentor)
+
+    def _push(self, mentor_id: uuid.UUID, mentor: _Mentor) -> None:
+        """Queue the mentor's current state; earlier entries become outdated."""
+        mentor.version += 1
+        entry = (mentor.utilization, mentor.load, next(self._sequence), mentor_id, mentor.version)
+        for group in mentor.groups:
+            heap = self._heaps[group]
+            heapq.heappush(heap, entry)
+
+            # Drop outdated entries once they dominate the heap
+            if len(heap) > 64 and len(heap) > 4 * len(self._mentors):
+                self._heaps[group] = [e for e in heap if self._current(e)]
+                heapq.heapify(self._heaps[group])
+
+    def _current(self, entry: _HeapEntry) -> bool:
+        mentor = self._mentors.get(entry[3])
+        return mentor is not None and mentor.version == entry[4]
+
+    def _peek(self, group: str, exclude: Set[uuid.UUID]) -> Optional[_HeapEntry]:
+        """Top current entry of a group's heap that is not excluded."""
+        heap = self._heaps.get(group)
+        if not heap:
+            return None
+
+        skipped = []
+        found = None
+        while heap:
+            entry = heap[0]
+            if not self._current(entry):
+                heapq.heappop(heap)
+            elif entry[3] in exclude:
+                skipped.append(heapq.heappop(heap))
+            else:
+                found = entry
+                break
+
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+
+# Global load balancer instance
+mentor_load_balancer = MentorLoadBalancer()
+
+
+def open_request_count(alumni_id) -> ScalarSelect:
+    """
+    Scalar subquery counting a mentor's open requests.
+
+    Args:
+        alumni_id: Mentor id value or correlated column (e.g. User.id)
+    """
+    return (
+        select(func.count(MentorshipRequest.id))
+        .where(
+            MentorshipRequest.alumni_id == alumni_id,
+            MentorshipRequest.status.in_(OPEN_STATUSES)
+        )
+        .scalar_subquery()
+    )
+
+
+async def lock_mentor(db: AsyncSession, alumni_id: uuid.UUID) -> Optional[int]:
+    """
+    Lock a mentor's profile row until commit and return their capacity.
+
+    Serializes writes that take capacity from the same mentor: statements
+    run after the lock count every open request committed before it. Lock
+    the mentor before the requests themselves.
+
+    Args:
+        db: Database session
+        alumni_id: Mentor's user id
+
+    Returns:
+        mentor_capacity, or None if the user has no profile
+    """
+    result = await db.execute(
+        select(Profile.mentor_capacity)
+        .where(Profile.user_id == alumni_id)
+        .with_for_update()
+    )
+    return result.scalar_one_or_none()
+
+
+async def free_capacity(db: AsyncSession, alumni_id: uuid.UUID) -> int:
+    """
+    Lock a mentor (lock_mentor) and count their free capacity.
+
+    Args:
+        db: Database session
+        alumni_id: Mentor's user id
+
+    Returns:
+        Capacity minus open requests (0 or less when full)
+    """
+    capacity = await lock_mentor(db, alumni_id)
+    if capacity is None:
+        return 0
+    open_requests = (await db.execute(select(open_request_count(alumni_id)))).scalar_one()
+    return capacity - open_requests
+
+
+def stage_request_changes(session: Session, changes: Iterable[RequestChange]) -> None:
+    """
+    Report request changes made with Core statements (not seen by the ORM).
+
+    Applied to the load balancer after the session commits.
+
+    Args:
+        session: Synchronous session (AsyncSession.sync_session)
+        changes: (request_id, alumni_id, status after the change)
+    """
+    session.info.setdefault("mentor_load", []).extend(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_load_changes(session: Session, flush_context) -> None:
+    """Remember request status changes and changed mentors in this flush."""
+    changes = session.info.setdefault("mentor_load", [])
+    dirty = session.info.setdefault("mentor_load_dirty", set())
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, MentorshipRequest):
+            changes.append((obj.id, obj.alumni_id, obj.status))
+        elif isinstance(obj, Profile):
+            dirty.add(obj.user_id)
+        elif isinstance(obj, User) and obj.role == UserRole.ALUMNI:
+            dirty.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, MentorshipRequest):
+            # Deleted requests release capacity like closed ones
+            changes.append((obj.id, obj.alumni_id, MentorshipStatus.REJECTED))
+        elif isinstance(obj, Profile):
+            dirty.add(obj.user_id)
+        elif isinstance(obj, User) and obj.role == UserRole.ALUMNI:
+            dirty.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_load_changes(session: Session) -> None:
+    """Apply request changes and mentor reloads of a committed transaction."""
+    changes = session.info.pop("mentor_load", None)
+    if changes:
+        mentor_load_balancer.apply_request_changes(changes)
+    dirty = session.info.pop("mentor_load_dirty", None)
+    if dirty:
+        mentor_load_balancer.mark_dirty(dirty)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_load_changes(session: Session, previous_transaction) -> None:
+    session.info.pop("mentor_load", None)
+    session.info.pop("mentor_load_dirty", None)
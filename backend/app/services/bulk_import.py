@@ -0,0 +1,451 @@
+"""
+Bulk user import pipeline.
+
+Streams users from a CSV or JSONL file, validates each row, hashes
+passwords in a process pool and inserts User + Profile rows in batched
+executemany statements, one transaction per batch. Rows that fail are
+reported with their line number instead of aborting the import.
+
+Reading and validating rows runs in a thread, one batch at a time, so a
+large file doesn't block the event loop. Hashing uses one long-lived pool
+(import_hash_pool) started by the application lifespan; its workers are
+spawned rather than forked from the threaded server process.
+
+Rows may carry either a plaintext ``password`` (bcrypt-hashed in the pool,
+CPU-bound at a few hashes per second per core) or a pre-computed bcrypt
+``hashed_password`` (e.g. exported from another system), which skips
+hashing entirely.
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, EmailStr, Field, ValidationError, field_validator, model_validator
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.hashing import hash_passwords
+from app.models.tag import ProfileTag
+from app.models.user import Profile, User, UserRole
+from app.services.analytics import record_events, signup_events
+from app.services.assignment import mentor_load_balancer
+from app.services.matching import mentor_matcher
+from app.services.stats import bump_counters, user_counter_deltas
+from app.services.tags import TAG_ATTRIBUTES, intern_tags, normalize_tags
+
+logger = logging.getLogger(__name__)
+
+# Errors kept in the report; the counts stay exact beyond this
+MAX_REPORTED_ERRORS = 1000
+
+# Passwords hashed per worker task
+HASH_CHUNK_SIZE = 16
+
+
+class BulkUserRow(BaseModel):
+    """One user in an import file."""
+    email: EmailStr
+    full_name: str = Field(..., min_length=1, max_length=255)
+    role: UserRole = UserRole.ALUMNI
+    password: Optional[str] = Field(None, min_length=8, max_length=100)
+    hashed_password: Optional[str] = Field(None, max_length=255)
+    phone: Optional[str] = Field(None, max_length=20)
+    graduation_year: Optional[int] = Field(None, ge=1900, le=2100)
+    department: Optional[str] = Field(None, max_length=100)
+    current_company: Optional[str] = Field(None, max_length=255)
+    current_position: Optional[str] = Field(None, max_length=255)
+    bio: Optional[str] = Field(None, max_length=1000)
+    is_mentor: bool = False
+    mentorship_expertise: List[str] = Field(default_factory=list)
+    interests: List[str] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_empty(cls, data: Any) -> Any:
+        """CSV cells are strings; treat empty cells as missing."""
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value not in ("", None)}
+        return data
+
+    @field_validator("mentorship_expertise", "interests", mode="before")
+    @classmethod
+    def split_list(cls, value: Any) -> Any:
+        """Accept JSON lists or semicolon-separated CSV cells."""
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(";") if item.strip()]
+        return value
+
+    @field_validator("role")
+    @classmethod
+    def no_admins(cls, value: UserRole) -> UserRole:
+        if value == UserRole.ADMIN:
+            raise ValueError("admin accounts cannot be bulk imported")
+        return value
+
+    @model_validator(mode="after")
+    def password_required(self) -> "BulkUserRow":
+        if not self.password and not self.hashed_password:
+            raise ValueError("either password or hashed_password is required")
+        if self.hashed_password and not self.hashed_password.startswith("$2"):
+            raise ValueError("hashed_password must be a bcrypt hash")
+        return self
+
+
+class BulkImportError(BaseModel):
+    """A row that was not imported."""
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    """Outcome of a bulk import."""
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[BulkImportError] = Field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+    def add_error(self, row: int, email: Optional[str], error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(BulkImportError(row=row, email=email, error=error))
+
+
+class ImportHashPool:
+    """
+    Process pool shared by every bulk import for password hashing.
+
+    Started once (application lifespan or import script) rather than per
+    import, so concurrent imports share one set of workers. Workers use the
+    ``spawn`` start method: forking a process that already runs threads
+    (password hashing pool, aiosqlite, backplane) is not safe.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self, workers: Optional[int] = None) -> None:
+        """
+        Create the pool (workers are spawned on first use).
+
+        Args:
+            workers: Hashing processes (default: CPU count)
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            raise RuntimeError("Import hash pool is not started")
+        return self._executor
+
+    async def stop(self) -> None:
+        """Cancel queued work and wait for the workers to exit."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+# Global import hashing pool
+import_hash_pool = ImportHashPool()
+
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    """
+    Resolve the file format from an explicit value or the file extension.
+
+    Raises:
+        ValueError: If the format is not csv or jsonl
+    """
+    if not fmt and filename:
+        fmt = os.path.splitext(filename)[1].lstrip(".")
+    fmt = (fmt or "").lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError("Unsupported import format; use csv or jsonl")
+    return fmt
+
+
+def iter_rows(file: BinaryIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Stream raw rows from a binary file.
+
+    Args:
+        file: Binary file object
+        fmt: "csv" (header row required) or "jsonl"
+
+    Yields:
+        (line number, row dict or error message string)
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"invalid JSON: {e.msg}"
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+
+async def import_users(
+    db: AsyncSession,
+    file: BinaryIO,
+    fmt: str,
+    batch_size: int = 1000
+) -> BulkImportReport:
+    """
+    Import users from a CSV/JSONL file.
+
+    Args:
+        db: Database session; each batch is committed separately
+        file: Binary file object to stream rows from
+        fmt: "csv" or "jsonl"
+        batch_size: Rows per INSERT batch and transaction
+
+    Returns:
+        BulkImportReport with counts, per-row errors and throughput
+
+    Raises:
+        RuntimeError: If import_hash_pool has not been started
+    """
+    pool = import_hash_pool.executor
+    report = BulkImportReport()
+    started = time.perf_counter()
+    seen_emails = set()
+    rows = iter_rows(file, fmt)
+
+    try:
+        while True:
+            batch = await asyncio.to_thread(_read_batch, rows, batch_size, seen_emails, report)
+            if not batch:
+                break
+            await _import_batch(db, pool, batch, report)
+    finally:
+        rows.close()
+
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+    if report.elapsed_seconds:
+        report.rows_per_second = round(report.imported / report.elapsed_seconds, 1)
+
+    logger.info(
+        f"✅ Bulk import: {report.imported} imported, {report.failed} failed "
+        f"in {report.elapsed_seconds}s ({report.rows_per_second} rows/s)"
+    )
+    return report
+
+
+def _read_batch(
+    rows: Iterator[Tuple[int, Any]],
+    batch_size: int,
+    seen_emails: set,
+    report: BulkImportReport
+) -> List[Tuple[int, BulkUserRow]]:
+    """
+    Read and validate rows until a batch is full or the file ends.
+
+    Blocking (file reads, validation): runs in a thread while the import
+    awaits it. Invalid and duplicate rows go to the report.
+
+    Returns:
+        Up to batch_size valid rows; empty once the file is exhausted
+    """
+    batch: List[Tuple[int, BulkUserRow]] = []
+    for line_number, raw in rows:
+        report.total_rows += 1
+
+        if isinstance(raw, str):
+            report.add_error(line_number, None, raw)
+            continue
+
+        try:
+            row = BulkUserRow.model_validate(raw)
+        except ValidationError as e:
+            email = raw.get("email") if isinstance(raw, dict) else None
+            report.add_error(line_number, email, _format_validation_error(e))
+            continue
+
+        if row.email in seen_emails:
+            report.add_error(line_number, row.email, "duplicate email in file")
+            continue
+        seen_emails.add(row.email)
+
+        batch.append((line_number, row))
+        if len(batch) >= batch_size:
+            break
+
+    return batch
+
+
+async def _import_batch(
+    db: AsyncSession,
+    pool: ProcessPoolExecutor,
+    batch: List[Tuple[int, BulkUserRow]],
+    report: BulkImportReport
+) -> None:
+    """Insert one batch in a single transaction, falling back to per-row inserts."""
+    # Skip emails that are already registered
+    result = await db.execute(
+        select(User.email).where(User.email.in_([row.email for _, row in batch]))
+    )
+    existing = set(result.scalars().all())
+
+    pending = []
+    for line_number, row in batch:
+        if row.email in existing:
+            report.add_error(line_number, row.email, "email already registered")
+        else:
+            pending.append((line_number, row))
+
+    if not pending:
+        return
+
+    # Hash plaintext passwords in the process pool
+    to_hash = [row for _, row in pending if not row.hashed_password]
+    if to_hash:
+        loop = asyncio.get_running_loop()
+        chunks = [
+            [row.password for row in to_hash[i:i + HASH_CHUNK_SIZE]]
+            for i in range(0, len(to_hash), HASH_CHUNK_SIZE)
+        ]
+        hashed_chunks = await asyncio.gather(
+            *(loop.run_in_executor(pool, hash_passwords, chunk) for chunk in chunks)
+        )
+        hashes = iter(hashed for chunk in hashed_chunks for hashed in chunk)
+        for row in to_hash:
+            row.hashed_password = next(hashes)
+
+    records = [(line_number, row, *_build_records(row)) for line_number, row in pending]
+
+    try:
+        await _insert_records(db, records)
+        await db.commit()
+        report.imported += len(records)
+    except IntegrityError:
+        await db.rollback()
+
+        # Isolate the conflicting rows (e.g. emails registered concurrently)
+        for line_number, row, user_record, profile_record in records:
+            try:
+                async with db.begin_nested():
+                    await _insert_records(db, [(line_number, row, user_record, profile_record)])
+                report.imported += 1
+            except IntegrityError as e:
+                report.add_error(line_number, row.email, f"conflict: {e.orig}")
+        await db.commit()
+
+    mentor_ids = [user_record["id"] for _, row, user_record, _ in records if row.is_mentor]
+    mentor_matcher.mark_dirty(mentor_ids)
+    mentor_load_balancer.mark_dirty(mentor_ids)
+
+
+def _build_records(row: BulkUserRow) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build User and Profile insert parameters for a row."""
+    now = datetime.utcnow()
+    user_id = uuid.uuid4()
+
+    user_record = {
+        "id": user_id,
+        "email": row.email,
+        "hashed_password": row.hashed_password,
+        "full_name": row.full_name,
+        "role": row.role,
+        "phone": row.phone,
+        "department": row.department,
+        "is_active": True,
+        "is_verified": False,
+        "verification_status": "pending",
+        "created_at": now,
+        "updated_at": now,
+    }
+    profile_record = {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "bio": row.bio,
+        "graduation_year": row.graduation_year,
+        "department": row.department,
+        "current_company": row.current_company,
+        "current_position": row.current_position,
+        "is_mentor": row.is_mentor,
+        "mentorship_expertise": row.mentorship_expertise,
+        "interests": row.interests,
+        "created_at": now,
+        "updated_at": now,
+    }
+    return user_record, profile_record
+
+
+async def _insert_records(db: AsyncSession, records: List[tuple]) -> None:
+    """executemany INSERTs for users, profiles, their tags, counters and rollups."""
+    users = [user for _, _, user, _ in records]
+    profiles = [profile for _, _, _, profile in records]
+    await db.execute(insert(User), users)
+    await db.execute(insert(Profile), profiles)
+
+    deltas = user_counter_deltas(users, profiles)
+    events = signup_events(users, profiles)
+
+    def count_signups(session) -> None:
+        bump_counters(session.connection(), deltas)
+        record_events(session.connection(), events)
+
+    await db.run_sync(count_signups)
+
+    # New profiles have no tag rows yet: intern the batch's tags once and
+    # insert the associations in a single executemany
+    tag_rows = []
+    for _, _, _, profile in records:
+        for kind, attribute in TAG_ATTRIBUTES.items():
+            tag_rows.extend((profile["id"], kind, tag) for tag in normalize_tags(profile[attribute]))
+
+    if tag_rows:
+        def index_tags(session) -> None:
+            conn = session.connection()
+            pending = session.info.setdefault("interned_tags", {})
+            ids = intern_tags(conn, list({tag for _, _, tag in tag_rows}), pending)
+            conn.execute(
+                ProfileTag.__table__.insert(),
+                [
+                    {"profile_id": profile_id, "kind": kind, "tag_id": ids[tag]}
+                    for profile_id, kind, tag in tag_rows
+                ]
+            )
+
+        await db.run_sync(index_tags)
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Compact single-line description of a row's validation errors."""
+    parts = []
+    for item in error.errors():
+        field = ".".join(str(part) for part in item["loc"]) or "row"
+        parts.append(f"{field}: {item['msg']}")
+    return "; ".join(parts)
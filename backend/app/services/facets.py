@@ -0,0 +1,103 @@
+"""
+Facet counts for the alumni directory.
+
+All facets are computed in a single statement over the filtered result set:
+one GROUP BY over (department, is_mentor, graduation-year bucket) that is
+rolled up per facet in Python, plus the top expertise tags, combined with
+UNION ALL.
+"""
+from collections import Counter
+from typing import Dict
+
+from sqlalchemy import Boolean, Integer, Select, String, cast, func, literal, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tag import ProfileTag, Tag, TagKind
+from app.models.user import Profile
+
+# Width of graduation year buckets, e.g. 2015-2019
+YEAR_BUCKET_SIZE = 5
+
+# Number of expertise tags returned in the facet
+TOP_EXPERTISE_TAGS = 10
+
+
+async def compute_alumni_facets(db: AsyncSession, query: Select) -> Dict[str, Dict[str, int]]:
+    """
+    Count filtered alumni per department, mentor status, graduation year
+    bucket and top expertise tags.
+
+    Args:
+        db: Database session
+        query: Filtered alumni query (joined with Profile), without ordering
+            or pagination
+
+    Returns:
+        Mapping of facet name to {value: count}
+    """
+    filtered = query.with_only_columns(
+        Profile.id.label("profile_id"),
+        Profile.department.label("department"),
+        Profile.is_mentor.label("is_mentor"),
+        Profile.graduation_year.label("graduation_year"),
+    ).cte("filtered")
+
+    year_bucket = filtered.c.graduation_year // YEAR_BUCKET_SIZE * YEAR_BUCKET_SIZE
+
+    combinations = (
+        select(
+            literal("combo").label("facet"),
+            filtered.c.department,
+            filtered.c.is_mentor,
+            year_bucket.label("year_bucket"),
+            cast(null(), String).label("tag"),
+            func.count().label("n"),
+        )
+        .group_by(filtered.c.department, filtered.c.is_mentor, year_bucket)
+    )
+
+    top_tags = (
+        select(Tag.name.label("tag"), func.count().label("n"))
+        .select_from(filtered)
+        .join(ProfileTag, ProfileTag.profile_id == filtered.c.profile_id)
+        .join(Tag, Tag.id == ProfileTag.tag_id)
+        .where(ProfileTag.kind == TagKind.EXPERTISE)
+        .group_by(Tag.name)
+        .order_by(func.count().desc(), Tag.name)
+        .limit(TOP_EXPERTISE_TAGS)
+        .subquery("top_tags")
+    )
+
+    tags = select(
+        literal("tag").label("facet"),
+        cast(null(), String),
+        cast(null(), Boolean),
+        cast(null(), Integer),
+        top_tags.c.tag,
+        top_tags.c.n,
+    )
+
+    result = await db.execute(combinations.union_all(tags))
+
+    departments: Counter = Counter()
+    mentors: Counter = Counter()
+    years: Counter = Counter()
+    expertise: Dict[str, int] = {}
+
+    for facet, department, is_mentor, bucket, tag, n in result.all():
+        if facet == "tag":
+            expertise[tag] = n
+            continue
+        if department is not None:
+            departments[department] += n
+        if is_mentor is not None:
+            mentors["true" if is_mentor else "false"] += n
+        if bucket is not None:
+            years[f"{bucket}-{bucket + YEAR_BUCKET_SIZE - 1}"] += n
+
+    return {
+        "department": dict(departments.most_common()),
+        "is_mentor": dict(mentors),
+        "graduation_year": dict(sorted(years.items())),
+        "expertise": expertise,
+    }
@@ -0,0 +1,147 @@
+"""
+Mentorship inbox queries.
+
+Alumni list their incoming requests (by ``alumni_id``) and students their
+sent ones (by ``student_id``), newest first. Each listing is served by a
+composite index on (owner, created_at, id), or (owner, status, created_at,
+id) when filtered by status, so a page is an index range scan without a
+sort, and keyset cursors continue after the last (created_at, id).
+
+Listings select only the columns the response needs (inbox_details):
+plain rows, no User/Profile entities or identity map.
+
+``benchmarks/check_inbox_query_plan.py`` asserts these plans.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, literal, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, aliased
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.mentorship import MentorshipRequest, MentorshipStatus
+from app.models.user import Profile, User, UserRole
+
+# Cursor sort name for inbox pages
+INBOX_SORT = "created"
+
+InboxKey = Tuple[datetime, uuid.UUID]
+
+_Student = aliased(User, name="student")
+_StudentProfile = aliased(Profile, name="student_profile")
+_Alumni = aliased(User, name="alumni")
+_AlumniProfile = aliased(Profile, name="alumni_profile")
+
+# Fields of MentorshipRequestWithDetails, by name
+_DETAIL_COLUMNS = (
+    MentorshipRequest.id,
+    MentorshipRequest.student_id,
+    MentorshipRequest.alumni_id,
+    MentorshipRequest.message,
+    MentorshipRequest.status,
+    MentorshipRequest.created_at,
+    MentorshipRequest.updated_at,
+    _Student.full_name.label("student_name"),
+    _Alumni.full_name.label("alumni_name"),
+    _Student.email.label("student_email"),
+    _StudentProfile.department.label("student_department"),
+    _AlumniProfile.current_company.label("alumni_company"),
+    _AlumniProfile.current_position.label("alumni_position"),
+)
+
+
+def inbox_owner(role: UserRole) -> Optional[InstrumentedAttribute]:
+    """
+    Column that selects a user's inbox.
+
+    Args:
+        role: Role of the current user
+
+    Returns:
+        alumni_id for alumni, student_id for students, None otherwise
+    """
+    if role == UserRole.ALUMNI:
+        return MentorshipRequest.alumni_id
+    if role == UserRole.STUDENT:
+        return MentorshipRequest.student_id
+    return None
+
+
+def inbox_query(
+    owner: InstrumentedAttribute,
+    user_id: uuid.UUID,
+    status_filter: Optional[MentorshipStatus] = None,
+    after: Optional[InboxKey] = None
+) -> Select:
+    """
+    Build a newest-first inbox query.
+
+    Args:
+        owner: Column from inbox_owner
+        user_id: Owner of the inbox
+        status_filter: Only requests with this status
+        after: Key of the last row on the previous page
+
+    Returns:
+        Select of MentorshipRequest without limit or eager loads
+    """
+    query = select(MentorshipRequest).where(owner == user_id)
+
+    if status_filter:
+        query = query.where(MentorshipRequest.status == status_filter)
+
+    if after is not None:
+        created_at, request_id = after
+        query = query.where(
+            tuple_(MentorshipRequest.created_at, MentorshipRequest.id) < tuple_(
+                literal(created_at, MentorshipRequest.created_at.type),
+                literal(request_id, MentorshipRequest.id.type)
+            )
+        )
+
+    return query.order_by(MentorshipRequest.created_at.desc(), MentorshipRequest.id.desc())
+
+
+def inbox_details(query: Select) -> Select:
+    """
+    Project an inbox query onto the fields of MentorshipRequestWithDetails.
+
+    Args:
+        query: Query from inbox_query (filters, ordering and paging are kept)
+
+    Returns:
+        Column-only Select whose rows map by name onto the response schema
+    """
+    return (
+        query.with_only_columns(*_DETAIL_COLUMNS)
+        .select_from(MentorshipRequest)
+        .outerjoin(_Student, _Student.id == MentorshipRequest.student_id)
+        .outerjoin(_StudentProfile, _StudentProfile.user_id == _Student.id)
+        .outerjoin(_Alumni, _Alumni.id == MentorshipRequest.alumni_id)
+        .outerjoin(_AlumniProfile, _AlumniProfile.user_id == _Alumni.id)
+    )
+
+
+def encode_inbox_cursor(request: Any) -> str:
+    """Cursor continuing after the given request (entity or inbox row)."""
+    return encode_cursor(INBOX_SORT, [request.created_at.isoformat(), str(request.id)])
+
+
+def decode_inbox_cursor(cursor: str) -> InboxKey:
+    """
+    Parse a cursor from encode_inbox_cursor.
+
+    Raises:
+        HTTPException 400: If the cursor is malformed
+    """
+    values = decode_cursor(cursor, INBOX_SORT)
+    try:
+        created_at, request_id = values
+        return datetime.fromisoformat(created_at), uuid.UUID(request_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
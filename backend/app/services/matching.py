@@ -0,0 +1,379 @@
+"""
+Vectorized mentor matching.
+
+Active mentors are kept in memory as a sparse TF-IDF matrix (one row per
+mentor, one column per expertise tag or department) stored in compressed
+column form with NumPy arrays. Ranking a student is a single sparse
+matrix-vector product plus a vectorized graduation-year proximity term, so
+cost grows with the number of matching entries instead of a Python loop
+over every mentor.
+
+Profile and user writes mark mentors dirty (session flush hook); dirty rows
+are reloaded and patched into the matrix on the next ranking call instead of
+rebuilding it from scratch.
+
+The matrix is per process. Changes committed by other workers are picked up
+by the periodic full reload (MENTOR_MATCHER_RESYNC_SECONDS).
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import uuid
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tag import ProfileTag, Tag, TagKind
+from app.models.user import Profile, User, UserRole
+from app.services.tags import normalize_tag, normalize_tags
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of a shared department versus a shared tag
+DEPARTMENT_WEIGHT = 0.5
+
+# Bonus for graduation year proximity: YEAR_WEIGHT * exp(-|dy| / YEAR_SCALE)
+YEAR_WEIGHT = 0.1
+YEAR_SCALE = 5.0
+
+
+def _tag_feature(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def _department_feature(department: str) -> str:
+    return f"dept:{normalize_tag(department)}"
+
+
+class MentorMatcher:
+    """
+    In-memory sparse TF-IDF matrix of active mentors.
+
+    Rows are mentor slots, columns are features ("tag:<name>",
+    "dept:<name>"). Raw entries are kept as COO arrays so changed rows can be
+    replaced without touching the others; weighted entries are compiled into
+    column-major order for ranking.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+        self._dirty: Set[uuid.UUID] = set()
+
+        # Mentor slots
+        self._slots: Dict[uuid.UUID, int] = {}
+        self._slot_ids: List[Optional[uuid.UUID]] = []
+        self._free_slots: List[int] = []
+        self._years = np.empty(0, dtype=np.float64)
+        self._active = np.empty(0, dtype=bool)
+        self._mentor_features: Dict[uuid.UUID, List[int]] = {}
+
+        # Vocabulary and document frequencies
+        self._vocab: Dict[str, int] = {}
+        self._feature_scale = np.empty(0, dtype=np.float64)
+        self._df = np.empty(0, dtype=np.float64)
+
+        # Raw (binary) entries, COO
+        self._rows = np.empty(0, dtype=np.int64)
+        self._cols = np.empty(0, dtype=np.int64)
+
+        # Compiled column-major weighted matrix
+        self._col_ptr = np.zeros(1, dtype=np.int64)
+        self._csc_rows = np.empty(0, dtype=np.int64)
+        self._csc_data = np.empty(0, dtype=np.float64)
+        self._idf = np.empty(0, dtype=np.float64)
+        self._stale = True
+
+    @property
+    def mentor_count(self) -> int:
+        """Number of mentors currently in the matrix."""
+        return len(self._slots)
+
+    def mark_dirty(self, user_ids: Iterable[uuid.UUID]) -> None:
+        """Schedule mentors for reload on the next ranking call."""
+        self._dirty.update(user_ids)
+
+    def upsert_mentors(
+        self,
+        mentors: Iterable[Tuple[uuid.UUID, Optional[str], Optional[int], Iterable[str]]]
+    ) -> None:
+        """
+        Insert or replace mentor rows.
+
+        Args:
+            mentors: (user_id, department, graduation_year, expertise tags)
+        """
+        changed_slots = []
+        new_rows: List[int] = []
+        new_cols: List[int] = []
+
+        for user_id, department, graduation_year, tags in mentors:
+            slot = self._slots.get(user_id)
+            if slot is None:
+                slot = self._allocate_slot(user_id)
+            else:
+                self._release_features(user_id)
+                changed_slots.append(slot)
+
+            features = [self._feature(_tag_feature(tag)) for tag in normalize_tags(tags)]
+            if department:
+                features.append(self._feature(_department_feature(department), DEPARTMENT_WEIGHT))
+
+            self._mentor_features[user_id] = features
+            self._df[features] += 1
+            self._years[slot] = graduation_year if graduation_year else np.nan
+            self._active[slot] = True
+            new_rows.extend([slot] * len(features))
+            new_cols.extend(features)
+
+        self._replace_entries(changed_slots, new_rows, new_cols)
+
+    def remove_mentors(self, user_ids: Iterable[uuid.UUID]) -> None:
+        """Remove mentors from the matrix (no longer active mentors)."""
+        removed_slots = []
+        for user_id in user_ids:
+            slot = self._slots.pop(user_id, None)
+            if slot is None:
+                continue
+            self._release_features(user_id)
+            self._slot_ids[slot] = None
+            self._active[slot] = False
+            self._free_slots.append(slot)
+            removed_slots.append(slot)
+
+        self._replace_entries(removed_slots, [], [])
+
+    def rank(
+        self,
+        interests: Iterable[str],
+        department: Optional[str],
+        graduation_year: Optional[int],
+        limit: int = 10,
+        exclude: Iterable[uuid.UUID] = ()
+    ) -> List[Tuple[uuid.UUID, float]]:
+        """
+        Rank mentors for a student.
+
+        Args:
+            interests: Student interest tags
+            department: Student department
+            graduation_year: Student graduation year
+            limit: Number of mentors to return
+            exclude: Mentor ids to leave out
+
+        Returns:
+            Up to ``limit`` (mentor user_id, score) pairs, best first
+        """
+        if self._stale:
+            self._compile()
+
+        slot_count = len(self._slot_ids)
+        if not slot_count:
+            return []
+
+        # Student query vector over the known vocabulary
+        query_features = [_tag_feature(tag) for tag in normalize_tags(interests)]
+        if department:
+            query_features.append(_department_feature(department))
+        columns = np.array(
+            sorted({self._vocab[f] for f in query_features if f in self._vocab}),
+            dtype=np.int64
+        )
+
+        scores = np.zeros(slot_count, dtype=np.float64)
+        if columns.size:
+            weights = self._idf[columns] * self._feature_scale[columns]
+            weights /= np.linalg.norm(weights)
+
+            # Sparse matrix-vector product over the query's columns only
+            starts = self._col_ptr[columns]
+            counts = self._col_ptr[columns + 1] - starts
+            entries = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            scores += np.bincount(
+                self._csc_rows[entries],
+                weights=self._csc_data[entries] * np.repeat(weights, counts),
+                minlength=slot_count
+            )
+
+        if graduation_year:
+            proximity = np.exp(-np.abs(self._years[:slot_count] - graduation_year) / YEAR_SCALE)
+            scores += YEAR_WEIGHT * np.nan_to_num(proximity)
+
+        scores[~self._active[:slot_count]] = -np.inf
+        for user_id in exclude:
+            slot = self._slots.get(user_id)
+            if slot is not None:
+                scores[slot] = -np.inf
+
+        limit = min(limit, self.mentor_count)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [
+            (self._slot_ids[slot], float(scores[slot]))
+            for slot in top
+            if np.isfinite(scores[slot])
+        ]
+
+    async def sync(self, db: AsyncSession) -> None:
+        """
+        Load the matrix on first use or after the resync interval, and
+        reload dirty mentors.
+
+        Args:
+            db: Database session
+        """
+        if self._fresh() and not self._dirty:
+            return
+
+        async with self._lock:
+            if not self._fresh():
+                self._dirty.clear()
+                await self._load(db, None)
+                self._loaded_at = time.monotonic()
+                logger.info(f"✅ Mentor matcher loaded {self.mentor_count} mentors")
+            elif self._dirty:
+                dirty = list(self._dirty)
+                self._dirty.difference_update(dirty)
+                await self._load(db, dirty)
+
+    def _fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < settings.MENTOR_MATCHER_RESYNC_SECONDS
+        )
+
+    async def _load(self, db: AsyncSession, user_ids: Optional[List[uuid.UUID]]) -> None:
+        """
+        Load active mentors (all, or the given users) from the database.
+
+        Mentors among ``user_ids`` (or, on a full load, in the matrix) that
+        are no longer active mentors are removed.
+        """
+        mentors_query = (
+            select(User.id, Profile.department, Profile.graduation_year, Profile.id)
+            .join(Profile, Profile.user_id == User.id)
+            .where(
+                User.role == UserRole.ALUMNI,
+                User.is_active == True,
+                Profile.is_mentor == True
+            )
+        )
+        if user_ids is not None:
+            mentors_query = mentors_query.where(User.id.in_(user_ids))
+
+        mentors = (await db.execute(mentors_query)).all()
+
+        tags_query = (
+            select(ProfileTag.profile_id, Tag.name)
+            .join(Tag, Tag.id == ProfileTag.tag_id)
+            .where(ProfileTag.kind == TagKind.EXPERTISE)
+        )
+        if user_ids is not None:
+            tags_query = tags_query.where(
+                ProfileTag.profile_id.in_([profile_id for *_, profile_id in mentors])
+            )
+
+        tags_by_profile = defaultdict(list)
+        for profile_id, name in (await db.execute(tags_query)).all():
+            tags_by_profile[profile_id].append(name)
+
+        self.upsert_mentors(
+            (user_id, department, graduation_year, tags_by_profile[profile_id])
+            for user_id, department, graduation_year, profile_id in mentors
+        )
+
+        still_mentors = {user_id for user_id, *_ in mentors}
+        previous = user_ids if user_ids is not None else list(self._slots)
+        self.remove_mentors([u for u in previous if u not in still_mentors])
+
+    def _allocate_slot(self, user_id: uuid.UUID) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_ids[slot] = user_id
+        else:
+            slot = len(self._slot_ids)
+            self._slot_ids.append(user_id)
+            if slot >= self._years.size:
+                capacity = max(64, self._years.size * 2)
+                self._years = np.resize(self._years, capacity)
+                self._active = np.resize(self._active, capacity)
+                self._active[slot:] = False
+        self._slots[user_id] = slot
+        return slot
+
+    def _feature(self, name: str, scale: float = 1.0) -> int:
+        index = self._vocab.get(name)
+        if index is None:
+            index = len(self._vocab)
+            self._vocab[name] = index
+            self._df = np.append(self._df, 0.0)
+            self._feature_scale = np.append(self._feature_scale, scale)
+        return index
+
+    def _release_features(self, user_id: uuid.UUID) -> None:
+        features = self._mentor_features.pop(user_id, [])
+        self._df[features] -= 1
+
+    def _replace_entries(self, slots: List[int], rows: List[int], cols: List[int]) -> None:
+        if slots:
+            keep = ~np.isin(self._rows, slots)
+            self._rows = self._rows[keep]
+            self._cols = self._cols[keep]
+        if rows:
+            self._rows = np.concatenate([self._rows, np.asarray(rows, dtype=np.int64)])
+            self._cols = np.concatenate([self._cols, np.asarray(cols, dtype=np.int64)])
+        if slots or rows:
+            self._stale = True
+
+    def _compile(self) -> None:
+        """Recompute IDF weights and the column-major weighted matrix."""
+        mentor_count = max(self.mentor_count, 1)
+        self._idf = np.log((1 + mentor_count) / (1 + self._df)) + 1.0
+
+        weights = self._idf[self._cols] * self._feature_scale[self._cols]
+        norms = np.sqrt(np.bincount(self._rows, weights=weights ** 2, minlength=len(self._slot_ids)))
+        data = weights / norms[self._rows]
+
+        order = np.argsort(self._cols, kind="stable")
+        self._csc_rows = self._rows[order]
+        self._csc_data = data[order]
+        self._col_ptr = np.concatenate([
+            [0], np.cumsum(np.bincount(self._cols, minlength=len(self._vocab)))
+        ]).astype(np.int64)
+        self._stale = False
+
+
+# Global matcher instance
+mentor_matcher = MentorMatcher()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_mentors(session: Session, flush_context) -> None:
+    """Remember users whose mentor row may have changed in this flush."""
+    changed = session.info.setdefault("matcher_dirty", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Profile):
+            changed.add(obj.user_id)
+        elif isinstance(obj, User) and obj.role == UserRole.ALUMNI:
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changed_mentors(session: Session) -> None:
+    """Mark mentors changed by a committed transaction as dirty."""
+    changed = session.info.pop("matcher_dirty", None)
+    if changed:
+        mentor_matcher.mark_dirty(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_mentors(session: Session, previous_transaction) -> None:
+    session.info.pop("matcher_dirty", None)
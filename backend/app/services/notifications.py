@@ -0,0 +1,265 @@
+"""
+Notification outbox and dispatcher.
+
+Endpoints record notifications with ``notify()`` in the same transaction as
+the change they announce, so a notification exists if and only if the
+change committed. A session hook wakes the dispatcher after commit; it
+claims undelivered rows with a conditional UPDATE (so with several workers
+each row is claimed once) and hands them to the connection manager, which
+routes them to whichever worker holds the user's sockets. Nothing here
+runs on the request path beyond the INSERT.
+
+Clients that were offline reconnect with ``last_seq`` and get the rows
+they missed replayed from the outbox.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.notification import NotificationOutbox
+from app.websockets.manager import manager
+
+logger = logging.getLogger(__name__)
+
+_dispatched = metrics.counter("notifications.dispatched")
+_replayed = metrics.counter("notifications.replayed")
+
+# How often delivered rows older than the retention period are deleted
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+def notify(db: AsyncSession, user_id: uuid.UUID, type: str, data: dict) -> NotificationOutbox:
+    """
+    Record a notification in the outbox as part of the current transaction.
+
+    Args:
+        db: Database session the change is being made in
+        user_id: Recipient
+        type: Message type, e.g. "mentorship_request"
+        data: JSON-serializable message payload
+
+    Returns:
+        The pending outbox row
+    """
+    entry = NotificationOutbox(user_id=user_id, type=type, payload=data)
+    db.add(entry)
+    return entry
+
+
+async def notify_many(
+    db: AsyncSession,
+    notifications: Iterable[Tuple[uuid.UUID, str, dict]]
+) -> int:
+    """
+    Record several notifications with one multi-row INSERT.
+
+    Bulk counterpart of notify(): the rows commit with the current
+    transaction and the dispatcher delivers them in a single pass.
+
+    Args:
+        db: Database session the change is being made in
+        notifications: (recipient, message type, payload) tuples
+
+    Returns:
+        Number of notifications recorded
+    """
+    rows = [
+        {"user_id": user_id, "type": type, "payload": data}
+        for user_id, type, data in notifications
+    ]
+    if rows:
+        await db.execute(insert(NotificationOutbox), rows)
+        db.sync_session.info["outbox_pending"] = True
+    return len(rows)
+
+
+async def replay_notifications(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    last_seq: int,
+    limit: int = settings.NOTIFICATION_REPLAY_LIMIT
+) -> List[dict]:
+    """
+    Delivered notifications a user has not seen yet.
+
+    Undelivered rows are left to the dispatcher, so replay and live delivery
+    overlap only if a row is dispatched while the client reconnects;
+    clients ignore messages with a seq they have already seen.
+
+    Args:
+        db: Database session
+        user_id: Recipient
+        last_seq: Highest seq the client has seen
+        limit: Maximum number of messages to replay
+
+    Returns:
+        WebSocket messages in sequence order
+    """
+    result = await db.execute(
+        select(NotificationOutbox)
+        .where(
+            NotificationOutbox.user_id == user_id,
+            NotificationOutbox.id > last_seq,
+            NotificationOutbox.dispatched_at.is_not(None)
+        )
+        .order_by(NotificationOutbox.id)
+        .limit(limit)
+    )
+    messages = [entry.to_message() for entry in result.scalars().all()]
+    _replayed.inc(len(messages))
+    return messages
+
+
+class NotificationDispatcher:
+    """
+    Background task that delivers committed outbox rows.
+
+    Woken right after a transaction that wrote notifications commits; also
+    polls every NOTIFICATION_POLL_SECONDS to pick up rows committed by other
+    workers or left behind by a crash.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.NOTIFICATION_BATCH_SIZE,
+        poll_seconds: float = settings.NOTIFICATION_POLL_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wake = asyncio.Event()
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        """
+        Start the dispatcher task.
+
+        Args:
+            session_factory: Factory for the dispatcher's own sessions
+        """
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the dispatcher task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Ask the dispatcher to look for new rows now."""
+        if self._task is not None:
+            self._wake.set()
+
+    async def dispatch_pending(self) -> int:
+        """
+        Claim and deliver one batch of undelivered rows.
+
+        Returns:
+            Number of rows delivered
+        """
+        pending = (
+            select(NotificationOutbox.id)
+            .where(NotificationOutbox.dispatched_at.is_(None))
+            .order_by(NotificationOutbox.id)
+            .limit(self.batch_size)
+        )
+
+        async with self._session_factory() as db:
+            result = await db.execute(
+                update(NotificationOutbox)
+                .where(
+                    NotificationOutbox.id.in_(pending.scalar_subquery()),
+                    NotificationOutbox.dispatched_at.is_(None)
+                )
+                .values(dispatched_at=datetime.utcnow())
+                .returning(
+                    NotificationOutbox.id,
+                    NotificationOutbox.user_id,
+                    NotificationOutbox.type,
+                    NotificationOutbox.payload
+                )
+                .execution_options(synchronize_session=False)
+            )
+            claimed = sorted(result.all())
+            await db.commit()
+
+        for seq, user_id, type, payload in claimed:
+            await manager.send_personal_message(
+                {"type": type, "seq": seq, "data": payload},
+                user_id
+            )
+
+        _dispatched.inc(len(claimed))
+        return len(claimed)
+
+    async def prune(self) -> None:
+        """Delete delivered rows older than the retention period."""
+        cutoff = datetime.utcnow() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+        async with self._session_factory() as db:
+            await db.execute(
+                delete(NotificationOutbox).where(
+                    NotificationOutbox.dispatched_at.is_not(None),
+                    NotificationOutbox.created_at < cutoff
+                )
+            )
+            await db.commit()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_prune = 0.0
+
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+                while await self.dispatch_pending() == self.batch_size:
+                    pass
+
+                if loop.time() - last_prune > PRUNE_INTERVAL_SECONDS:
+                    await self.prune()
+                    last_prune = loop.time()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Notification dispatch failed: {e}")
+                await asyncio.sleep(self.poll_seconds)
+
+
+# Global dispatcher instance
+notification_dispatcher = NotificationDispatcher()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_outbox_writes(session: Session, flush_context) -> None:
+    """Remember that this transaction wrote notifications."""
+    if any(isinstance(obj, NotificationOutbox) for obj in session.new):
+        session.info["outbox_pending"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session) -> None:
+    """Deliver notifications as soon as their transaction has committed."""
+    if session.info.pop("outbox_pending", False):
+        notification_dispatcher.wake()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_outbox_writes(session: Session, previous_transaction) -> None:
+    session.info.pop("outbox_pending", None)
@@ -0,0 +1,276 @@
+"""
+Full-text search index for user discovery.
+
+Keeps a denormalized ``user_search`` table (name, company, position, bio) in
+sync with ``users`` and ``profiles`` through database triggers, so every write
+path - ORM, bulk inserts or raw SQL - updates the index in the same
+transaction.
+
+- SQLite: an FTS5 external-content table ranked with ``bm25``
+- PostgreSQL: a generated ``tsvector`` column with a GIN index ranked with
+  ``ts_rank_cd``
+"""
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import Connection, func, literal_column, select, text
+from sqlalchemy.sql import column, table
+from sqlalchemy.sql.selectable import Subquery
+
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Column weights for relevance ranking: name, company, position, bio
+SEARCH_WEIGHTS = (10.0, 5.0, 5.0, 1.0)
+
+# Upper bound on query terms to keep MATCH expressions small
+MAX_SEARCH_TERMS = 8
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+_SQLITE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS user_search (
+        id INTEGER PRIMARY KEY,
+        user_id CHAR(32) NOT NULL UNIQUE,
+        full_name TEXT,
+        company TEXT,
+        position TEXT,
+        bio TEXT
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS user_search_fts USING fts5(
+        full_name, company, position, bio,
+        content='user_search',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    # user_search -> user_search_fts
+    """
+    CREATE TRIGGER IF NOT EXISTS user_search_ai AFTER INSERT ON user_search BEGIN
+        INSERT INTO user_search_fts(rowid, full_name, company, position, bio)
+        VALUES (new.id, new.full_name, new.company, new.position, new.bio);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_search_ad AFTER DELETE ON user_search BEGIN
+        INSERT INTO user_search_fts(user_search_fts, rowid, full_name, company, position, bio)
+        VALUES ('delete', old.id, old.full_name, old.company, old.position, old.bio);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_search_au AFTER UPDATE ON user_search BEGIN
+        INSERT INTO user_search_fts(user_search_fts, rowid, full_name, company, position, bio)
+        VALUES ('delete', old.id, old.full_name, old.company, old.position, old.bio);
+        INSERT INTO user_search_fts(rowid, full_name, company, position, bio)
+        VALUES (new.id, new.full_name, new.company, new.position, new.bio);
+    END
+    """,
+    # users -> user_search
+    """
+    CREATE TRIGGER IF NOT EXISTS users_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO user_search(user_id, full_name) VALUES (new.id, new.full_name)
+        ON CONFLICT(user_id) DO UPDATE SET full_name = excluded.full_name;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_search_au AFTER UPDATE OF full_name ON users BEGIN
+        UPDATE user_search SET full_name = new.full_name WHERE user_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_search_ad AFTER DELETE ON users BEGIN
+        DELETE FROM user_search WHERE user_id = old.id;
+    END
+    """,
+    # profiles -> user_search
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_search_ai AFTER INSERT ON profiles BEGIN
+        INSERT INTO user_search(user_id, company, position, bio)
+        VALUES (new.user_id, new.current_company, new.current_position, new.bio)
+        ON CONFLICT(user_id) DO UPDATE SET
+            company = excluded.company,
+            position = excluded.position,
+            bio = excluded.bio;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_search_au
+    AFTER UPDATE OF current_company, current_position, bio ON profiles BEGIN
+        UPDATE user_search
+        SET company = new.current_company, position = new.current_position, bio = new.bio
+        WHERE user_id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS profiles_search_ad AFTER DELETE ON profiles BEGIN
+        UPDATE user_search SET company = NULL, position = NULL, bio = NULL
+        WHERE user_id = old.user_id;
+    END
+    """,
+]
+
+_POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS user_search (
+        user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        full_name TEXT,
+        company TEXT,
+        position TEXT,
+        bio TEXT,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(full_name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(position, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(bio, '')), 'C')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_user_search_document ON user_search USING GIN (document)",
+    """
+    CREATE OR REPLACE FUNCTION user_search_sync_user() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO user_search(user_id, full_name) VALUES (NEW.id, NEW.full_name)
+        ON CONFLICT (user_id) DO UPDATE SET full_name = EXCLUDED.full_name;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_search_sync_profile() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            UPDATE user_search SET company = NULL, position = NULL, bio = NULL
+            WHERE user_id = OLD.user_id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO user_search(user_id, company, position, bio)
+        VALUES (NEW.user_id, NEW.current_company, NEW.current_position, NEW.bio)
+        ON CONFLICT (user_id) DO UPDATE SET
+            company = EXCLUDED.company,
+            position = EXCLUDED.position,
+            bio = EXCLUDED.bio;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS users_search_sync ON users",
+    """
+    CREATE TRIGGER users_search_sync AFTER INSERT OR UPDATE OF full_name ON users
+    FOR EACH ROW EXECUTE FUNCTION user_search_sync_user()
+    """,
+    "DROP TRIGGER IF EXISTS profiles_search_sync ON profiles",
+    """
+    CREATE TRIGGER profiles_search_sync
+    AFTER INSERT OR DELETE OR UPDATE OF current_company, current_position, bio ON profiles
+    FOR EACH ROW EXECUTE FUNCTION user_search_sync_profile()
+    """,
+]
+
+# Index rows for users created before the index existed
+_BACKFILL = """
+    INSERT INTO user_search(user_id, full_name, company, position, bio)
+    SELECT u.id, u.full_name, p.current_company, p.current_position, p.bio
+    FROM users u
+    LEFT JOIN profiles p ON p.user_id = u.id
+    WHERE NOT EXISTS (SELECT 1 FROM user_search s WHERE s.user_id = u.id)
+"""
+
+# Lightweight table constructs for building queries against the index
+_search_docs = table(
+    "user_search",
+    column("id"),
+    column("user_id", User.id.type),
+    column("document"),
+)
+_search_fts = table("user_search_fts", column("rowid"))
+
+
+def install_search_index(conn: Connection) -> None:
+    """
+    Create the search index, its sync triggers and backfill missing rows.
+
+    Safe to run on every startup. Intended for ``AsyncConnection.run_sync``.
+
+    Args:
+        conn: Synchronous SQLAlchemy connection
+    """
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        statements = _SQLITE_DDL
+    elif dialect == "postgresql":
+        statements = _POSTGRES_DDL
+    else:
+        logger.warning(f"⚠️ Full-text search index not supported on {dialect}")
+        return
+
+    for statement in statements:
+        conn.execute(text(statement))
+
+    conn.execute(text(_BACKFILL))
+    logger.info("✅ Search index ready")
+
+
+def tokenize_search(search: str) -> List[str]:
+    """
+    Split a free-text search string into lowercase index terms.
+
+    Args:
+        search: Raw search string from the client
+
+    Returns:
+        Up to MAX_SEARCH_TERMS word tokens
+    """
+    return _TERM_PATTERN.findall(search.lower())[:MAX_SEARCH_TERMS]
+
+
+def search_matches(dialect: str, search: str) -> Optional[Subquery]:
+    """
+    Build a subquery of users matching a search string.
+
+    Every term must match (as a prefix) in name, company, position or bio.
+
+    Args:
+        dialect: Database dialect name ("sqlite" or "postgresql")
+        search: Raw search string from the client
+
+    Returns:
+        Subquery with ``user_id`` and ``rank`` columns (lower rank is more
+        relevant), or None if the search string contains no terms
+    """
+    terms = tokenize_search(search)
+    if not terms:
+        return None
+
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery(
+            literal_column("'simple'::regconfig"),
+            " & ".join(f"{term}:*" for term in terms)
+        )
+        return (
+            select(
+                _search_docs.c.user_id,
+                (-func.ts_rank_cd(_search_docs.c.document, tsquery)).label("rank")
+            )
+            .where(_search_docs.c.document.op("@@")(tsquery))
+            .subquery("search_matches")
+        )
+
+    fts = literal_column("user_search_fts")
+    match_expression = " ".join(f'"{term}"*' for term in terms)
+    return (
+        select(
+            _search_docs.c.user_id,
+            func.bm25(fts, *SEARCH_WEIGHTS).label("rank")
+        )
+        .select_from(_search_fts.join(_search_docs, _search_docs.c.id == _search_fts.c.rowid))
+        .where(fts.op("MATCH")(match_expression))
+        .subquery("search_matches")
+    )
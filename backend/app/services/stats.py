@@ -0,0 +1,341 @@
+"""
+Incrementally maintained admin statistics.
+
+The admin dashboard's numbers live in the small ``stat_counters`` table
+instead of being aggregated from users, profiles and mentorship requests on
+every request:
+
+- ("users", "total"), ("role", <role>), ("department", <profile department>)
+- ("mentorships", "accepted")
+- ("signups", <YYYY-MM-DD>): users created that day
+
+A session flush hook turns ORM writes into counter deltas and applies them
+on the same connection, so counters commit or roll back with the change.
+Core statements that bypass the ORM call bump_counters themselves. Writes
+the hooks can't see (database-level cascades, manual SQL) are corrected by
+reconcile_counters, run at startup and periodically by StatsReconciler.
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Connection, delete, event, func, inspect, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.dialect import upsert_insert
+from app.models.mentorship import MentorshipRequest, MentorshipStatus
+from app.models.stats import StatCounter
+from app.models.user import Profile, User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Days counted as "new signups"; older daily buckets are pruned
+SIGNUP_WINDOW_DAYS = 30
+
+CounterKey = Tuple[str, str]
+
+_drift = metrics.counter("stats.reconcile_drift")
+
+
+def _signup_key(created_at: Optional[datetime]) -> CounterKey:
+    return ("signups", (created_at or datetime.utcnow()).date().isoformat())
+
+
+def _department_key(department: Optional[str]) -> Optional[CounterKey]:
+    return ("department", department[:255]) if department else None
+
+
+def _signup_cutoff() -> str:
+    return (datetime.utcnow() - timedelta(days=SIGNUP_WINDOW_DAYS)).date().isoformat()
+
+
+def bump_counters(conn: Connection, deltas: Dict[CounterKey, int]) -> None:
+    """
+    Add deltas to counters, creating missing rows.
+
+    Rows are upserted in key order so concurrent transactions lock them in
+    the same order. Intended for ``AsyncSession.run_sync``.
+
+    Args:
+        conn: Synchronous connection inside the current transaction
+        deltas: (scope, name) -> amount to add
+    """
+    rows = [
+        {"scope": scope, "name": name, "value": delta}
+        for (scope, name), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = upsert_insert(conn.dialect.name, StatCounter)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[StatCounter.scope, StatCounter.name],
+            set_={"value": StatCounter.value + stmt.excluded.value}
+        ),
+        rows
+    )
+
+
+def user_counter_deltas(users, profiles=()) -> Counter:
+    """
+    Counter deltas for newly inserted users and profiles.
+
+    Args:
+        users: Mappings or objects with role and created_at
+        profiles: Mappings or objects with department
+
+    Returns:
+        Deltas for bump_counters
+    """
+    def value(row: Any, name: str):
+        return row.get(name) if isinstance(row, dict) else getattr(row, name)
+
+    deltas = Counter()
+    for user in users:
+        deltas[("users", "total")] += 1
+        deltas[("role", UserRole(value(user, "role")).value)] += 1
+        deltas[_signup_key(value(user, "created_at"))] += 1
+    for profile in profiles:
+        key = _department_key(value(profile, "department"))
+        if key:
+            deltas[key] += 1
+    return deltas
+
+
+async def read_admin_stats(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Read the dashboard statistics from the counters table (one query).
+
+    New signups are whole days: today and the SIGNUP_WINDOW_DAYS before it.
+
+    Args:
+        db: Database session
+
+    Returns:
+        total_users, users_by_role, new_signups_30_days, active_mentorships
+        and users_by_department
+    """
+    result = await db.execute(
+        select(StatCounter.scope, StatCounter.name, StatCounter.value).where(
+            or_(StatCounter.scope != "signups", StatCounter.name >= _signup_cutoff())
+        )
+    )
+
+    stats = {
+        "total_users": 0,
+        "users_by_role": {},
+        "new_signups_30_days": 0,
+        "active_mentorships": 0,
+        "users_by_department": {},
+    }
+    for scope, name, value in result.all():
+        if scope == "users":
+            stats["total_users"] = value
+        elif scope == "role" and value:
+            stats["users_by_role"][name] = value
+        elif scope == "department" and value:
+            stats["users_by_department"][name] = value
+        elif scope == "mentorships":
+            stats["active_mentorships"] = value
+        elif scope == "signups":
+            stats["new_signups_30_days"] += value
+    return stats
+
+
+def reconcile_counters(conn: Connection) -> int:
+    """
+    Recompute every counter from the source tables and fix drifted rows.
+
+    The counter rows are locked before counting, so transactions bumping
+    them concurrently wait and apply their deltas on top of the corrected
+    values instead of being overwritten. Signup buckets older than the
+    window are deleted. Intended for ``AsyncConnection.run_sync``.
+
+    Args:
+        conn: Synchronous SQLAlchemy connection
+
+    Returns:
+        Number of counters that were wrong
+    """
+    conn.execute(update(StatCounter).values(value=StatCounter.value))
+    current = {
+        (scope, name): value
+        for scope, name, value in conn.execute(
+            select(StatCounter.scope, StatCounter.name, StatCounter.value)
+        )
+    }
+
+    expected: Dict[CounterKey, int] = {("users", "total"): conn.execute(select(func.count(User.id))).scalar()}
+    for role, count in conn.execute(select(User.role, func.count(User.id)).group_by(User.role)):
+        expected[("role", UserRole(role).value)] = count
+    for department, count in conn.execute(
+        select(Profile.department, func.count(Profile.id))
+        .where(Profile.department.isnot(None), Profile.department != "")
+        .group_by(Profile.department)
+    ):
+        expected[_department_key(department)] = count
+    expected[("mentorships", "accepted")] = conn.execute(
+        select(func.count(MentorshipRequest.id))
+        .where(MentorshipRequest.status == MentorshipStatus.ACCEPTED)
+    ).scalar()
+    signup_day = func.date(User.created_at)
+    for day, count in conn.execute(
+        select(signup_day, func.count(User.id))
+        .where(User.created_at >= datetime.fromisoformat(_signup_cutoff()))
+        .group_by(signup_day)
+    ):
+        expected[("signups", str(day))] = count
+
+    changed = [
+        {"scope": scope, "name": name, "value": value}
+        for (scope, name), value in sorted(expected.items())
+        if current.get((scope, name)) != value
+    ]
+    stale = [key for key in current if key not in expected]
+    drift = sum(
+        1 for key in current.keys() | expected.keys()
+        if current.get(key, 0) != expected.get(key, 0)
+    )
+
+    if changed:
+        stmt = upsert_insert(conn.dialect.name, StatCounter)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[StatCounter.scope, StatCounter.name],
+                set_={"value": stmt.excluded.value}
+            ),
+            changed
+        )
+    if stale:
+        conn.execute(
+            delete(StatCounter).where(tuple_(StatCounter.scope, StatCounter.name).in_(stale))
+        )
+
+    if drift:
+        logger.warning(f"⚠️ Reconciled {drift} drifted statistics counters")
+        _drift.inc(drift)
+    return drift
+
+
+class StatsReconciler:
+    """
+    Background task that reconciles the counters every
+    STATS_RECONCILE_SECONDS.
+    """
+
+    def __init__(self, interval_seconds: float = settings.STATS_RECONCILE_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        """
+        Start the reconciler task (no-op if the interval is 0).
+
+        Args:
+            session_factory: Factory for the reconciler's own sessions
+        """
+        if self.interval_seconds <= 0:
+            return
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the reconciler task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def reconcile(self) -> int:
+        """Run one reconciliation in its own transaction."""
+        async with self._session_factory() as db:
+            drift = await db.run_sync(lambda session: reconcile_counters(session.connection()))
+            await db.commit()
+        return drift
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Statistics reconciliation failed: {e}")
+
+
+# Global reconciler instance
+stats_reconciler = StatsReconciler()
+
+
+def _history(obj, attribute: str) -> Tuple[Any, Any, bool]:
+    """(old value, new value, changed) of an attribute in this flush."""
+    history = inspect(obj).attrs[attribute].history
+    if not history.has_changes():
+        return None, None, False
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return old, new, True
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_counters(session: Session, flush_context) -> None:
+    """Apply counter deltas for users, profiles and requests in this flush."""
+    deltas = Counter()
+    signup_cutoff = _signup_cutoff()
+
+    new = [obj for obj in session.new if isinstance(obj, (User, Profile, MentorshipRequest))]
+    deltas.update(user_counter_deltas(
+        [obj for obj in new if isinstance(obj, User)],
+        [obj for obj in new if isinstance(obj, Profile)]
+    ))
+    for obj in new:
+        if isinstance(obj, MentorshipRequest) and obj.status == MentorshipStatus.ACCEPTED:
+            deltas[("mentorships", "accepted")] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            deltas[("users", "total")] -= 1
+            deltas[("role", UserRole(obj.role).value)] -= 1
+            signup = _signup_key(obj.created_at)
+            if signup[1] >= signup_cutoff:
+                deltas[signup] -= 1
+        elif isinstance(obj, Profile):
+            key = _department_key(obj.department)
+            if key:
+                deltas[key] -= 1
+        elif isinstance(obj, MentorshipRequest) and obj.status == MentorshipStatus.ACCEPTED:
+            deltas[("mentorships", "accepted")] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            old, new_role, changed = _history(obj, "role")
+            if changed and old is not None:
+                deltas[("role", UserRole(old).value)] -= 1
+                deltas[("role", UserRole(new_role).value)] += 1
+        elif isinstance(obj, Profile):
+            old, new_department, changed = _history(obj, "department")
+            if changed:
+                for key, delta in ((_department_key(old), -1), (_department_key(new_department), 1)):
+                    if key:
+                        deltas[key] += delta
+        elif isinstance(obj, MentorshipRequest):
+            old, new_status, changed = _history(obj, "status")
+            if changed:
+                deltas[("mentorships", "accepted")] += (
+                    (new_status == MentorshipStatus.ACCEPTED) - (old == MentorshipStatus.ACCEPTED)
+                )
+
+    if any(deltas.values()):
+        bump_counters(session.connection(), deltas)
@@ -0,0 +1,277 @@
+"""
+Normalized expertise/interest tags.
+
+Profile.mentorship_expertise and Profile.interests stay the JSON source of
+truth for display; every write is mirrored into the indexed ``profile_tags``
+association (kept in sync from a session flush hook) so tag filters are
+index lookups on interned integer tag ids.
+"""
+import logging
+import re
+from enum import Enum
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Connection, delete, event, false, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.dialect import upsert_insert
+from app.models.tag import ProfileTag, Tag, TagKind
+from app.models.user import Profile
+
+logger = logging.getLogger(__name__)
+
+MAX_TAG_LENGTH = 100
+
+# Profile JSON attribute mirrored by each tag kind
+TAG_ATTRIBUTES = {
+    TagKind.EXPERTISE: "mentorship_expertise",
+    TagKind.INTEREST: "interests",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Interned tag name -> id for committed tags
+_tag_ids: Dict[str, int] = {}
+
+
+class TagMatch(str, Enum):
+    """How multiple tag filters combine."""
+    ANY = "any"
+    ALL = "all"
+
+
+def normalize_tag(name: str) -> str:
+    """
+    Normalize a tag: trimmed, lowercase, single-spaced.
+
+    Args:
+        name: Raw tag as entered by the user
+
+    Returns:
+        Normalized tag (empty string if nothing is left)
+    """
+    return _WHITESPACE.sub(" ", str(name)).strip().lower()[:MAX_TAG_LENGTH]
+
+
+def normalize_tags(names: Optional[Iterable[str]]) -> List[str]:
+    """Normalize and de-duplicate tags, preserving order."""
+    seen = {}
+    for name in names or []:
+        tag = normalize_tag(name)
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)
+
+
+def intern_tags(
+    conn: Connection,
+    names: List[str],
+    pending: Dict[str, int]
+) -> Dict[str, int]:
+    """
+    Resolve normalized tag names to ids, creating missing tags.
+
+    Args:
+        conn: Synchronous connection inside the current transaction
+        names: Normalized tag names
+        pending: Where to record ids of tags looked up or created in this
+            transaction; they join the process-wide cache only once it
+            commits (publish_interned_tags)
+
+    Returns:
+        Mapping of tag name to tag id
+    """
+    ids = {}
+    misses = []
+    for name in names:
+        tag_id = _tag_ids.get(name) or pending.get(name)
+        if tag_id is None:
+            misses.append(name)
+        else:
+            ids[name] = tag_id
+
+    if misses:
+        insert_stmt = upsert_insert(conn.dialect.name, Tag).on_conflict_do_nothing(
+            index_elements=[Tag.name]
+        )
+        conn.execute(insert_stmt, [{"name": name} for name in misses])
+        rows = conn.execute(select(Tag.id, Tag.name).where(Tag.name.in_(misses)))
+        for tag_id, name in rows:
+            ids[name] = tag_id
+            pending[name] = tag_id
+
+    return ids
+
+
+def publish_interned_tags(ids: Dict[str, int]) -> None:
+    """
+    Cache tag ids interned by a transaction that has committed.
+
+    Args:
+        ids: The transaction's ``pending`` mapping from intern_tags
+    """
+    _tag_ids.update(ids)
+
+
+def replace_profile_tags(
+    conn: Connection,
+    profile_id,
+    kind: TagKind,
+    names: Optional[Iterable[str]],
+    pending: Dict[str, int]
+) -> None:
+    """
+    Replace the indexed tags of one kind for a profile.
+
+    Args:
+        conn: Synchronous connection inside the current transaction
+        profile_id: Profile UUID
+        kind: Tag kind to replace
+        names: Raw tag names from the profile's JSON field
+        pending: See intern_tags
+    """
+    conn.execute(
+        delete(ProfileTag).where(
+            ProfileTag.profile_id == profile_id,
+            ProfileTag.kind == kind
+        )
+    )
+
+    tags = normalize_tags(names)
+    if not tags:
+        return
+
+    ids = intern_tags(conn, tags, pending)
+    conn.execute(
+        ProfileTag.__table__.insert(),
+        [{"profile_id": profile_id, "kind": kind, "tag_id": ids[tag]} for tag in tags]
+    )
+
+
+def backfill_profile_tags(conn: Connection) -> Dict[str, int]:
+    """
+    Index tags of profiles that have JSON tags but no profile_tags rows.
+
+    Safe to run on every startup. Intended for ``AsyncConnection.run_sync``.
+
+    Args:
+        conn: Synchronous SQLAlchemy connection
+
+    Returns:
+        Ids of the interned tags, to publish_interned_tags once the
+        transaction commits
+    """
+    pending: Dict[str, int] = {}
+    has_tags = select(ProfileTag.profile_id).where(ProfileTag.profile_id == Profile.id).exists()
+    rows = conn.execute(
+        select(Profile.id, Profile.mentorship_expertise, Profile.interests).where(~has_tags)
+    )
+
+    count = 0
+    for profile_id, expertise, interests in rows.all():
+        if not expertise and not interests:
+            continue
+        replace_profile_tags(conn, profile_id, TagKind.EXPERTISE, expertise, pending)
+        replace_profile_tags(conn, profile_id, TagKind.INTEREST, interests, pending)
+        count += 1
+
+    if count:
+        logger.info(f"✅ Indexed tags for {count} profiles")
+    return pending
+
+
+async def resolve_tag_ids(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Look up ids of existing tags without creating new ones.
+
+    Args:
+        db: Database session
+        names: Raw tag names
+
+    Returns:
+        Mapping of normalized name to id for the tags that exist
+    """
+    tags = normalize_tags(names)
+    ids = {tag: _tag_ids[tag] for tag in tags if tag in _tag_ids}
+    misses = [tag for tag in tags if tag not in ids]
+
+    if misses:
+        result = await db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(misses)))
+        for tag_id, name in result.all():
+            ids[name] = tag_id
+            _tag_ids[name] = tag_id
+
+    return ids
+
+
+async def tagged_profiles(
+    db: AsyncSession,
+    kind: TagKind,
+    names: Iterable[str],
+    match: TagMatch = TagMatch.ANY
+):
+    """
+    Build a subquery of profile ids carrying the given tags.
+
+    Args:
+        db: Database session
+        kind: Tag kind to filter on
+        names: Raw tag names
+        match: ANY (at least one tag) or ALL (every tag)
+
+    Returns:
+        Select of matching profile ids for use with ``Profile.id.in_()``
+    """
+    tags = normalize_tags(names)
+    ids = await resolve_tag_ids(db, tags)
+
+    query = select(ProfileTag.profile_id).where(
+        ProfileTag.kind == kind,
+        ProfileTag.tag_id.in_(list(ids.values()))
+    )
+
+    if match == TagMatch.ALL:
+        if len(ids) < len(tags):
+            # An unknown tag can never be matched by every profile
+            return query.where(false())
+        query = query.group_by(ProfileTag.profile_id).having(func.count() == len(ids))
+
+    return query
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_profile_tags(session: Session, flush_context) -> None:
+    """Mirror flushed changes to Profile JSON tag fields into profile_tags."""
+    changed = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Profile):
+            continue
+        is_new = obj in session.new
+        state = inspect(obj)
+        for kind, attribute in TAG_ATTRIBUTES.items():
+            names = getattr(obj, attribute)
+            if is_new and not names:
+                continue
+            if is_new or state.attrs[attribute].history.has_changes():
+                changed.append((obj.id, kind, names))
+
+    if not changed:
+        return
+
+    conn = session.connection()
+    pending = session.info.setdefault("interned_tags", {})
+    for profile_id, kind, names in changed:
+        replace_profile_tags(conn, profile_id, kind, names, pending)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_interned_tags(session: Session) -> None:
+    """Cache ids of tags created by a transaction once it has committed."""
+    publish_interned_tags(session.info.pop("interned_tags", {}))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_interned_tags(session: Session, previous_transaction) -> None:
+    """Forget ids of tags created by a transaction that rolled back."""
+    session.info.pop("interned_tags", None)
@@ -0,0 +1,172 @@
+"""
+Admin user listing and export.
+
+Listings and exports select only the columns they return, newest first by
+(created_at, id) (ix_users_created). Listing pages are keyset pages of that
+order. Exports stream from a server-side cursor in fixed-size chunks, each
+chunk encoded and sent before the next is fetched, so memory stays flat no
+matter how many users there are.
+"""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.user import User
+
+# Cursor sort name for admin user pages
+USERS_SORT = "created"
+
+UserKey = Tuple[datetime, uuid.UUID]
+
+# Columns of a listed or exported user, in export column order
+USER_COLUMNS = (
+    User.id,
+    User.full_name,
+    User.email,
+    User.role,
+    User.department,
+    User.verification_status,
+    User.is_active,
+    User.created_at,
+)
+EXPORT_FIELDS = [column.key for column in USER_COLUMNS]
+
+
+class ExportFormat(str, Enum):
+    """Export file format."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def users_query(
+    search: Optional[str] = None,
+    verification_status: Optional[str] = None,
+    after: Optional[UserKey] = None
+) -> Select:
+    """
+    Build a newest-first user query over USER_COLUMNS.
+
+    Args:
+        search: Case-insensitive substring of email or full name
+        verification_status: Only users with this verification status
+        after: Key of the last row on the previous page
+
+    Returns:
+        Column-only Select without limit
+    """
+    query = select(*USER_COLUMNS)
+
+    if search:
+        query = query.where(
+            or_(
+                User.email.ilike(f"%{search}%"),
+                User.full_name.ilike(f"%{search}%")
+            )
+        )
+
+    if verification_status:
+        query = query.where(User.verification_status == verification_status)
+
+    if after is not None:
+        created_at, user_id = after
+        query = query.where(
+            tuple_(User.created_at, User.id) < tuple_(
+                literal(created_at, User.created_at.type),
+                literal(user_id, User.id.type)
+            )
+        )
+
+    return query.order_by(User.created_at.desc(), User.id.desc())
+
+
+def user_record(row: Any) -> Dict[str, Any]:
+    """JSON-ready dict of a users_query row."""
+    return {
+        "id": str(row.id),
+        "full_name": row.full_name,
+        "email": row.email,
+        "role": row.role.value if row.role else None,
+        "department": row.department,
+        "verification_status": row.verification_status,
+        "is_active": row.is_active,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+def encode_users_cursor(row: Any) -> str:
+    """Cursor continuing after the given users_query row."""
+    return encode_cursor(USERS_SORT, [row.created_at.isoformat(), str(row.id)])
+
+
+def decode_users_cursor(cursor: str) -> UserKey:
+    """
+    Parse a cursor from encode_users_cursor.
+
+    Raises:
+        HTTPException 400: If the cursor is malformed
+    """
+    values = decode_cursor(cursor, USERS_SORT)
+    try:
+        created_at, user_id = values
+        return datetime.fromisoformat(created_at), uuid.UUID(user_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def stream_export(
+    session_factory: async_sessionmaker,
+    query: Select,
+    format: ExportFormat,
+    chunk_size: int
+) -> AsyncIterator[bytes]:
+    """
+    Encode a users_query as CSV or NDJSON, one chunk of rows at a time.
+
+    Uses its own session: a StreamingResponse body runs after the request's
+    dependencies have been closed.
+
+    Args:
+        session_factory: Factory for the export's session
+        query: Query from users_query
+        format: Output format
+        chunk_size: Rows fetched and encoded per chunk
+
+    Yields:
+        Encoded chunks (the CSV header first)
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS) if format == ExportFormat.CSV else None
+    if writer is not None:
+        writer.writeheader()
+        yield buffer.getvalue().encode()
+
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            buffer.seek(0)
+            buffer.truncate()
+            if writer is not None:
+                writer.writerows(user_record(row) for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(user_record(row)))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode()
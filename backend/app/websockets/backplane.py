@@ -0,0 +1,325 @@
+"""
+Pub/sub backplane for WebSocket notifications across worker processes.
+
+Each worker only holds its own sockets. ConnectionManager delivers a
+message to local connections directly and publishes it on the backplane;
+every other worker receives it and delivers it to the connections it holds.
+The same channel carries control messages (e.g. cache invalidations) that
+every other worker hands to its control handler.
+
+Implementations:
+- LocalBackplane: single process, publishing is a no-op
+- SQLiteBackplane: workers on one host share an append-only SQLite event
+  table that each worker polls
+- RedisBackplane: Redis (or compatible) PUB/SUB for multiple hosts;
+  requires the optional ``redis`` package
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Called with (target user id, target topic, JSON-encoded message); both
+# targets None for broadcasts
+DeliveryHandler = Callable[[Optional[UUID], Optional[str], str], Awaitable[None]]
+
+# Called with (kind, JSON-compatible data) for control messages
+ControlHandler = Callable[[str, Any], None]
+
+_published = metrics.counter("websocket.backplane.published")
+_received = metrics.counter("websocket.backplane.received")
+_errors = metrics.counter("websocket.backplane.errors")
+
+
+class Backplane(ABC):
+    """
+    Interface for cross-worker message routing.
+
+    Messages published by one worker are handed to the delivery handler of
+    every other worker. Implementations must not echo a worker's own
+    messages back to it; the publisher has already delivered them locally.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._handler: Optional[DeliveryHandler] = None
+        self._control_handler: Optional[ControlHandler] = None
+
+    async def start(self, handler: DeliveryHandler, control_handler: Optional[ControlHandler] = None) -> None:
+        """
+        Start receiving messages from other workers.
+
+        Args:
+            handler: Coroutine called for every remote message
+            control_handler: Function called for every remote control message
+        """
+        self._handler = handler
+        self._control_handler = control_handler
+
+    @abstractmethod
+    async def publish(self, user_id: Optional[UUID], text: str, topic: Optional[str] = None) -> None:
+        """
+        Publish a message to the other workers.
+
+        Args:
+            user_id: Target user, or None to broadcast to everyone
+            text: JSON-encoded message
+            topic: Target topic instead of a user
+        """
+
+    @abstractmethod
+    async def publish_control(self, kind: str, data: Any) -> None:
+        """
+        Publish a control message to the other workers.
+
+        Args:
+            kind: Control message kind, e.g. "auth.invalidate"
+            data: JSON-compatible payload
+        """
+
+    async def stop(self) -> None:
+        """Stop receiving and release resources."""
+
+    def _encode_control(self, kind: str, data: Any) -> str:
+        return json.dumps({"o": self.origin, "c": kind, "d": data})
+
+    def _encode(self, user_id: Optional[UUID], text: str, topic: Optional[str] = None) -> str:
+        return json.dumps({
+            "o": self.origin,
+            "u": str(user_id) if user_id else None,
+            "t": topic,
+            "m": text,
+        })
+
+    async def _dispatch(self, payload: str) -> None:
+        """Decode an envelope and hand remote messages to the handler."""
+        try:
+            envelope = json.loads(payload)
+            if envelope["o"] == self.origin:
+                return
+            if "c" in envelope:
+                _received.inc()
+                if self._control_handler is not None:
+                    self._control_handler(envelope["c"], envelope.get("d"))
+                return
+            user_id = UUID(envelope["u"]) if envelope["u"] else None
+            _received.inc()
+            await self._handler(user_id, envelope.get("t"), envelope["m"])
+        except Exception as e:
+            _errors.inc()
+            logger.warning(f"⚠️ Dropping backplane message: {e}")
+
+
+class LocalBackplane(Backplane):
+    """Single-worker deployments: there is nobody to forward to."""
+
+    async def publish(self, user_id: Optional[UUID], text: str, topic: Optional[str] = None) -> None:
+        return None
+
+    async def publish_control(self, kind: str, data: Any) -> None:
+        return None
+
+
+class SQLiteBackplane(Backplane):
+    """
+    Broker for workers on one host backed by a shared SQLite file.
+
+    Published messages are appended to an ``ws_events`` table (WAL mode);
+    each worker polls for rows newer than the last one it has seen. Old rows
+    are pruned after ``retention_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = 0.05,
+        retention_seconds: float = 60.0,
+        batch_size: int = 1000
+    ):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.batch_size = batch_size
+        # One thread owns the sqlite3 connection
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ws-backplane")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_id = 0
+        self._poller: Optional[asyncio.Task] = None
+
+    async def start(self, handler: DeliveryHandler, control_handler: Optional[ControlHandler] = None) -> None:
+        await super().start(handler, control_handler)
+        self._last_id = await self._run(self._open)
+        self._poller = asyncio.create_task(self._poll())
+        logger.info(f"✅ SQLite WebSocket backplane at {self.path}")
+
+    async def publish(self, user_id: Optional[UUID], text: str, topic: Optional[str] = None) -> None:
+        await self._run(self._insert, self._encode(user_id, text, topic))
+        _published.inc()
+
+    async def publish_control(self, kind: str, data: Any) -> None:
+        await self._run(self._insert, self._encode_control(kind, data))
+        _published.inc()
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+        if self._conn is not None:
+            await self._run(self._conn.close)
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _open(self) -> int:
+        """Open the database and return the newest event id."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ws_events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "payload TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        row = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM ws_events").fetchone()
+        return row[0]
+
+    def _insert(self, payload: str) -> None:
+        self._conn.execute(
+            "INSERT INTO ws_events (payload, created_at) VALUES (?, ?)",
+            (payload, time.time())
+        )
+
+    def _fetch(self, after_id: int) -> List[Tuple[int, str]]:
+        return self._conn.execute(
+            "SELECT id, payload FROM ws_events WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, self.batch_size)
+        ).fetchall()
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM ws_events WHERE created_at < ?",
+            (time.time() - self.retention_seconds,)
+        )
+
+    async def _poll(self) -> None:
+        last_prune = time.monotonic()
+        while True:
+            try:
+                rows = await self._run(self._fetch, self._last_id)
+                for event_id, payload in rows:
+                    self._last_id = event_id
+                    await self._dispatch(payload)
+
+                if time.monotonic() - last_prune > self.retention_seconds:
+                    await self._run(self._prune)
+                    last_prune = time.monotonic()
+
+                if len(rows) < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _errors.inc()
+                logger.error(f"❌ WebSocket backplane poll failed: {e}")
+                await asyncio.sleep(1)
+
+
+class RedisBackplane(Backplane):
+    """
+    Redis PUB/SUB backplane for workers on multiple hosts.
+
+    Works with any server speaking the Redis protocol (Redis, Valkey,
+    KeyDB). Requires ``pip install redis``.
+    """
+
+    def __init__(self, url: str, channel: str = "gradconnect:ws"):
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self._client = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, handler: DeliveryHandler, control_handler: Optional[ControlHandler] = None) -> None:
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("WS_BACKPLANE=redis requires the 'redis' package")
+
+        await super().start(handler, control_handler)
+        self._client = redis.from_url(self.url)
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"✅ Redis WebSocket backplane on channel {self.channel}")
+
+    async def publish(self, user_id: Optional[UUID], text: str, topic: Optional[str] = None) -> None:
+        await self._client.publish(self.channel, self._encode(user_id, text, topic))
+        _published.inc()
+
+    async def publish_control(self, kind: str, data: Any) -> None:
+        await self._client.publish(self.channel, self._encode_control(kind, data))
+        _published.inc()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        if self._client is not None:
+            await self._client.close()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        data = message["data"]
+                        await self._dispatch(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _errors.inc()
+                logger.error(f"❌ WebSocket backplane subscription failed: {e}")
+                await asyncio.sleep(1)
+
+
+def create_backplane(kind: str, url: str = "", poll_interval: float = 0.05) -> Backplane:
+    """
+    Build the backplane selected in settings.
+
+    Args:
+        kind: "local", "sqlite" or "redis"
+        url: SQLite file path or Redis URL
+        poll_interval: Polling interval for the SQLite broker, in seconds
+
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind == "local":
+        return LocalBackplane()
+    if kind == "sqlite":
+        return SQLiteBackplane(url or "./ws_backplane.db", poll_interval=poll_interval)
+    if kind == "redis":
+        return RedisBackplane(url or "redis://localhost:6379/0")
+    raise ValueError(f"Unknown WebSocket backplane: {kind}")
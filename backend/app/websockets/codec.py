@@ -0,0 +1,153 @@
+"""
+WebSocket wire formats.
+
+Clients that connect without a subprotocol get the original format: one
+JSON text frame per message. Clients can instead negotiate a v2
+subprotocol (``Sec-WebSocket-Protocol``), in which messages for the same
+socket are coalesced into one frame holding an array of messages:
+
+- ``gradconnect.v2.msgpack``: binary frames, MessagePack array
+- ``gradconnect.v2.json``: text frames, JSON array
+
+A Payload encodes its message at most once per format, however many
+sockets it is sent to; batched frames are assembled by concatenating the
+cached per-message encodings.
+
+Idle v2 connections receive ``{"type": "ping"}`` and should answer
+``{"type": "pong"}`` (any inbound frame counts as activity). Clients send
+``subscribe``/``unsubscribe`` control messages to manage topics (see
+app.websockets.topics).
+"""
+import json
+from typing import Dict, List, Optional, Sequence, Union
+
+import msgpack
+
+MSGPACK_SUBPROTOCOL = "gradconnect.v2.msgpack"
+JSON_SUBPROTOCOL = "gradconnect.v2.json"
+
+
+def _dumps(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class Payload:
+    """A message with lazily cached JSON and MessagePack encodings."""
+
+    __slots__ = ("_message", "_json", "_msgpack")
+
+    def __init__(self, message: Optional[dict] = None, json_text: Optional[str] = None):
+        self._message = message
+        self._json = json_text
+        self._msgpack: Optional[bytes] = None
+
+    @classmethod
+    def from_json(cls, text: str) -> "Payload":
+        """Wrap an already JSON-encoded message (e.g. from the backplane)."""
+        return cls(json_text=text)
+
+    @property
+    def message(self) -> dict:
+        if self._message is None:
+            self._message = json.loads(self._json)
+        return self._message
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = _dumps(self._message)
+        return self._json
+
+    @property
+    def msgpack(self) -> bytes:
+        if self._msgpack is None:
+            self._msgpack = msgpack.packb(self.message, default=str)
+        return self._msgpack
+
+
+class FrameFormat:
+    """How queued payloads are turned into frames for one socket."""
+
+    subprotocol: Optional[str] = None
+    batched = False
+    binary = False
+
+    def encode(self, payloads: Sequence[Payload]) -> Union[str, bytes]:
+        """Encode one payload (or a batch, for batched formats) into a frame."""
+        return payloads[0].json
+
+
+class BatchedJsonFormat(FrameFormat):
+    subprotocol = JSON_SUBPROTOCOL
+    batched = True
+
+    def encode(self, payloads: Sequence[Payload]) -> str:
+        return "[" + ",".join(payload.json for payload in payloads) + "]"
+
+
+class MsgpackFormat(FrameFormat):
+    subprotocol = MSGPACK_SUBPROTOCOL
+    batched = True
+    binary = True
+
+    def __init__(self):
+        self._packer = msgpack.Packer()
+
+    def encode(self, payloads: Sequence[Payload]) -> bytes:
+        header = self._packer.pack_array_header(len(payloads))
+        return header + b"".join(payload.msgpack for payload in payloads)
+
+
+LEGACY_FORMAT = FrameFormat()
+
+FORMATS: Dict[str, FrameFormat] = {
+    MSGPACK_SUBPROTOCOL: MsgpackFormat(),
+    JSON_SUBPROTOCOL: BatchedJsonFormat(),
+}
+
+
+# Client-to-server control messages
+CONTROL_TYPES = {"pong", "subscribe", "unsubscribe"}
+
+
+def decode_control(data: Union[str, bytes, None]) -> Optional[dict]:
+    """
+    Decode an inbound frame if it is a control message.
+
+    Args:
+        data: Text (JSON) or binary (MessagePack) frame payload
+
+    Returns:
+        The message if its "type" is a control type, else None
+    """
+    if not data:
+        return None
+    try:
+        if isinstance(data, bytes):
+            message = msgpack.unpackb(data)
+        elif data.lstrip().startswith("{"):
+            message = json.loads(data)
+        else:
+            return None
+    except Exception:
+        return None
+    if isinstance(message, dict) and message.get("type") in CONTROL_TYPES:
+        return message
+    return None
+
+
+def negotiate(offered: List[str]) -> FrameFormat:
+    """
+    Pick the wire format for a connection.
+
+    Args:
+        offered: Subprotocols requested by the client, in its preference order
+
+    Returns:
+        The first offered format this server supports, else the legacy format
+    """
+    for subprotocol in offered:
+        frame_format = FORMATS.get(subprotocol)
+        if frame_format is not None:
+            return frame_format
+    return LEGACY_FORMAT
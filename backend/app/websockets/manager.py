@@ -1,112 +1,611 @@
 from fastapi import WebSocket
-from typing import Dict, List
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
-import json
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.websockets.backplane import Backplane, LocalBackplane
+from app.websockets.codec import LEGACY_FORMAT, FrameFormat, Payload
+from app.websockets.topics import normalize_topic
+
+# Close code sent to clients that cannot keep up (RFC 6455 "policy violation")
+SLOW_CONSUMER_CLOSE_CODE = 1008
+
+# Close code sent to clients that stopped answering pings (as websockets' keepalive)
+HEARTBEAT_TIMEOUT_CLOSE_CODE = 1011
+
+# Connections examined between event loop yields while reaping
+REAP_BATCH_SIZE = 1000
+
+_PING = Payload({"type": "ping"})
+
+_connections_gauge = metrics.gauge("websocket.connections")
+_fanout_latency = metrics.histogram("websocket.fanout_latency_seconds")
+_enqueue_time = metrics.histogram("websocket.broadcast_enqueue_seconds")
+_sent = metrics.counter("websocket.messages_sent")
+_frames = metrics.counter("websocket.frames_sent")
+_bytes = metrics.counter("websocket.bytes_sent")
+_dropped = metrics.counter("websocket.messages_dropped")
+_slow_disconnects = metrics.counter("websocket.slow_consumer_disconnects")
+_reaped = metrics.counter("websocket.heartbeat_reaped")
+_pings = metrics.counter("websocket.heartbeat_pings")
+_sweep_time = metrics.histogram("websocket.heartbeat_sweep_seconds")
+_topic_publishes = metrics.counter("websocket.topic_publishes")
+
+
+class Connection:
+    """
+    One WebSocket connection with its own bounded outbound queue.
+
+    Messages are enqueued without awaiting the network; a dedicated writer
+    task drains the queue, so one slow client never delays delivery to
+    the others. A client whose queue overflows is disconnected. For
+    batched wire formats the writer coalesces messages queued within
+    ``coalesce_window`` seconds into one frame.
+    """
+
+    __slots__ = (
+        "websocket", "user_id", "queue_size", "frame_format", "coalesce_window",
+        "max_batch", "closed", "last_seen", "answers_pings", "topics", "_pending", "_waiter",
+        "_on_close", "_writer",
+    )
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: UUID,
+        queue_size: int,
+        on_close: Callable[["Connection"], None],
+        frame_format: FrameFormat = LEGACY_FORMAT,
+        coalesce_window: float = 0.0,
+        max_batch: int = 100
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue_size = queue_size
+        # Outbound queue: a deque plus one wake-up future is a fraction of
+        # the memory of an asyncio.Queue
+        self._pending: Deque[Tuple[Payload, float]] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self.frame_format = frame_format
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.closed = False
+        self.last_seen = time.monotonic()
+        # Set once the client answers a heartbeat ping; only such clients
+        # are reaped for not answering
+        self.answers_pings = False
+        # Subscribed topics; None until the first subscription
+        self.topics: Optional[Set[str]] = None
+        self._on_close = on_close
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the writer task."""
+        self._writer = asyncio.create_task(self._write())
+
+    def touch(self) -> None:
+        """Record activity from the client (any inbound frame, e.g. a pong)."""
+        self.last_seen = time.monotonic()
+
+    def pong(self) -> None:
+        """Record a heartbeat answer: the client takes part in the heartbeat."""
+        self.answers_pings = True
+        self.last_seen = time.monotonic()
+
+    def send(self, message: dict) -> bool:
+        """Queue a message for this connection only."""
+        return self.enqueue(Payload(message), time.perf_counter())
+
+    def enqueue(self, payload: Payload, enqueued_at: float) -> bool:
+        """
+        Queue a message for sending.
+
+        Args:
+            payload: Message, shared with other connections it is sent to
+            enqueued_at: perf_counter() timestamp for latency tracking
+
+        Returns:
+            False if the connection is closed or was dropped as a slow consumer
+        """
+        if self.closed:
+            return False
+
+        if len(self._pending) >= self.queue_size:
+            _dropped.inc(len(self._pending) + 1)
+            _slow_disconnects.inc()
+            print(f"⚠️ Disconnecting slow consumer {self.user_id} (send queue full)")
+            self.close(SLOW_CONSUMER_CLOSE_CODE, "Slow consumer")
+            return False
+
+        self._pending.append((payload, enqueued_at))
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+        return True
+
+    def close(self, code: Optional[int] = None, reason: str = "") -> None:
+        """
+        Stop the writer and unregister the connection.
+
+        Args:
+            code: Close code to send to the client; None when the socket is
+                already closed
+            reason: Close reason sent with the code
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._on_close(self)
+
+        if code is not None:
+            _background(self._close_socket(code, reason))
+
+    async def _close_socket(self, code: int, reason: str) -> None:
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    async def _write(self) -> None:
+        """Drain the queue onto the socket."""
+        frame_format = self.frame_format
+        pending = self._pending
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if not pending:
+                    self._waiter = loop.create_future()
+                    try:
+                        await self._waiter
+                    finally:
+                        self._waiter = None
+
+                batch = [pending.popleft()]
+
+                if frame_format.batched:
+                    if self.coalesce_window:
+                        await asyncio.sleep(self.coalesce_window)
+                    while pending and len(batch) < self.max_batch:
+                        batch.append(pending.popleft())
+
+                frame = frame_format.encode([payload for payload, _ in batch])
+                if frame_format.binary:
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+
+                now = time.perf_counter()
+                _frames.inc()
+                _bytes.inc(len(frame))
+                _sent.inc(len(batch))
+                for _, enqueued_at in batch:
+                    _fanout_latency.observe(now - enqueued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Error sending to {self.user_id}: {e}")
+            self.close()
+
+
+# Strong references to fire-and-forget tasks until they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 class ConnectionManager:
     """
     Async WebSocket connection manager for real-time notifications.
-    
-    Manages user-specific WebSocket connections using a Dict[UUID, List[WebSocket]]
-    structure to support multiple simultaneous connections per user (e.g., multiple
-    devices or browser tabs).
-    
+
+    Manages user-specific WebSocket connections using a
+    Dict[UUID, Dict[int, Connection]] structure (keyed by socket identity) to
+    support multiple simultaneous connections per user (e.g., multiple devices
+    or browser tabs) with O(1) registration and removal.
+
     Features:
     - User-specific message broadcasting
     - Multiple connections per user support
-    - Automatic connection cleanup
+    - Per-connection bounded send queues with a writer task each, so sends
+      never wait on the network and slow clients are disconnected
+    - Automatic connection cleanup, plus a ping/pong heartbeat for v2
+      clients that reaps the ones that stopped responding (half-open
+      sockets); legacy clients rely on protocol-level ping frames
     - System-wide announcements
+    - Topic subscriptions (department, mentors, cohort, announcements) with a
+      topic -> connections index, so topic pushes only touch subscribers
+    - Cross-worker delivery through a pluggable backplane
     """
-    
-    def __init__(self):
-        # Store active connections: user_id -> list of WebSocket connections
-        self.active_connections: Dict[UUID, List[WebSocket]] = {}
-    
-    async def connect(self, websocket: WebSocket, user_id: UUID) -> None:
+
+    def __init__(
+        self,
+        queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        coalesce_window: float = settings.WS_COALESCE_WINDOW_MS / 1000,
+        max_batch: int = settings.WS_MAX_BATCH,
+        heartbeat_interval: float = settings.WS_HEARTBEAT_INTERVAL_SECONDS,
+        heartbeat_timeout: float = settings.WS_HEARTBEAT_TIMEOUT_SECONDS,
+        max_topics: int = settings.WS_MAX_TOPICS_PER_CONNECTION
+    ):
+        # Store active connections: user_id -> {id(websocket): connection}
+        self.active_connections: Dict[UUID, Dict[int, Connection]] = {}
+        self._total = 0
+        # Topic index: topic -> {id(connection): connection}
+        self._topics: Dict[str, Dict[int, Connection]] = {}
+        self.max_topics = max_topics
+        self.queue_size = queue_size
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.backplane: Backplane = LocalBackplane()
+        self._heartbeat: Optional[asyncio.Task] = None
+        # Control message kind -> handler (see on_control)
+        self._control_handlers: Dict[str, Callable[[Any], None]] = {}
+
+    async def start(self, backplane: Backplane) -> None:
+        """
+        Start routing messages through a backplane and start the heartbeat.
+
+        Args:
+            backplane: Backplane shared by all workers
+        """
+        self.backplane = backplane
+        await backplane.start(self._deliver_remote, self._handle_control)
+        if self.heartbeat_interval > 0:
+            self._heartbeat = asyncio.create_task(self._run_heartbeat())
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the backplane."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        await self.backplane.stop()
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: UUID,
+        frame_format: FrameFormat = LEGACY_FORMAT
+    ) -> Connection:
         """
         Accept and register a new WebSocket connection for a user.
-        
+
         Args:
             websocket: The WebSocket connection to register
             user_id: UUID of the user connecting
+            frame_format: Negotiated wire format
+
+        Returns:
+            The registered connection
         """
-        await websocket.accept()
-        
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        
-        self.active_connections[user_id].append(websocket)
+        await websocket.accept(subprotocol=frame_format.subprotocol)
+
+        connection = Connection(
+            websocket,
+            user_id,
+            self.queue_size,
+            self._remove,
+            frame_format=frame_format,
+            coalesce_window=self.coalesce_window,
+            max_batch=self.max_batch
+        )
+        self.active_connections.setdefault(user_id, {})[id(websocket)] = connection
+        self._total += 1
+        connection.start()
+        _connections_gauge.inc()
+
         print(f"✅ User {user_id} connected. Total connections: {len(self.active_connections[user_id])}")
-    
+        return connection
+
     def disconnect(self, websocket: WebSocket, user_id: UUID) -> None:
         """
         Remove a WebSocket connection for a user.
-        
+
+        Safe to call for connections that were already removed (e.g. dropped
+        as a slow consumer).
+
         Args:
             websocket: The WebSocket connection to remove
             user_id: UUID of the user disconnecting
         """
-        if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
-            
-            # Clean up empty connection lists
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
-            
+        connection = self.active_connections.get(user_id, {}).get(id(websocket))
+        if connection is not None:
+            connection.close()
             print(f"❌ User {user_id} disconnected")
-    
+
+    def _remove(self, connection: Connection) -> None:
+        """Unregister a closed connection."""
+        connections = self.active_connections.get(connection.user_id)
+        key = id(connection.websocket)
+        if connections is None or connections.get(key) is not connection:
+            return
+
+        del connections[key]
+        self._total -= 1
+        _connections_gauge.dec()
+
+        if connection.topics:
+            self._unindex(connection, connection.topics)
+
+        # Clean up empty connection lists
+        if not connections:
+            del self.active_connections[connection.user_id]
+
+    def subscribe(self, connection: Connection, topics: Iterable[str]) -> List[str]:
+        """
+        Subscribe a connection to topics.
+
+        Args:
+            connection: Subscribing connection
+            topics: Topic names as sent by the client
+
+        Returns:
+            Topics that were rejected (invalid, or over the per-connection limit)
+        """
+        if connection.closed:
+            return list(topics)
+
+        if connection.topics is None:
+            connection.topics = set()
+
+        rejected = []
+        for raw in topics:
+            topic = normalize_topic(raw)
+            if topic is None or (
+                topic not in connection.topics and len(connection.topics) >= self.max_topics
+            ):
+                rejected.append(raw)
+                continue
+            connection.topics.add(topic)
+            self._topics.setdefault(topic, {})[id(connection)] = connection
+
+        return rejected
+
+    def unsubscribe(self, connection: Connection, topics: Iterable[str]) -> None:
+        """
+        Unsubscribe a connection from topics.
+
+        Args:
+            connection: Subscribed connection
+            topics: Topic names as sent by the client
+        """
+        if not connection.topics:
+            return
+
+        removed = {normalize_topic(raw) for raw in topics} & connection.topics
+        connection.topics -= removed
+        self._unindex(connection, removed)
+
+    def _unindex(self, connection: Connection, topics: Iterable[str]) -> None:
+        for topic in topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.pop(id(connection), None)
+            if not subscribers:
+                del self._topics[topic]
+
+    async def publish(self, topic: str, message: dict) -> None:
+        """
+        Send a message to every connection subscribed to a topic, in this
+        and every other worker.
+
+        Only subscribed connections are visited.
+
+        Args:
+            topic: Topic name (see app.websockets.topics)
+            message: Dictionary to send as JSON
+
+        Raises:
+            ValueError: If the topic is not valid
+        """
+        canonical = normalize_topic(topic)
+        if canonical is None:
+            raise ValueError(f"Invalid topic: {topic}")
+
+        payload = Payload(message)
+        _topic_publishes.inc()
+        await self._deliver(None, payload, canonical)
+        await self._publish(None, payload, canonical)
+
+    def get_topic_subscriber_count(self, topic: str) -> int:
+        """Get the number of local connections subscribed to a topic."""
+        canonical = normalize_topic(topic)
+        return len(self._topics.get(canonical, ())) if canonical else 0
+
     async def send_personal_message(self, message: dict, user_id: UUID) -> None:
         """
-        Send a message to all connections of a specific user.
-        
+        Send a message to all connections of a specific user, in this and
+        every other worker.
+
+        The message is queued for each local connection; this does not wait
+        for it to be written to the network.
+
         Args:
             message: Dictionary to send as JSON
             user_id: UUID of the target user
         """
-        if user_id in self.active_connections:
-            # Send to all active connections for this user
-            disconnected = []
-            
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"⚠️ Error sending to {user_id}: {e}")
-                    disconnected.append(connection)
-            
-            # Clean up failed connections
-            for conn in disconnected:
-                self.disconnect(conn, user_id)
-    
+        payload = Payload(message)
+        await self._deliver(user_id, payload)
+        await self._publish(user_id, payload)
+
     async def broadcast(self, message: dict) -> None:
         """
         Broadcast a message to all connected users.
-        
+
+        The message is serialized once per wire format and queued for every
+        connection without awaiting any sends.
+
         Args:
             message: Dictionary to send as JSON to all users
         """
-        disconnected = []
-        
-        for user_id, connections in self.active_connections.items():
-            for connection in connections:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"⚠️ Error broadcasting to {user_id}: {e}")
-                    disconnected.append((connection, user_id))
-        
-        # Clean up failed connections
-        for conn, user_id in disconnected:
-            self.disconnect(conn, user_id)
-    
+        payload = Payload(message)
+        await self._deliver(None, payload)
+        await self._publish(None, payload)
+
+    def on_control(self, kind: str, handler: Callable[[Any], None]) -> None:
+        """
+        Handle control messages of one kind published by other workers.
+
+        Args:
+            kind: Control message kind
+            handler: Function called with the message data
+        """
+        self._control_handlers[kind] = handler
+
+    def publish_control(self, kind: str, data: Any) -> None:
+        """
+        Send a control message to the other workers in the background.
+
+        Args:
+            kind: Control message kind (see on_control)
+            data: JSON-compatible payload
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        _background(self._publish_control(kind, data))
+
+    async def _publish_control(self, kind: str, data: Any) -> None:
+        try:
+            await self.backplane.publish_control(kind, data)
+        except Exception as e:
+            print(f"⚠️ Backplane control publish failed: {e}")
+
+    def _handle_control(self, kind: str, data: Any) -> None:
+        """Backplane control handler: run the handler registered for ``kind``."""
+        handler = self._control_handlers.get(kind)
+        if handler is not None:
+            handler(data)
+
+    async def _deliver_remote(self, user_id: Optional[UUID], topic: Optional[str], text: str) -> None:
+        """Backplane handler: deliver a message published by another worker."""
+        await self._deliver(user_id, Payload.from_json(text), topic)
+
+    async def _deliver(
+        self,
+        user_id: Optional[UUID],
+        payload: Payload,
+        topic: Optional[str] = None
+    ) -> None:
+        """
+        Queue a message on local connections.
+
+        Args:
+            user_id: Target user, or None for every connection
+            payload: Message to send
+            topic: Target topic subscribers instead of a user
+        """
+        started = time.perf_counter()
+
+        if topic is not None:
+            subscribers = self._topics.get(topic)
+            if subscribers:
+                for connection in list(subscribers.values()):
+                    connection.enqueue(payload, started)
+            return
+
+        if user_id is not None:
+            connections = self.active_connections.get(user_id)
+            if connections:
+                for connection in list(connections.values()):
+                    connection.enqueue(payload, started)
+            return
+
+        for connections in list(self.active_connections.values()):
+            for connection in list(connections.values()):
+                connection.enqueue(payload, started)
+
+        _enqueue_time.observe(time.perf_counter() - started)
+
+    async def _publish(
+        self,
+        user_id: Optional[UUID],
+        payload: Payload,
+        topic: Optional[str] = None
+    ) -> None:
+        """Forward a message to the other workers; local delivery already happened."""
+        try:
+            await self.backplane.publish(user_id, payload.json, topic)
+        except Exception as e:
+            print(f"⚠️ Backplane publish failed: {e}")
+
     def get_user_connection_count(self, user_id: UUID) -> int:
         """Get the number of active connections for a user."""
-        return len(self.active_connections.get(user_id, []))
-    
+        return len(self.active_connections.get(user_id, ()))
+
     def get_total_connections(self) -> int:
         """Get the total number of active connections across all users."""
-        return sum(len(connections) for connections in self.active_connections.values())
+        return self._total
+
+    async def _run_heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ WebSocket heartbeat sweep failed: {e}")
+
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Ping idle connections and reap the ones that stopped answering.
+
+        Idle v2 connections (negotiated subprotocol) get a ``{"type":
+        "ping"}`` message after ``heartbeat_interval``. Only connections that
+        have answered a ping before are closed, after
+        ``heartbeat_interval + heartbeat_timeout`` without inbound traffic:
+        legacy clients don't know the message, so they are left to the
+        server's protocol-level ping frames (uvicorn ``ws_ping_interval``),
+        which browsers answer automatically. Works through the registry in
+        batches, yielding to the event loop between them.
+
+        Args:
+            now: time.monotonic() value to sweep at (defaults to now)
+
+        Returns:
+            Number of connections reaped
+        """
+        started = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        ping_before = now - self.heartbeat_interval
+        reap_before = ping_before - self.heartbeat_timeout
+
+        connections = [c for group in list(self.active_connections.values()) for c in group.values()]
+        reaped = 0
+        for i in range(0, len(connections), REAP_BATCH_SIZE):
+            for connection in connections[i:i + REAP_BATCH_SIZE]:
+                if connection.closed or connection.last_seen > ping_before:
+                    continue
+                if connection.answers_pings and connection.last_seen <= reap_before:
+                    connection.close(HEARTBEAT_TIMEOUT_CLOSE_CODE, "Heartbeat timeout")
+                    reaped += 1
+                elif connection.frame_format is not LEGACY_FORMAT:
+                    connection.enqueue(_PING, started)
+                    _pings.inc()
+            await asyncio.sleep(0)
+
+        _reaped.inc(reaped)
+        _sweep_time.observe(time.perf_counter() - started)
+        if reaped:
+            print(f"⚠️ Reaped {reaped} unresponsive WebSocket connections")
+        return reaped
 
 
 # Global connection manager instance
@@ -0,0 +1,63 @@
+"""
+WebSocket topics.
+
+Clients subscribe to topics over their socket and receive messages
+published to them:
+
+- ``announcements``: platform announcements from admins
+- ``mentors``: news for alumni mentors
+- ``department:<name>``: a department channel (name normalized like tags)
+- ``cohort:<year>``: a graduation-year cohort
+
+Client control messages::
+
+    {"type": "subscribe", "topics": ["announcements", "department:computer science"]}
+    {"type": "unsubscribe", "topics": ["cohort:2020"]}
+
+The server answers with ``{"type": "subscriptions", "topics": [...]}``.
+"""
+import re
+from typing import Optional
+
+from app.services.tags import normalize_tag
+
+ANNOUNCEMENTS = "announcements"
+MENTORS = "mentors"
+
+_FIXED_TOPICS = {ANNOUNCEMENTS, MENTORS}
+_YEAR = re.compile(r"^\d{4}$")
+
+
+def department_topic(department: str) -> str:
+    """Topic of a department channel."""
+    return f"department:{normalize_tag(department)}"
+
+
+def cohort_topic(graduation_year: int) -> str:
+    """Topic of a graduation-year cohort."""
+    return f"cohort:{graduation_year}"
+
+
+def normalize_topic(topic: str) -> Optional[str]:
+    """
+    Validate and normalize a topic name.
+
+    Args:
+        topic: Topic as sent by a client or publisher
+
+    Returns:
+        Canonical topic name, or None if it is not a valid topic
+    """
+    if not isinstance(topic, str):
+        return None
+
+    topic = topic.strip().lower()
+    if topic in _FIXED_TOPICS:
+        return topic
+
+    kind, _, value = topic.partition(":")
+    if kind == "department" and normalize_tag(value):
+        return department_topic(value)
+    if kind == "cohort" and _YEAR.match(value) and 1900 <= int(value) <= 2100:
+        return cohort_topic(int(value))
+    return None
@@ -0,0 +1,19 @@
+"""
+Run app.main:app under uvicorn for the benchmarks.
+
+The models use the PostgreSQL UUID type; importing _sqlite first lets the
+app create its tables on its SQLite database. Arguments go to uvicorn's
+command line, e.g. (from backend/):
+
+    python benchmarks/_serve.py --host 127.0.0.1 --port 8000
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import _sqlite  # noqa: E402,F401  (UUID shim for SQLite)
+import uvicorn.main  # noqa: E402
+
+if __name__ == "__main__":
+    uvicorn.main.main(["app.main:app", *sys.argv[1:]])
@@ -0,0 +1,29 @@
+"""
+Scratch SQLite databases for the benchmarks.
+
+The models use the PostgreSQL UUID type, which SQLite can't render in
+CREATE TABLE; importing this module teaches the SQLite compiler to store it
+as CHAR(32) (the hex form SQLAlchemy binds for non-native UUIDs). Engines
+are built here rather than via app.db.session, whose pool_size and
+max_overflow the SQLite engine rejects.
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(UUID, "sqlite")
+def _uuid_as_char(element, compiler, **kw) -> str:
+    return "CHAR(32)"
+
+
+def sqlite_engine(path: str = ":memory:") -> Engine:
+    """Synchronous engine on a scratch SQLite file (in memory by default)."""
+    return create_engine(f"sqlite:///{path}")
+
+
+def sqlite_async_engine(path: str) -> AsyncEngine:
+    """aiosqlite engine on a scratch SQLite file."""
+    return create_async_engine(f"sqlite+aiosqlite:///{path}")
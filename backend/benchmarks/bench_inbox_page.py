@@ -0,0 +1,197 @@
+"""
+Benchmark for mentorship inbox pages.
+
+Seeds a scratch SQLite database with a popular mentor and compares the
+previous GET /api/mentorship/requests implementation (ORM entities with
+chained joinedloads, a dict per row, re-validation into
+MentorshipRequestWithDetails) against the column-only projection
+(app.services.inbox.inbox_details). Each page goes through the same
+response-model validation and JSON serialization FastAPI applies, and the
+benchmark reports latency and peak allocated memory per page.
+
+Usage (from backend/):
+    python benchmarks/bench_inbox_page.py [--requests 5000] [--page-size 100] [--pages 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import joinedload
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _sqlite import sqlite_async_engine  # noqa: E402  (UUID shim for SQLite)
+from app.db.base import Base  # noqa: E402
+from app.models import notification, tag  # noqa: E402,F401  (register tables)
+from app.models.mentorship import MentorshipRequest, MentorshipStatus  # noqa: E402
+from app.models.user import Profile, User, UserRole  # noqa: E402
+from app.schemas.mentorship import MentorshipRequestWithDetails  # noqa: E402
+from app.services.inbox import inbox_details, inbox_owner, inbox_query  # noqa: E402
+
+response_adapter = TypeAdapter(List[MentorshipRequestWithDetails])
+
+
+def user_rows(count: int, role: UserRole, prefix: str):
+    now = datetime.utcnow()
+    users, profiles = [], []
+    for i in range(count):
+        user_id = uuid.uuid4()
+        users.append({
+            "id": user_id,
+            "email": f"{prefix}{i}@example.com",
+            "hashed_password": "x",
+            "role": role,
+            "full_name": f"{prefix.title()} {i}",
+            "is_active": True,
+            "is_verified": True,
+            "verification_status": "verified",
+            "created_at": now,
+            "updated_at": now,
+        })
+        profiles.append({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "department": "Computer Science",
+            "current_company": "Acme Corp",
+            "current_position": "Staff Engineer",
+            "bio": "Ten years building distributed systems. " * 5,
+            "is_mentor": role == UserRole.ALUMNI,
+            "mentorship_expertise": ["python", "system design", "career growth"],
+            "interests": ["hiking", "chess"],
+            "created_at": now,
+            "updated_at": now,
+        })
+    return users, profiles
+
+
+async def seed(session_factory, requests: int):
+    """One mentor with ``requests`` requests from distinct students."""
+    mentors, mentor_profiles = user_rows(1, UserRole.ALUMNI, "mentor")
+    students, student_profiles = user_rows(requests, UserRole.STUDENT, "student")
+    started = datetime(2024, 1, 1)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "student_id": student["id"],
+            "alumni_id": mentors[0]["id"],
+            "message": "I'd love your advice on moving into backend engineering.",
+            "status": MentorshipStatus.PENDING,
+            "created_at": started + timedelta(minutes=i),
+            "updated_at": started + timedelta(minutes=i),
+        }
+        for i, student in enumerate(students)
+    ]
+    async with session_factory() as db:
+        await db.execute(insert(User), mentors + students)
+        await db.execute(insert(Profile), mentor_profiles + student_profiles)
+        await db.execute(insert(MentorshipRequest), rows)
+        await db.commit()
+    return mentors[0]["id"]
+
+
+async def legacy_page(db, mentor_id, limit: int) -> bytes:
+    """The listing before the projection: entities, dicts, re-validation."""
+    query = (
+        inbox_query(MentorshipRequest.alumni_id, mentor_id)
+        .options(
+            joinedload(MentorshipRequest.student).joinedload(User.profile),
+            joinedload(MentorshipRequest.alumni).joinedload(User.profile)
+        )
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    enriched = []
+    for req in result.scalars().all():
+        enriched.append(MentorshipRequestWithDetails(**{
+            "id": req.id,
+            "student_id": req.student_id,
+            "alumni_id": req.alumni_id,
+            "message": req.message,
+            "status": req.status,
+            "created_at": req.created_at,
+            "updated_at": req.updated_at,
+            "student_name": req.student.full_name if req.student else None,
+            "alumni_name": req.alumni.full_name if req.alumni else None,
+            "student_email": req.student.email if req.student else None,
+            "student_department": req.student.profile.department if req.student and req.student.profile else None,
+            "alumni_company": req.alumni.profile.current_company if req.alumni and req.alumni.profile else None,
+            "alumni_position": req.alumni.profile.current_position if req.alumni and req.alumni.profile else None,
+        }))
+    return response_adapter.dump_json(response_adapter.validate_python(enriched))
+
+
+async def lean_page(db, mentor_id, limit: int) -> bytes:
+    """The listing as served now: column-only rows."""
+    query = inbox_details(inbox_query(inbox_owner(UserRole.ALUMNI), mentor_id)).limit(limit)
+    result = await db.execute(query)
+    rows = [row._asdict() for row in result.all()]
+    return response_adapter.dump_json(response_adapter.validate_python(rows))
+
+
+async def measure(session_factory, page, mentor_id, limit: int, pages: int):
+    """Per-page latency samples and the mean peak traced memory."""
+    latencies = []
+    for _ in range(pages):
+        # A fresh session per page, as per request
+        async with session_factory() as db:
+            started = time.perf_counter()
+            body = await page(db, mentor_id, limit)
+            latencies.append(time.perf_counter() - started)
+
+    peaks = []
+    for _ in range(10):
+        async with session_factory() as db:
+            tracemalloc.start()
+            await page(db, mentor_id, limit)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return latencies, statistics.mean(peaks), body
+
+
+async def run(requests: int, limit: int, pages: int) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = sqlite_async_engine(f"{workdir}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        mentor_id = await seed(session_factory, requests)
+
+        results = {}
+        for name, page in (("joinedload", legacy_page), ("projection", lean_page)):
+            await measure(session_factory, page, mentor_id, limit, 5)  # warm up
+            results[name] = await measure(session_factory, page, mentor_id, limit, pages)
+        await engine.dispose()
+
+    assert results["joinedload"][2] == results["projection"][2], "responses differ"
+
+    print(f"{requests} requests, {limit}-row pages, {pages} pages")
+    print(f"{'query':<12}{'p50 ms':>9}{'p99 ms':>9}{'peak KiB':>10}")
+    for name, (latencies, peak, _) in results.items():
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+        print(f"{name:<12}{statistics.median(latencies) * 1e3:>9.2f}{p99 * 1e3:>9.2f}{peak / 1024:>10.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.page_size, args.pages))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Memory benchmark for the admin user export.
+
+Seeds scratch SQLite databases of increasing size and measures the peak
+allocated memory of producing every user: the previous GET
+/api/admin/users (all User entities, one list of dicts, one JSON document)
+against the streamed NDJSON and CSV exports
+(app.services.user_export.stream_export). Streamed peaks should stay flat
+as the user count grows.
+
+Usage (from backend/):
+    python benchmarks/bench_user_export.py [--users 20000 80000] [--chunk-size 1000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _sqlite import sqlite_async_engine  # noqa: E402  (UUID shim for SQLite)
+from app.db.base import Base  # noqa: E402
+from app.models import mentorship, notification, tag  # noqa: E402,F401  (register tables)
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.user_export import ExportFormat, stream_export, users_query  # noqa: E402
+
+
+async def seed(session_factory, count: int) -> None:
+    started = datetime(2024, 1, 1)
+    batch = []
+    async with session_factory() as db:
+        for i in range(count):
+            batch.append({
+                "id": uuid.uuid4(),
+                "email": f"user{i}@example.com",
+                "hashed_password": "$2b$12$" + "x" * 53,
+                "role": UserRole.STUDENT if i % 3 else UserRole.ALUMNI,
+                "full_name": f"User Number {i}",
+                "department": "Computer Science",
+                "is_active": True,
+                "is_verified": False,
+                "verification_status": "pending",
+                "created_at": started + timedelta(seconds=i),
+                "updated_at": started + timedelta(seconds=i),
+            })
+            if len(batch) == 5000:
+                await db.execute(insert(User), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(User), batch)
+        await db.commit()
+
+
+async def legacy_listing(session_factory, chunk_size: int) -> int:
+    """The listing before pagination: every entity, then one response body."""
+    async with session_factory() as db:
+        users = (await db.execute(select(User))).scalars().all()
+        body = json.dumps([
+            {
+                "id": str(user.id),
+                "full_name": user.full_name,
+                "email": user.email,
+                "role": user.role,
+                "department": user.department,
+                "verification_status": user.verification_status,
+                "is_active": user.is_active,
+                "created_at": user.created_at.isoformat() if user.created_at else None
+            }
+            for user in users
+        ])
+    return len(body)
+
+
+def streamed(format: ExportFormat):
+    async def export(session_factory, chunk_size: int) -> int:
+        size = 0
+        async for chunk in stream_export(session_factory, users_query(), format, chunk_size):
+            size += len(chunk)  # sent and dropped by the response
+        return size
+    return export
+
+
+async def run(counts, chunk_size: int) -> None:
+    variants = {
+        "listing": legacy_listing,
+        "ndjson": streamed(ExportFormat.NDJSON),
+        "csv": streamed(ExportFormat.CSV),
+    }
+    print(f"{'users':>8} {'variant':<9}{'seconds':>9}{'peak MiB':>10}{'body MiB':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in counts:
+            engine = sqlite_async_engine(f"{workdir}/bench-{count}.db")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            await seed(session_factory, count)
+
+            for name, variant in variants.items():
+                tracemalloc.start()
+                started = time.perf_counter()
+                size = await variant(session_factory, chunk_size)
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{count:>8} {name:<9}{elapsed:>9.2f}{peak / 2**20:>10.1f}{size / 2**20:>10.1f}")
+            await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[20000, 80000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.chunk_size))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
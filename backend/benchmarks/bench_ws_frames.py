@@ -0,0 +1,115 @@
+"""
+Benchmark for WebSocket wire formats.
+
+Encodes a burst-heavy notification stream for many sockets with each wire
+format (legacy one-JSON-frame-per-message, v2 batched JSON, v2 MessagePack),
+with and without permessage-deflate, through the websockets library's
+framing, and reports bytes on the wire and CPU time per message.
+
+Usage (from backend/):
+    python benchmarks/bench_ws_frames.py [--sockets 200] [--messages 1000] [--burst 10]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import Frame, Opcode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.websockets.codec import (  # noqa: E402
+    FORMATS,
+    JSON_SUBPROTOCOL,
+    LEGACY_FORMAT,
+    MSGPACK_SUBPROTOCOL,
+    Payload,
+)
+
+
+def synthetic_messages(count: int, rng: random.Random):
+    """Mentorship notifications and announcements, like production traffic."""
+    for seq in range(1, count + 1):
+        if rng.random() < 0.5:
+            yield {
+                "type": "mentorship_request",
+                "seq": seq,
+                "data": {
+                    "request_id": str(uuid.uuid4()),
+                    "student_name": f"Student {rng.randrange(10000)}",
+                    "student_id": str(uuid.uuid4()),
+                    "message": "I'd love your advice on breaking into data engineering.",
+                    "created_at": datetime.utcnow().isoformat(),
+                },
+            }
+        else:
+            yield {
+                "type": "announcement",
+                "seq": seq,
+                "data": {
+                    "title": "Alumni meetup",
+                    "body": f"Join us on campus for the class of {rng.randint(1990, 2024)} reunion.",
+                },
+            }
+
+
+def run(frame_format, deflate: bool, messages, sockets: int, burst: int):
+    """Encode and frame the stream for every socket; returns (bytes, cpu seconds)."""
+    payloads = [Payload(message) for message in messages]
+    total_bytes = 0
+    started = time.process_time()
+
+    for _ in range(sockets):
+        extensions = [PerMessageDeflate(False, False, 15, 15)] if deflate else []
+        step = burst if frame_format.batched else 1
+        for i in range(0, len(payloads), step):
+            data = frame_format.encode(payloads[i:i + step])
+            if isinstance(data, str):
+                frame = Frame(Opcode.TEXT, data.encode())
+            else:
+                frame = Frame(Opcode.BINARY, data)
+            total_bytes += len(frame.serialize(mask=False, extensions=extensions))
+
+    return total_bytes, time.process_time() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--burst", type=int, default=10, help="Messages coalesced per v2 frame")
+    args = parser.parse_args()
+
+    messages = list(synthetic_messages(args.messages, random.Random(42)))
+    delivered = args.sockets * args.messages
+
+    formats = [
+        ("legacy json", LEGACY_FORMAT),
+        ("v2 json", FORMATS[JSON_SUBPROTOCOL]),
+        ("v2 msgpack", FORMATS[MSGPACK_SUBPROTOCOL]),
+    ]
+
+    print(f"{args.sockets} sockets x {args.messages} messages, bursts of {args.burst}")
+    print(f"{'format':<14}{'deflate':<9}{'bytes/msg':>10}{'us/msg':>9}{'bytes vs legacy':>17}")
+
+    baseline = None
+    for name, frame_format in formats:
+        for deflate in (False, True):
+            total_bytes, cpu = run(frame_format, deflate, messages, args.sockets, args.burst)
+            per_message = total_bytes / delivered
+            if baseline is None:
+                baseline = per_message
+            print(
+                f"{name:<14}{'yes' if deflate else 'no':<9}{per_message:>10.1f}"
+                f"{cpu / delivered * 1e6:>9.2f}{(per_message / baseline - 1) * 100:>16.1f}%"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
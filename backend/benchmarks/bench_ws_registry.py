@@ -0,0 +1,111 @@
+"""
+Benchmark for the WebSocket connection registry.
+
+Registers many in-memory sockets with ConnectionManager and reports memory
+per connection (tracemalloc, including each connection's queue and writer
+task), connect/disconnect cost, and the time of a heartbeat sweep and a
+broadcast over the whole registry.
+
+Usage (from backend/):
+    python benchmarks/bench_ws_registry.py [--connections 50000]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.websockets.codec import FORMATS, JSON_SUBPROTOCOL  # noqa: E402
+from app.websockets.manager import ConnectionManager  # noqa: E402
+
+
+class NullWebSocket:
+    """Socket stand-in that accepts and discards everything."""
+
+    __slots__ = ()
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        pass
+
+    async def send_bytes(self, data):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+async def run(count: int, users: int) -> None:
+    manager = ConnectionManager(heartbeat_interval=30, heartbeat_timeout=30)
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    sockets = [NullWebSocket() for _ in range(count)]
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+
+    # v2 clients that answer pings, so the sweeps ping and reap every one
+    started = time.perf_counter()
+    with quiet:
+        for i, websocket in enumerate(sockets):
+            connection = await manager.connect(websocket, user_ids[i % users], FORMATS[JSON_SUBPROTOCOL])
+            connection.pong()
+    connect_time = time.perf_counter() - started
+    await asyncio.sleep(0)  # let writer tasks start and park on their queues
+
+    used = sum(
+        stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename")
+    )
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    total = manager.get_total_connections()
+    total_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await manager.broadcast({"type": "announcement", "data": {"title": "Benchmark"}})
+    broadcast_time = time.perf_counter() - started
+    await asyncio.sleep(0.1)
+
+    # Every connection idle past the interval: one ping each
+    started = time.perf_counter()
+    await manager.sweep(time.monotonic() + 31)
+    ping_sweep_time = time.perf_counter() - started
+    await asyncio.sleep(0.1)
+
+    # Every connection past the timeout: reap them all
+    started = time.perf_counter()
+    with quiet:
+        reaped = await manager.sweep(time.monotonic() + 61)
+    reap_time = time.perf_counter() - started
+
+    print(f"{count} connections, {users} users")
+    print(f"memory/connection:      {used / count:,.0f} bytes ({used / 2**20:,.1f} MiB total)")
+    print(f"connect:                {connect_time / count * 1e6:.1f} us/connection")
+    print(f"get_total_connections:  {total_time * 1e6:.1f} us ({total})")
+    print(f"broadcast enqueue:      {broadcast_time * 1e3:.1f} ms")
+    print(f"heartbeat ping sweep:   {ping_sweep_time * 1e3:.1f} ms")
+    print(f"heartbeat reap sweep:   {reap_time * 1e3:.1f} ms ({reaped} reaped, "
+          f"{reap_time / max(reaped, 1) * 1e6:.1f} us/connection)")
+    print(f"remaining:              {manager.get_total_connections()}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=40_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.connections, args.users))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
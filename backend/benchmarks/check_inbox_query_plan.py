@@ -0,0 +1,116 @@
+"""
+Query-plan check for mentorship inbox pages.
+
+Builds a scratch SQLite database with one popular mentor and one prolific
+student, runs EXPLAIN QUERY PLAN on every inbox query shape (alumni and
+student, with and without a status filter, first page and cursor page)
+exactly as GET /api/mentorship/requests builds it, and asserts that each is
+served by its composite inbox index without a separate sort.
+
+Usage (from backend/):
+    python benchmarks/check_inbox_query_plan.py [--requests 20000]
+
+Exits non-zero if any plan misses its index or sorts.
+"""
+import argparse
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _sqlite import sqlite_engine  # noqa: E402  (UUID shim for SQLite)
+from app.db.base import Base  # noqa: E402
+from app.models import notification, tag  # noqa: E402,F401  (register tables)
+from app.models.mentorship import MentorshipRequest, MentorshipStatus  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.services.inbox import inbox_details, inbox_owner, inbox_query  # noqa: E402
+
+
+def seed(conn, mentor_id, student_id, count: int, rng: random.Random) -> None:
+    """Requests for the popular mentor and from the prolific student, plus noise."""
+    statuses = list(MentorshipStatus)
+    started = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        # Fresh counterparts keep pending pairs unique
+        if i % 10 == 0:
+            pair = (student_id, uuid.uuid4())
+        elif i % 4 == 0:
+            pair = (uuid.uuid4(), uuid.uuid4())
+        else:
+            pair = (uuid.uuid4(), mentor_id)
+        created_at = started + timedelta(seconds=i * 37)
+        rows.append({
+            "id": uuid.uuid4(),
+            "student_id": pair[0],
+            "alumni_id": pair[1],
+            "message": "Could we talk about your career path?",
+            "status": rng.choice(statuses),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    conn.execute(insert(MentorshipRequest), rows)
+    conn.exec_driver_sql("ANALYZE")
+
+
+def explain(engine, query):
+    """EXPLAIN QUERY PLAN detail lines for a query, as the driver receives it."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    with engine.connect() as conn:
+        event.listen(conn, "before_cursor_execute", capture)
+        conn.execute(query).all()
+        event.remove(conn, "before_cursor_execute", capture)
+        statement, parameters = captured[-1]
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in plan]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = sqlite_engine()
+    Base.metadata.create_all(engine)
+
+    mentor_id, student_id = uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        seed(conn, mentor_id, student_id, args.requests, random.Random(7))
+
+    cursor_key = (datetime(2024, 6, 1), uuid.uuid4())
+    failures = 0
+    for role, user_id in ((UserRole.ALUMNI, mentor_id), (UserRole.STUDENT, student_id)):
+        owner = inbox_owner(role)
+        for status_filter in (None, MentorshipStatus.PENDING):
+            expected = f"ix_mentorship_requests_{role.value}_{'status_' if status_filter else ''}inbox"
+            for after in (None, cursor_key):
+                query = inbox_details(inbox_query(owner, user_id, status_filter, after)).limit(21)
+                plan = explain(engine, query)
+                inbox_step = next((step for step in plan if " mentorship_requests " in step), "")
+                ok = expected in inbox_step and not any("TEMP B-TREE" in step for step in plan)
+                failures += not ok
+
+                label = (
+                    f"{role.value:<8}status={status_filter.value if status_filter else '-':<8}"
+                    f"{'cursor' if after else 'first '}"
+                )
+                print(f"{'✅' if ok else '❌'} {label} {inbox_step}")
+                if not ok:
+                    print(f"   expected {expected} without a temp b-tree sort:")
+                    for step in plan:
+                        print(f"     {step}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,670 @@
+"""
+WebSocket load test for app.main:app.
+
+Starts the API under uvicorn in a scratch directory (or targets a running
+server with --url), opens many connections to /api/ws/{user_id}, subscribes
+them to the announcements topic and then drives real traffic through the
+HTTP API:
+
+- mentorship notifications: seeded students request mentorship from seeded
+  alumni, whose sockets receive the notification through the outbox
+- broadcasts: admin announcements published to every subscribed socket
+
+It reports connect rate, fan-out latency (HTTP request sent -> message
+received, p50/p99), server memory per connection (process.rss_bytes),
+server event-loop lag (event_loop.lag_seconds) and the load generator's own
+loop lag; if that one is high the client, not the server, was saturated.
+
+Results are written as JSON. Pass --baseline to compare against an earlier
+result: the run exits non-zero if a metric regressed by more than
+--tolerance.
+
+Usage (from backend/):
+    python benchmarks/ws_loadtest.py --connections 5000 --save ws_baseline.json
+    python benchmarks/ws_loadtest.py --connections 5000 --baseline ws_baseline.json
+
+    # Existing server: needs its SECRET_KEY in the environment (or .env)
+    python benchmarks/ws_loadtest.py --url http://127.0.0.1:8000
+
+Each connection is a file descriptor on both sides; raise ``ulimit -n``
+for large runs.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import secrets
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SUBPROTOCOLS = {
+    "legacy": None,
+    "json": "gradconnect.v2.json",
+    "msgpack": "gradconnect.v2.msgpack",
+}
+
+PASSWORD = "LoadTest#2024"
+
+# (result key, True if higher is better, absolute change ignored as noise)
+COMPARED_METRICS = [
+    ("connect_rate_per_second", True, 0.0),
+    ("mentorship_latency_ms.p50", False, 5.0),
+    ("mentorship_latency_ms.p99", False, 5.0),
+    ("broadcast_latency_ms.p50", False, 5.0),
+    ("broadcast_latency_ms.p99", False, 5.0),
+    ("memory_per_connection_bytes", False, 512.0),
+    ("server_loop_lag_ms.p99", False, 5.0),
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, as in app.core.metrics.Histogram."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def summarize_ms(seconds: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(seconds),
+        "p50": round(percentile(seconds, 50) * 1e3, 3),
+        "p99": round(percentile(seconds, 99) * 1e3, 3),
+        "max": round(max(seconds, default=0.0) * 1e3, 3),
+    }
+
+
+class Api:
+    """Minimal blocking HTTP client (stdlib only), run in worker threads."""
+
+    def __init__(self, base_url: str, concurrency: int):
+        self.base_url = base_url.rstrip("/")
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest-http")
+
+    def _request(self, method: str, path: str, token: Optional[str], body: Optional[bytes],
+                 content_type: Optional[str], lines: bool = False) -> Tuple[int, Any]:
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        if content_type:
+            request.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                if lines:
+                    return response.status, [json.loads(line) for line in response]
+                return response.status, json.loads(response.read() or b"null")
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b"null")
+
+    async def call(self, method: str, path: str, token: Optional[str] = None,
+                   json_body=None, body: Optional[bytes] = None,
+                   content_type: Optional[str] = None) -> Tuple[int, dict]:
+        if json_body is not None:
+            body, content_type = json.dumps(json_body).encode(), "application/json"
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._request, method, path, token, body, content_type
+        )
+
+    async def lines(self, path: str, token: Optional[str] = None) -> Tuple[int, List[dict]]:
+        """GET an NDJSON response as a list of objects."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._request, "GET", path, token, None, None, True
+        )
+
+    async def upload(self, path: str, token: str, filename: str, data: bytes) -> Tuple[int, dict]:
+        boundary = uuid.uuid4().hex
+        body = io.BytesIO()
+        body.write(f"--{boundary}\r\n".encode())
+        body.write(f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode())
+        body.write(b"Content-Type: application/octet-stream\r\n\r\n")
+        body.write(data)
+        body.write(f"\r\n--{boundary}--\r\n".encode())
+        return await self.call(
+            "POST", path, token, body=body.getvalue(),
+            content_type=f"multipart/form-data; boundary={boundary}"
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class Collector:
+    """Receive times of the messages the load test is waiting for."""
+
+    def __init__(self):
+        self.announcements: Dict[str, List[float]] = {}
+        self.requests: Dict[str, float] = {}
+        self.pings = 0
+        self.errors = 0
+
+    def handle(self, message: dict) -> None:
+        received = time.perf_counter()
+        kind = message.get("type")
+        data = message.get("data") or {}
+        if kind == "announcement":
+            self.announcements.setdefault(data.get("title"), []).append(received)
+        elif kind == "mentorship_request":
+            self.requests[data.get("request_id")] = received
+
+
+class Client:
+    """One load-test socket and its reader task."""
+
+    __slots__ = ("websocket", "reader")
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.reader: Optional[asyncio.Task] = None
+
+    def start(self, collector: Collector) -> None:
+        self.reader = asyncio.create_task(self._read(collector))
+
+    async def _read(self, collector: Collector) -> None:
+        websocket = self.websocket
+        binary = websocket.subprotocol == SUBPROTOCOLS["msgpack"]
+        try:
+            async for frame in websocket:
+                decoded = msgpack.unpackb(frame) if isinstance(frame, bytes) else json.loads(frame)
+                for message in decoded if isinstance(decoded, list) else (decoded,):
+                    if message.get("type") == "ping":
+                        collector.pings += 1
+                        pong = {"type": "pong"}
+                        await websocket.send(msgpack.packb(pong) if binary else json.dumps(pong))
+                    else:
+                        collector.handle(message)
+        except websockets.ConnectionClosed:
+            pass
+        except Exception:
+            collector.errors += 1
+
+    async def subscribe(self, topic: str) -> None:
+        message = {"type": "subscribe", "topics": [topic]}
+        binary = self.websocket.subprotocol == SUBPROTOCOLS["msgpack"]
+        await self.websocket.send(msgpack.packb(message) if binary else json.dumps(message))
+
+    async def close(self) -> None:
+        await self.websocket.close()
+        if self.reader is not None:
+            await self.reader
+
+
+class LoopLag:
+    """Event-loop lag of the load generator itself."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+def raise_fd_limit() -> int:
+    """Raise the open-file limit to the hard limit (inherited by the server)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        soft = hard
+    return soft
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, port: int, secret_key: str) -> Tuple[subprocess.Popen, str]:
+    """
+    Launch the API in a scratch directory with a fresh SQLite database.
+
+    The default command goes through _serve.py, which applies the SQLite
+    UUID shim before uvicorn imports the app.
+    """
+    workdir = tempfile.mkdtemp(prefix="gradconnect-loadtest-")
+    command = (
+        args.server_cmd.format(port=port, python=sys.executable)
+        if args.server_cmd else
+        f"{sys.executable} {os.path.join(BACKEND_DIR, 'benchmarks', '_serve.py')} "
+        f"--host 127.0.0.1 --port {port} --log-level warning"
+    )
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get("PYTHONPATH")])),
+        SECRET_KEY=secret_key,
+        DEBUG="False",
+    )
+    log_path = os.path.join(workdir, "server.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen(shlex.split(command), cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return process, log_path
+
+
+async def wait_ready(api: Api, process: Optional[subprocess.Popen], timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            status, _ = await api.call("GET", "/api/health")
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def server_metrics(api: Api) -> dict:
+    status, body = await api.call("GET", "/api/metrics")
+    if status != 200:
+        raise RuntimeError(f"GET /api/metrics failed: {status}")
+    return body
+
+
+def access_token(user_id: str, role: str) -> str:
+    """
+    Mint an access token like app.core.auth.create_access_token.
+
+    Logging in every seeded user would trip the login rate limit.
+    """
+    from jose import jwt
+
+    from app.core.config import settings
+
+    payload = {
+        "sub": user_id,
+        "role": role,
+        "type": "access",
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+async def seed(api: Api, run_id: str, mentors: int,
+               listeners: int) -> Tuple[str, List[Tuple[str, str]], List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Create an admin, ``mentors`` student/mentor pairs and ``listeners``
+    students that only hold a socket open (sockets need a real user's token).
+
+    Returns:
+        (admin token, [(alumni id, token)], [(student id, token)],
+        [(listener id, token)])
+    """
+    status, body = await api.call("POST", "/api/auth/register", json_body={
+        "email": f"loadtest-{run_id}-admin@example.com",
+        "password": PASSWORD,
+        "full_name": "Load Test Admin",
+        "role": "admin",
+    })
+    if status != 201:
+        raise RuntimeError(f"admin registration failed ({status}): {body}")
+    admin_token = body["access_token"]
+
+    rows = []
+    for i in range(mentors):
+        rows.append({
+            "email": f"loadtest-{run_id}-alumni-{i}@example.com",
+            "full_name": f"Load Test Mentor {i}",
+            "role": "alumni",
+            "password": PASSWORD,
+            "is_mentor": True,
+        })
+        rows.append({
+            "email": f"loadtest-{run_id}-student-{i}@example.com",
+            "full_name": f"Load Test Student {i}",
+            "role": "student",
+            "password": PASSWORD,
+        })
+    # One hash for every listener: hashing thousands of passwords would
+    # dominate the seeding time
+    from passlib.hash import bcrypt
+
+    listener_hash = bcrypt.hash(PASSWORD)
+    for i in range(listeners):
+        rows.append({
+            "email": f"loadtest-{run_id}-listener-{i}@example.com",
+            "full_name": f"Load Test Listener {i}",
+            "role": "student",
+            "hashed_password": listener_hash,
+        })
+    data = "\n".join(json.dumps(row) for row in rows).encode()
+    status, report = await api.upload("/api/admin/users/import", admin_token, "loadtest.jsonl", data)
+    if status != 200 or report["failed"]:
+        raise RuntimeError(f"seeding users failed ({status}): {report}")
+
+    status, users = await api.lines(
+        f"/api/admin/users/export?format=ndjson&search=loadtest-{run_id}-", admin_token
+    )
+    if status != 200:
+        raise RuntimeError(f"listing seeded users failed ({status}): {users}")
+    by_email = {user["email"]: user for user in users}
+
+    def with_tokens(kind: str, role: str, count: int) -> List[Tuple[str, str]]:
+        ids = [by_email[f"loadtest-{run_id}-{kind}-{i}@example.com"]["id"] for i in range(count)]
+        return [(user_id, access_token(user_id, role)) for user_id in ids]
+
+    return (
+        admin_token,
+        with_tokens("alumni", "alumni", mentors),
+        with_tokens("student", "student", mentors),
+        with_tokens("listener", "student", listeners),
+    )
+
+
+async def open_connections(ws_url: str, users: List[Tuple[str, str]], args,
+                           collector: Collector) -> Tuple[List[Client], float, int]:
+    """Open one socket per (user id, token); returns (clients, elapsed seconds, failures)."""
+    semaphore = asyncio.Semaphore(args.connect_concurrency)
+    subprotocol = SUBPROTOCOLS[args.format]
+    clients: List[Client] = []
+    failures = 0
+
+    async def connect(user_id: str, token: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            try:
+                websocket = await websockets.connect(
+                    f"{ws_url}/api/ws/{user_id}?token={token}",
+                    subprotocols=[subprotocol] if subprotocol else None,
+                    compression=None if args.no_deflate else "deflate",
+                    ping_interval=None,
+                    max_queue=None,
+                    open_timeout=60,
+                )
+            except Exception:
+                failures += 1
+                return
+        client = Client(websocket)
+        client.start(collector)
+        clients.append(client)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connect(user_id, token) for user_id, token in users))
+    return clients, time.perf_counter() - started, failures
+
+
+async def wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def run_mentorship(api: Api, alumni_ids: List[str], students: List[Tuple[str, str]],
+                         collector: Collector, timeout: float) -> Tuple[List[float], int]:
+    """Each student requests its mentor; latency until the alumni socket has it."""
+    sent: Dict[str, float] = {}
+    failed = 0
+
+    async def request(alumni_id: str, token: str) -> None:
+        nonlocal failed
+        started = time.perf_counter()
+        status, body = await api.call("POST", "/api/mentorship/request", token, json_body={
+            "alumni_id": alumni_id,
+            "message": "Load test: could we talk about your career path?",
+        })
+        if status == 201:
+            sent[body["id"]] = started
+        else:
+            failed += 1
+
+    await asyncio.gather(*(
+        request(alumni_id, token) for alumni_id, (_, token) in zip(alumni_ids, students)
+    ))
+    await wait_for(lambda: all(request_id in collector.requests for request_id in sent), timeout)
+    latencies = [
+        collector.requests[request_id] - started
+        for request_id, started in sent.items()
+        if request_id in collector.requests
+    ]
+    return latencies, failed + len(sent) - len(latencies)
+
+
+async def run_broadcasts(api: Api, admin_token: str, run_id: str, rounds: int, interval: float,
+                         collector: Collector, timeout: float) -> Tuple[List[float], int, float]:
+    """Publish announcements; latency until each subscribed socket has it."""
+    latencies: List[float] = []
+    missing = 0
+    publish_times: List[float] = []
+
+    for i in range(rounds):
+        title = f"loadtest-{run_id}-{i}"
+        started = time.perf_counter()
+        status, body = await api.call("POST", "/api/admin/announcements", admin_token, json_body={
+            "title": title,
+            "message": f"Load test broadcast {i} sent at {datetime.utcnow().isoformat()}",
+        })
+        publish_times.append(time.perf_counter() - started)
+        if status != 200:
+            raise RuntimeError(f"announcement failed ({status}): {body}")
+        expected = body["local_subscribers"]
+        await wait_for(lambda: len(collector.announcements.get(title, ())) >= expected, timeout)
+        received = collector.announcements.pop(title, [])
+        latencies.extend(t - started for t in received)
+        missing += max(0, expected - len(received))
+        await asyncio.sleep(interval)
+
+    return latencies, missing, percentile(publish_times, 50)
+
+
+async def run(args) -> dict:
+    fd_limit = raise_fd_limit()
+    if fd_limit and fd_limit < args.connections + 100:
+        print(f"⚠️ open-file limit {fd_limit} is below {args.connections} connections")
+
+    process = None
+    log_path = None
+    if args.url:
+        base_url = args.url
+    else:
+        port = free_port()
+        secret_key = secrets.token_urlsafe(48)
+        os.environ["SECRET_KEY"] = secret_key  # minted student tokens must verify
+        process, log_path = start_server(args, port, secret_key)
+        base_url = f"http://127.0.0.1:{port}"
+    ws_url = "ws" + base_url[len("http"):]
+
+    api = Api(base_url, args.http_concurrency)
+    collector = Collector()
+    client_lag = LoopLag()
+    clients: List[Client] = []
+    run_id = uuid.uuid4().hex[:8]
+
+    try:
+        await wait_ready(api, process)
+        mentors = min(args.mentors, args.connections)
+        admin_token, alumni, students, listeners = await seed(
+            api, run_id, mentors, args.connections - mentors
+        )
+        alumni_ids = [user_id for user_id, _ in alumni]
+        print(f"seeded {mentors} mentor/student pairs and {len(listeners)} listeners")
+
+        await asyncio.sleep(1)
+        rss_before = (await server_metrics(api)).get("process.rss_bytes", 0)
+        client_lag.start()
+
+        # Mentors first, then listeners
+        clients, connect_seconds, connect_failures = await open_connections(
+            ws_url, alumni + listeners, args, collector
+        )
+        connect_rate = len(clients) / connect_seconds if connect_seconds else 0.0
+        print(f"connected {len(clients)}/{args.connections} sockets in {connect_seconds:.2f}s "
+              f"({connect_rate:,.0f}/s)")
+
+        await asyncio.gather(*(client.subscribe("announcements") for client in clients))
+        await asyncio.sleep(args.settle)
+        rss_after = (await server_metrics(api)).get("process.rss_bytes", 0)
+
+        mentorship_latencies, mentorship_missing = await run_mentorship(
+            api, alumni_ids, students, collector, args.timeout
+        )
+        print(f"mentorship notifications: {len(mentorship_latencies)} delivered, {mentorship_missing} missing")
+
+        broadcast_latencies, broadcast_missing, publish_p50 = await run_broadcasts(
+            api, admin_token, run_id, args.broadcasts, args.broadcast_interval, collector, args.timeout
+        )
+        print(f"broadcasts: {len(broadcast_latencies)} deliveries, {broadcast_missing} missing")
+
+        snapshot = await server_metrics(api)
+        server_lag = snapshot.get("event_loop.lag_seconds", {})
+    finally:
+        client_lag.stop()
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+        api.close()
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            if process.returncode not in (0, -15, None):
+                print(f"server log: {log_path}")
+
+    return {
+        "params": {
+            "connections": args.connections,
+            "mentors": mentors,
+            "broadcasts": args.broadcasts,
+            "format": args.format,
+            "deflate": not args.no_deflate,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": datetime.utcnow().isoformat(),
+        },
+        "results": {
+            "connected": len(clients),
+            "connect_failures": connect_failures,
+            "connect_rate_per_second": round(connect_rate, 1),
+            "memory_per_connection_bytes": round((rss_after - rss_before) / max(len(clients), 1)),
+            "mentorship_latency_ms": summarize_ms(mentorship_latencies),
+            "mentorship_missing": mentorship_missing,
+            "broadcast_latency_ms": summarize_ms(broadcast_latencies),
+            "broadcast_missing": broadcast_missing,
+            "broadcast_publish_ms_p50": round(publish_p50 * 1e3, 3),
+            "server_loop_lag_ms": {
+                "p50": round(server_lag.get("p50", 0.0) * 1e3, 3),
+                "p99": round(server_lag.get("p99", 0.0) * 1e3, 3),
+                "max": round(server_lag.get("max", 0.0) * 1e3, 3),
+            },
+            "client_loop_lag_ms": summarize_ms(client_lag.samples),
+            "heartbeat_pings": collector.pings,
+            "client_errors": collector.errors,
+        },
+    }
+
+
+def lookup(results: dict, key: str) -> float:
+    value = results
+    for part in key.split("."):
+        value = value[part]
+    return value
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of the current run against the baseline, one line each."""
+    if current["params"] != baseline["params"]:
+        print(f"⚠️ baseline parameters differ: {baseline['params']}")
+
+    regressions = []
+    print(f"{'metric':<32}{'baseline':>12}{'current':>12}{'change':>9}")
+    for key, higher_is_better, noise in COMPARED_METRICS:
+        try:
+            old = lookup(baseline["results"], key)
+        except KeyError:
+            continue
+        new = lookup(current["results"], key)
+        change = (new - old) / old if old else 0.0
+        print(f"{key:<32}{old:>12,.1f}{new:>12,.1f}{change * 100:>8.1f}%")
+
+        worse = old - new if higher_is_better else new - old
+        if worse > noise and old and worse / old > tolerance:
+            regressions.append(f"{key}: {old:,.1f} -> {new:,.1f}")
+
+    for key in ("mentorship_missing", "broadcast_missing", "connect_failures"):
+        if current["results"][key] > baseline["results"].get(key, 0):
+            regressions.append(f"{key}: {baseline['results'].get(key, 0)} -> {current['results'][key]}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--mentors", type=int, default=50, help="Mentor/student pairs for mentorship notifications")
+    parser.add_argument("--broadcasts", type=int, default=20)
+    parser.add_argument("--broadcast-interval", type=float, default=0.2, help="Seconds between broadcasts")
+    parser.add_argument("--format", choices=sorted(SUBPROTOCOLS), default="legacy", help="Wire format")
+    parser.add_argument("--no-deflate", action="store_true", help="Disable permessage-deflate")
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--http-concurrency", type=int, default=16)
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to wait after connecting")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for deliveries")
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--server-cmd", help="Server command; {port} and {python} are substituted")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a saved JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result["results"], indent=2))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"✅ saved {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print("❌ regressions beyond tolerance:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("✅ no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Bulk import users into the GradConnect database from a CSV or JSONL file.
+
+Usage:
+    python import_users.py alumni_2024.csv
+    python import_users.py export.jsonl --batch-size 5000 --workers 8
+
+Each row needs email, full_name and either password or a bcrypt
+hashed_password; profile fields (graduation_year, department,
+current_company, current_position, bio, is_mentor, mentorship_expertise,
+interests) are optional. In CSV files list fields are semicolon-separated.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.db.session import AsyncSessionLocal, engine
+from app.services.bulk_import import detect_format, import_hash_pool, import_users
+
+
+async def main(args: argparse.Namespace) -> int:
+    fmt = detect_format(args.path, args.format)
+
+    await init_db(engine)
+    import_hash_pool.start(args.workers or None)
+
+    try:
+        with open(args.path, "rb") as file:
+            async with AsyncSessionLocal() as db:
+                report = await import_users(db, file, fmt, batch_size=args.batch_size)
+    finally:
+        await import_hash_pool.stop()
+
+    await engine.dispose()
+
+    print("=" * 50)
+    print(f"Rows read:   {report.total_rows}")
+    print(f"✅ Imported: {report.imported}")
+    print(f"❌ Failed:   {report.failed}")
+    print(f"⏱️  {report.elapsed_seconds}s ({report.rows_per_second} rows/s)")
+
+    for error in report.errors[:args.show_errors]:
+        print(f"   row {error.row} ({error.email or '-'}): {error.error}")
+
+    if args.report:
+        with open(args.report, "w") as out:
+            json.dump(report.model_dump(), out, indent=2)
+        print(f"Report written to {args.report}")
+
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or JSONL")
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Override format detection")
+    parser.add_argument("--batch-size", type=int, default=settings.BULK_IMPORT_BATCH_SIZE)
+    parser.add_argument(
+        "--workers", type=int, default=settings.BULK_IMPORT_HASH_WORKERS,
+        help="Password hashing processes (0 = one per CPU)"
+    )
+    parser.add_argument("--show-errors", type=int, default=20, help="Row errors to print")
+    parser.add_argument("--report", help="Write the full JSON report to this path")
+    sys.exit(asyncio.run(main(parser.parse_args())))
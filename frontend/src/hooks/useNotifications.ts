@@ -7,10 +7,15 @@ interface NotificationMessage {
     [key: string]: any;
 }
 
+// Server wire format: messages coalesced into JSON array frames
+const WS_SUBPROTOCOL = 'gradconnect.v2.json';
+
 interface UseNotificationsReturn {
     messages: NotificationMessage[];
     isConnected: boolean;
     sendMessage: (message: string) => void;
+    subscribe: (topics: string[]) => void;
+    unsubscribe: (topics: string[]) => void;
     clearMessages: () => void;
     connectionError: string | null;
 }
@@ -19,7 +24,13 @@ interface UseNotificationsReturn {
  * Custom hook for WebSocket-based real-time notifications.
  * 
  * Features:
- * - Auto-reconnect on connection loss
+ * - Auto-reconnect on connection loss, replaying notifications missed
+ *   while disconnected (tracks the last notification `seq` seen)
+ * - Batched frames (gradconnect.v2.json subprotocol); the browser
+ *   negotiates permessage-deflate compression automatically
+ * - Answers server heartbeat pings
+ * - Topic subscriptions ("announcements", "mentors", "department:<name>",
+ *   "cohort:<year>"), restored after reconnecting
  * - Message queue management
  * - Connection state tracking
  * 
@@ -39,6 +50,8 @@ export const useNotifications = (
     const [connectionError, setConnectionError] = useState<string | null>(null);
     const wsRef = useRef<WebSocket | null>(null);
     const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+    const lastSeqRef = useRef<number | null>(null);
+    const topicsRef = useRef<Set<string>>(new Set());
 
     const connect = useCallback(() => {
         if (!userId || !enabled) return;
@@ -47,21 +60,55 @@ export const useNotifications = (
             // Determine WebSocket URL based on environment
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
             const host = import.meta.env.VITE_WS_URL || window.location.host;
-            const wsUrl = `${protocol}//${host}/api/ws/${userId}`;
+            // Browsers can't set headers on a WebSocket: the token goes in the query
+            const params = new URLSearchParams({ token: localStorage.getItem('access_token') || '' });
+            if (lastSeqRef.current !== null) {
+                params.set('last_seq', String(lastSeqRef.current));
+            }
+            const wsUrl = `${protocol}//${host}/api/ws/${userId}?${params}`;
 
-            console.log('Connecting to WebSocket:', wsUrl);
-            const ws = new WebSocket(wsUrl);
+            console.log('Connecting to WebSocket:', `${protocol}//${host}/api/ws/${userId}`);
+            // Batched JSON frames: each frame holds an array of messages
+            const ws = new WebSocket(wsUrl, [WS_SUBPROTOCOL]);
 
             ws.onopen = () => {
                 console.log('✅ WebSocket connected');
                 setIsConnected(true);
                 setConnectionError(null);
+
+                // Restore topic subscriptions
+                if (topicsRef.current.size) {
+                    ws.send(JSON.stringify({ type: 'subscribe', topics: [...topicsRef.current] }));
+                }
             };
 
             ws.onmessage = (event) => {
                 try {
                     const data = JSON.parse(event.data);
-                    setMessages((prev) => [...prev, { ...data, timestamp: new Date().toISOString() }]);
+                    const batch: NotificationMessage[] = Array.isArray(data) ? data : [data];
+                    const timestamp = new Date().toISOString();
+                    const fresh: NotificationMessage[] = [];
+
+                    for (const message of batch) {
+                        // Heartbeat: answer so the server keeps the connection
+                        if (message.type === 'ping') {
+                            ws.send(JSON.stringify({ type: 'pong' }));
+                            continue;
+                        }
+
+                        // Notifications carry a sequence number; skip replayed duplicates
+                        if (typeof message.seq === 'number') {
+                            if (lastSeqRef.current !== null && message.seq <= lastSeqRef.current) {
+                                continue;
+                            }
+                            lastSeqRef.current = message.seq;
+                        }
+                        fresh.push({ ...message, timestamp });
+                    }
+
+                    if (fresh.length) {
+                        setMessages((prev) => [...prev, ...fresh]);
+                    }
                 } catch (error) {
                     console.error('Failed to parse WebSocket message:', error);
                 }
@@ -101,6 +148,20 @@ export const useNotifications = (
         }
     }, []);
 
+    const subscribe = useCallback((topics: string[]) => {
+        topics.forEach((topic) => topicsRef.current.add(topic));
+        if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+            wsRef.current.send(JSON.stringify({ type: 'subscribe', topics }));
+        }
+    }, []);
+
+    const unsubscribe = useCallback((topics: string[]) => {
+        topics.forEach((topic) => topicsRef.current.delete(topic));
+        if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+            wsRef.current.send(JSON.stringify({ type: 'unsubscribe', topics }));
+        }
+    }, []);
+
     const clearMessages = useCallback(() => {
         setMessages([]);
     }, []);
@@ -124,6 +185,8 @@ export const useNotifications = (
         messages,
         isConnected,
         sendMessage,
+        subscribe,
+        unsubscribe,
         clearMessages,
         connectionError,
     };
@@ -33,6 +33,12 @@ export interface CreateMentorshipRequest {
     message: string;
 }
 
+export interface AutoMentorshipRequest {
+    message: string;
+    department?: string;  // Defaults to the student's department
+    expertise?: string[];  // Defaults to the student's interests
+}
+
 export interface UpdateMentorshipRequest {
     status: MentorshipStatus;
 }
@@ -51,6 +57,20 @@ export const sendMentorshipRequest = async (
     }
 };
 
+/**
+ * Send a mentorship request to the least-loaded matching mentor (students only)
+ */
+export const requestAnyMentor = async (
+    data: AutoMentorshipRequest
+): Promise<MentorshipRequest> => {
+    try {
+        const response = await apiClient.post<MentorshipRequest>('/mentorship/request/auto', data);
+        return response.data;
+    } catch (error) {
+        throw new Error(getErrorMessage(error));
+    }
+};
+
 /**
  * Get mentorship requests
  * - Alumni: incoming requests
@@ -92,8 +112,42 @@ export const updateRequestStatus = async (
     }
 };
 
+export interface BulkUpdateOutcome {
+    request_id: string;
+    updated: boolean;
+    unchanged: boolean;
+    error?: string | null;
+}
+
+export interface BulkUpdateResult {
+    status: MentorshipStatus;
+    updated: number;
+    unchanged: number;
+    results: BulkUpdateOutcome[];
+}
+
+/**
+ * Accept, reject or complete several requests at once (alumni only)
+ */
+export const bulkUpdateRequestStatus = async (
+    requestIds: string[],
+    status: MentorshipStatus
+): Promise<BulkUpdateResult> => {
+    try {
+        const response = await apiClient.patch<BulkUpdateResult>(
+            '/mentorship/requests',
+            { request_ids: requestIds, status }
+        );
+        return response.data;
+    } catch (error) {
+        throw new Error(getErrorMessage(error));
+    }
+};
+
 export default {
     sendMentorshipRequest,
+    requestAnyMentor,
     getMentorshipRequests,
     updateRequestStatus,
+    bulkUpdateRequestStatus,
 };